@@ -0,0 +1,435 @@
+"""
+Benchmarks the league pipeline on synthetic leagues, fully offline.
+
+Every league size and week count gets its payloads prefilled into an
+in-memory response cache, then each stage is timed:
+
+    construct     FantasyLeague construction (parsing, store, metrics, seeding)
+    prob_n_wins   ProbNWins.compute for every team
+    seeding       SeedCalculator.calculate_and_update_seeding
+    scoring_df    getScoringDf
+    teams_df      getTeamsDf (includes clinch flags)
+    lineups       getLineupDf (optimal lineups for the whole season)
+    head_to_head  HeadToHeadMatrix over the scoring DataFrame
+    schedule_swap ScheduleSwapEngine: every team on every schedule
+    schedule_luck ScheduleSwapEngine.random_schedules, 1000 random schedules
+    bootstrap     BootstrapEngine.resample, 1000 resamples
+
+Before timing, the fast engines are checked against reference
+implementations (ProbNWinsBruteForce, a pairwise all-play loop, seeding
+from a freshly built tiebreak index, an exhaustive lineup search,
+json.loads for the streaming players parser, NumPy for the streaming
+points metrics, Team.getH2hRecord for the head-to-head matrix and a
+week-by-week loop for the schedule swap); any mismatch aborts the run.
+Playoff simulation seeds are checked against SeedCalculator.rank on
+every simulated season, and clinch and elimination flags against every
+possible final week. A week rollover is also replayed against a local
+SleeperStub, to check that a week cached as a schedule before it was
+played is refetched once it is final.
+
+Usage:
+    python benchmarks/bench_league.py --output bench.json
+    python benchmarks/bench_league.py --output new.json --compare bench.json
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from synthetic import SyntheticLeague
+from sleeper_stub import SleeperStub
+
+from FantasyLeague import FantasyLeague
+from SleeperClient import SleeperClient
+from ResponseCache import ResponseCache
+from Metrics import ProbNWins, ProbNWinsBruteForce
+from AllPlay import AllPlayEngine
+from SeedCalculator import SeedCalculator, TiebreakIndex
+from PlayoffSimulator import PlayoffSimulator
+from Lineups import LineupOptimizer
+from HeadToHead import HeadToHeadMatrix
+from ScheduleSwap import ScheduleSwapEngine
+from Bootstrap import BootstrapEngine
+from PlayerIndex import PlayerIndex, iter_object_items
+
+DEFAULT_TEAMS = [8, 12, 16, 24, 32]
+DEFAULT_WEEKS = [1, 6, 12, 18]
+# ProbNWinsBruteForce enumerates 2^weeks scenarios
+BRUTE_FORCE_MAX_WEEKS = 14
+LINEUP_CHECKS = 2
+
+
+PLAYERS_DIR = tempfile.mkdtemp(prefix='lfl_bench_players_')
+
+
+def load_league(synthetic):
+    """Builds a FantasyLeague from a synthetic league without touching the network."""
+    client = SleeperClient(cache=synthetic.prefill(ResponseCache(':memory:')), retries=0)
+    players_path = os.path.join(PLAYERS_DIR, '{}_{}'.format(synthetic.league_id, synthetic.n_teams))
+    if not os.path.exists(players_path):
+        players = synthetic.payloads()[SleeperClient.players_path()]
+        PlayerIndex.build(players_path, [json.dumps(players).encode()])
+    league = FantasyLeague(config={**synthetic.config(), 'players_path': players_path}, client=client)
+    return league, client
+
+
+def timeit(fn, repeat):
+    """Runs fn repeat times, returning the timings in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+# ==================== Reference checks ====================
+
+def all_play_reference(points):
+    """Pairwise all-play win shares, one comparison at a time."""
+    n_weeks, n_teams = points.shape
+    win_prob = np.zeros(points.shape)
+    for week in range(n_weeks):
+        for i in range(n_teams):
+            wins = sum(
+                1.0 if points[week, i] > points[week, j] else 0.5 if points[week, i] == points[week, j] else 0.0
+                for j in range(n_teams) if j != i
+            )
+            win_prob[week, i] = wins / (n_teams - 1)
+    return win_prob
+
+
+def schedule_swap_reference(points, opponent_columns):
+    """Wins of every team on every schedule, one week at a time."""
+    n_weeks, n_teams = points.shape
+    wins = np.zeros((n_teams, n_teams), dtype=int)
+    for i in range(n_teams):
+        for j in range(n_teams):
+            for week in range(n_weeks):
+                opponent = opponent_columns[week, j]
+                if opponent == i:
+                    opponent = j
+                if opponent >= 0 and points[week, i] > points[week, opponent]:
+                    wins[i, j] += 1
+    return wins
+
+
+def lineup_reference(slots, players, positions, players_points):
+    """Best lineup points by trying every assignment of players to slots."""
+    eligible = {player: set(positions(player)) for player in players}
+
+    def best(slot_index, used):
+        if slot_index == len(slots):
+            return 0.0
+        # Leaving a slot empty is always allowed
+        result = best(slot_index + 1, used)
+        for player in players:
+            if player not in used and eligible[player] & LineupOptimizer.SLOT_POSITIONS[slots[slot_index]]:
+                result = max(result, players_points[player] + best(slot_index + 1, used | {player}))
+        return result
+    return best(0, frozenset())
+
+
+def check(synthetic):
+    """Verifies the fast engines against their references; raises AssertionError on a mismatch."""
+    league, client = load_league(synthetic)
+
+    if synthetic.n_weeks <= BRUTE_FORCE_MAX_WEEKS:
+        for team in league.teams.values():
+            fast = ProbNWins(team.getWinProbs()).compute()
+            reference = ProbNWinsBruteForce(team.getWinProbs()).compute()
+            assert np.allclose(fast, reference), 'ProbNWins differs from brute force for {}'.format(team.short_name)
+
+    points = league.store.points
+    assert np.allclose(AllPlayEngine(points).win_prob, all_play_reference(points)), 'AllPlayEngine differs from pairwise loop'
+
+    teams_list = list(league.teams.values())
+    seeds = [(team.division_seed, team.league_seed) for team in teams_list]
+    league.seeding_calculator.calculate_and_update_seeding(teams_list, TiebreakIndex.from_teams(teams_list))
+    assert seeds == [(team.division_seed, team.league_seed) for team in teams_list], 'Incremental tiebreak index differs from a rebuilt one'
+
+    for team in league.teams.values():
+        points = team.getPoints()
+        streamed = [team.getMetric(name) for name in ('avg', 'std', 'form')]
+        assert np.allclose(streamed, [points.mean(), points.std(), points[-4:].mean()]), \
+            'Streaming metrics differ from NumPy for {}'.format(team.short_name)
+
+    bootstrap = league.getBootstrapDf(n_boot=200).set_index('roster_id')
+    for team in league.teams.values():
+        row = bootstrap.loc[team.roster_id]
+        assert np.allclose([row['mean'], row['expw']], [team.getMetric('avg'), team.getMetric('expw')]), \
+            'Bootstrap estimates differ from team metrics for {}'.format(team.short_name)
+        assert row['mean_low'] <= row['mean'] <= row['mean_high'], 'Bootstrap interval misses the mean for {}'.format(team.short_name)
+
+    h2h = HeadToHeadMatrix.from_scoring_df(league.getScoringDf(), league.store.roster_ids)
+    for i, team in enumerate(league.store.roster_ids):
+        for j, other in enumerate(league.store.roster_ids):
+            record = league.teams[int(team)].getH2hRecord(other)
+            fast = h2h.wins[i, j] / h2h.games[i, j] if h2h.games[i, j] else -1
+            assert i == j or np.isclose(fast, record), 'H2H matrix differs from getH2hRecord for {} vs {}'.format(team, other)
+    assert np.array_equal(h2h.all_play_wins.sum(axis=1), league.store.all_play().wins.sum(axis=0)), 'H2H all-play differs from AllPlayEngine'
+
+    swap = ScheduleSwapEngine(league.store.roster_ids, league.store.points, league.store.opponent_columns())
+    reference = schedule_swap_reference(swap.points, swap.opponent_columns)
+    assert np.array_equal(swap.wins, reference), 'Schedule swap differs from week-by-week loop'
+    assert np.array_equal(np.diag(swap.wins), [league.teams[int(roster_id)].wins for roster_id in league.store.roster_ids]), \
+        'Schedule swap diagonal differs from actual wins'
+
+    lineup_df = league.getLineupDf()
+    positions = league.getPlayerIndex().positions
+    optimizer = LineupOptimizer(league.roster_positions, positions)
+    # The exhaustive search is slow, so only a few lineups are checked
+    for roster_id, players, _, players_points in league._week_lineups[1][:LINEUP_CHECKS]:
+        reference = lineup_reference(optimizer.slots, players, positions, players_points)
+        fast = lineup_df[(lineup_df['week'] == 1) & (lineup_df['roster_id'] == roster_id)]['optimal_points'].iloc[0]
+        assert np.isclose(fast, reference), 'Optimal lineup differs from exhaustive search for roster {}'.format(roster_id)
+
+    # Streaming parse in tiny chunks must match a plain json.loads
+    dump = json.dumps(synthetic.payloads()[SleeperClient.players_path()], indent=1).encode()
+    chunks = [dump[start:start + 7] for start in range(0, len(dump), 7)]
+    assert dict(iter_object_items(chunks)) == json.loads(dump), 'Streaming players parser differs from json.loads'
+    for player_id, player in json.loads(dump).items():
+        assert positions(player_id) == player['fantasy_positions'], 'Player index lookup differs for {}'.format(player_id)
+
+    assert client.network_requests == 0, 'Benchmark load went to the network'
+    client.close()
+
+
+def check_multi_position_lineups(n_lineups=20, seed=0):
+    """Optimal lineups with players eligible for several positions, against the exhaustive search."""
+    # RB/WR player A is worth more in the RB slot only because WR C is weak: 20 + 2 would be greedy, 35 optimal
+    positions = {'A': ['RB', 'WR'], 'B': ['RB'], 'C': ['WR']}.get
+    result = LineupOptimizer(['RB', 'WR'], positions).optimize([(['A', 'B', 'C'], ['A', 'C'], {'A': 20, 'B': 15, 'C': 2})])
+    assert np.isclose(result['optimal'][0], 35), 'Dual-eligibility lineup is not optimal'
+
+    rng = np.random.default_rng(seed)
+    roster_positions = ['QB', 'RB', 'WR', 'TE', 'FLEX', 'WRRB_FLEX', 'SUPER_FLEX', 'BN']
+    choices = [['QB'], ['RB'], ['WR'], ['TE'], ['RB', 'WR'], ['WR', 'TE'], ['QB', 'RB'], ['RB', 'TE']]
+    players = ['p{}'.format(i) for i in range(8)]
+    lineups, eligibility = [], []
+    for _ in range(n_lineups):
+        eligible = {player: choices[rng.integers(len(choices))] for player in players}
+        eligibility.append(eligible)
+        lineups.append((players, [], {player: float(rng.integers(0, 30)) for player in players}))
+
+    for (lineup_players, _, players_points), eligible in zip(lineups, eligibility):
+        optimizer = LineupOptimizer(roster_positions, eligible.get)
+        fast = optimizer.optimize([(lineup_players, [], players_points)])['optimal'][0]
+        reference = lineup_reference(optimizer.slots, lineup_players, eligible.get, players_points)
+        assert np.isclose(fast, reference), 'Optimal lineup differs from exhaustive search: {} vs {}'.format(fast, reference)
+
+
+def check_playoff_seeding(n_teams=12, remaining_weeks=4, n_sims=500):
+    """Seeds of every simulated season, against SeedCalculator.rank on the season's own tiebreak index."""
+    league, client = load_league(SyntheticLeague(n_teams, 14, remaining_weeks=remaining_weeks, seed=2))
+    teams_list = [league.teams[int(roster_id)] for roster_id in league.tiebreak_index.roster_ids]
+    simulator = PlayoffSimulator(
+        league.tiebreak_index, league.getRemainingSchedule(),
+        means=[team.getMetric('avg') for team in teams_list], stds=[team.getMetric('std') for team in teams_list]
+    )
+    wins, h2h_wins, division_wins, expw = simulator.simulate_standings(n_sims, np.random.default_rng(0))
+    calculator = SeedCalculator()
+    # Rounded expected wins tie often, so every tiebreak step gets exercised
+    for season_expw in (expw, np.round(expw)):
+        division_seeds, league_seeds = simulator.seed(wins, h2h_wins, division_wins, season_expw)
+        for sim in range(n_sims):
+            index = TiebreakIndex(
+                simulator.index.roster_ids, simulator.index.divisions, wins[sim], h2h_wins[sim],
+                simulator.h2h_games, division_wins[sim], simulator.division_games, season_expw[sim]
+            )
+            assert (division_seeds[sim].tolist(), league_seeds[sim].tolist()) == tuple(calculator.rank(index)), \
+                'Simulated seeding differs from SeedCalculator.rank in season {}'.format(sim)
+    client.close()
+
+
+def check_clinch_flags(n_teams=8, n_weeks=5, n_leagues=4):
+    """
+    Clinch and elimination flags with one week left, against every possible
+    order of that week's scores (which settles both the game results and
+    the expected wins).
+    """
+    orders = np.array(list(itertools.permutations(range(n_teams))), dtype=float)[:, None, :]
+    for seed in range(n_leagues):
+        league, client = load_league(SyntheticLeague(n_teams, n_weeks, remaining_weeks=1, seed=seed))
+        flags = league.getClinchFlags()
+        simulator = PlayoffSimulator(league.tiebreak_index, league.getRemainingSchedule(), [0] * n_teams, [1] * n_teams)
+        _, league_seeds = simulator.seed(*simulator.standings(orders))
+        for team, roster_id in enumerate(simulator.index.roster_ids):
+            best, worst = league_seeds[:, team].min(), league_seeds[:, team].max()
+            team_flags = flags[roster_id]
+            assert not team_flags['clinched_playoffs'] or worst <= league.playoff_teams, \
+                'Roster {} flagged as clinched but can finish {}'.format(roster_id, worst)
+            assert not team_flags['clinched_bye'] or worst <= league.playoff_byes, \
+                'Roster {} flagged with a bye but can finish {}'.format(roster_id, worst)
+            assert not team_flags['eliminated'] or best > league.playoff_teams, \
+                'Roster {} flagged as eliminated but can finish {}'.format(roster_id, best)
+        client.close()
+
+
+def check_week_rollover(n_teams=8, n_weeks=6):
+    """
+    Replays a week being played: the schedule is read before the week
+    (caching its pre-game payload with a TTL), then the week goes final
+    with real scores. Both a fresh load and refresh() of the existing
+    league must ingest the final scores, not the cached pre-game ones.
+    """
+    synthetic = SyntheticLeague(n_teams, n_weeks, remaining_weeks=2, seed=1)
+    payloads = synthetic.payloads()
+    server = SleeperStub(('127.0.0.1', 0), payloads)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = SleeperClient(base_url=server.base_url, cache=ResponseCache(':memory:'), retries=0)
+    try:
+        league = FantasyLeague(config=synthetic.config(), client=client)
+        week = league.current_week
+        assert week in {scheduled for scheduled, _, _ in league.getRemainingSchedule()}, 'Expected the current week in the schedule'
+
+        # The week is played: final scores are served and the NFL week advances
+        path = SleeperClient.matchups_path(synthetic.league_id, week)
+        final = [{**entry, "points": 100.0 + entry["roster_id"]} for entry in payloads[path]]
+        server.payloads = {**payloads, path: final, SleeperClient.nfl_state_path(): {"week": week + 1, "season": "2025"}}
+        client.cache.invalidate('{}/{}'.format(server.base_url, SleeperClient.nfl_state_path()))
+
+        expected = {entry["roster_id"]: entry["points"] for entry in final}
+
+        def week_points(loaded):
+            scoring = loaded.getScoringDf()
+            scoring = scoring[scoring['week'] == week]
+            return dict(zip(scoring['roster_id'], scoring['points']))
+
+        # A pre-game payload cached permanently (e.g. by an older version) must not survive a refresh either
+        client.cache.put('{}/{}'.format(server.base_url, path), payloads[path])
+        league.refresh()
+        assert week in league.loaded_weeks and week_points(league) == expected, \
+            'refresh() ingested week {} from the cached pre-game payload'.format(week)
+        reloaded = FantasyLeague(config=synthetic.config(), client=client)
+        assert week_points(reloaded) == expected, 'Week {} was loaded from the cached pre-game schedule'.format(week)
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+
+# ==================== Timing ====================
+
+def bench(synthetic, repeat):
+    """Times every stage for one synthetic league; returns one result row per stage."""
+    league, client = load_league(synthetic)
+    teams_list = list(league.teams.values())
+
+    stages = {
+        'construct': lambda: FantasyLeague(config=synthetic.config(), client=client),
+        'prob_n_wins': lambda: [ProbNWins(team.getWinProbs()).compute() for team in teams_list],
+        'seeding': lambda: league.seeding_calculator.calculate_and_update_seeding(league.teams, league.tiebreak_index),
+        'scoring_df': league.getScoringDf,
+        'teams_df': league.getTeamsDf,
+        'lineups': lambda: LineupOptimizer(league.roster_positions, league.getPlayerIndex().positions).to_frame(
+            league._week_lineups, {roster_id: team.short_name for roster_id, team in league.teams.items()}
+        ),
+        'head_to_head': lambda: HeadToHeadMatrix.from_scoring_df(league.getScoringDf(), league.store.roster_ids),
+        'schedule_swap': lambda: ScheduleSwapEngine.from_scoring_df(league.getScoringDf(), league.store.roster_ids),
+        'schedule_luck': lambda: league.getScheduleSwap().random_schedules(1000),
+        'bootstrap': lambda: BootstrapEngine(league.store.roster_ids, league.store.points, league.store.all_play().win_prob).resample(1000),
+    }
+
+    rows = []
+    for stage, fn in stages.items():
+        timings = timeit(fn, repeat)
+        rows.append({
+            'teams': synthetic.n_teams,
+            'weeks': synthetic.n_weeks,
+            'stage': stage,
+            'best': min(timings),
+            'median': float(np.median(timings)),
+            'repeat': repeat,
+        })
+    client.close()
+    return rows
+
+
+def compare(rows, baseline_path, threshold):
+    """
+    Prints each stage's median against a previous results file.
+
+    Returns:
+        Number of stages slower than the baseline by more than threshold (a ratio).
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(row['teams'], row['weeks'], row['stage']): row for row in json.load(f)['results']}
+
+    regressions = 0
+    print('\n{:>5} {:>5} {:<14} {:>12} {:>12} {:>7}'.format('teams', 'weeks', 'stage', 'baseline ms', 'current ms', 'ratio'))
+    for row in rows:
+        previous = baseline.get((row['teams'], row['weeks'], row['stage']))
+        if previous is None:
+            continue
+        ratio = row['median'] / previous['median'] if previous['median'] else float('inf')
+        flag = ''
+        if ratio > threshold:
+            regressions += 1
+            flag = '  <-- slower'
+        print('{:>5} {:>5} {:<14} {:>12.3f} {:>12.3f} {:>7.2f}{}'.format(
+            row['teams'], row['weeks'], row['stage'], previous['median'] * 1000, row['median'] * 1000, ratio, flag
+        ))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--teams', type=int, nargs='+', default=DEFAULT_TEAMS)
+    parser.add_argument('--weeks', type=int, nargs='+', default=DEFAULT_WEEKS)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--compare', help='Previous results file to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25, help='Slowdown ratio reported as a regression')
+    parser.add_argument('--skip-checks', action='store_true', help='Skip the reference checks')
+    args = parser.parse_args()
+
+    if not args.skip_checks:
+        check_multi_position_lineups()
+        check_playoff_seeding()
+        check_clinch_flags()
+        check_week_rollover()
+
+    rows = []
+    print('{:>5} {:>5} {:<14} {:>10} {:>10}'.format('teams', 'weeks', 'stage', 'best ms', 'median ms'))
+    for n_teams in args.teams:
+        for n_weeks in args.weeks:
+            synthetic = SyntheticLeague(n_teams, n_weeks, seed=args.seed)
+            if not args.skip_checks:
+                check(synthetic)
+            for row in bench(synthetic, args.repeat):
+                rows.append(row)
+                print('{:>5} {:>5} {:<14} {:>10.3f} {:>10.3f}'.format(
+                    row['teams'], row['weeks'], row['stage'], row['best'] * 1000, row['median'] * 1000
+                ))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'meta': {
+                    'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'python': platform.python_version(),
+                    'numpy': np.__version__,
+                    'machine': platform.machine(),
+                    'cpus': os.cpu_count(),
+                },
+                'results': rows,
+            }, f, indent=2)
+
+    if args.compare:
+        regressions = compare(rows, args.compare, args.threshold)
+        if regressions:
+            print('\n{} stage(s) slower than {:.2f}x the baseline'.format(regressions, args.threshold))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+Local stand-in for the Sleeper API, for load, latency and retry testing on one box.
+
+Serves the endpoints a league load uses (/state/nfl, /league/{id},
+/league/{id}/users, /rosters, /matchups/{week}, /transactions/{week} and
+/players/nfl) under /v1, either
+from a synthetic league or from responses recorded in a ResponseCache
+file. Latency, server errors and a rate limit can be injected, and
+GET /_stats returns request counters.
+
+Point the app at it with the base_url config key or the environment:
+
+    python benchmarks/sleeper_stub.py --teams 12 --weeks 10 --latency 50 --error-rate 0.05
+    SLEEPER_BASE_URL=http://127.0.0.1:8765/v1 streamlit run src/fantasy_league.py
+
+A synthetic league is served as league id 900000 unless --league-id is given.
+"""
+import argparse
+import json
+import random
+import sqlite3
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from synthetic import SyntheticLeague
+
+PREFIX = '/v1/'
+
+
+def recorded_payloads(cache_path):
+    """Reads every response in a ResponseCache file, keyed by path relative to the API root."""
+    conn = sqlite3.connect(cache_path)
+    try:
+        rows = conn.execute('SELECT key, payload FROM responses').fetchall()
+    finally:
+        conn.close()
+    return {key.split(PREFIX, 1)[1]: json.loads(payload) for key, payload in rows if PREFIX in key}
+
+
+class TokenBucket:
+    """Allows rate requests per second on average, with bursts up to burst."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class SleeperStub(ThreadingHTTPServer):
+    """
+    HTTP server holding the payloads and the fault settings.
+
+    Args:
+        address: (host, port) to listen on
+        payloads: Dict of path (e.g. 'league/1/users') -> response body
+        latency: Mean added delay per request, in seconds
+        jitter: Maximum random deviation from latency, in seconds
+        error_rate: Fraction of requests answered with a 500
+        rate_limit: Requests per second before answering 429, or None for no limit
+        seed: Random seed for latency and errors
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, payloads, latency=0.0, jitter=0.0, error_rate=0.0, rate_limit=None, seed=0):
+        super().__init__(address, StubHandler)
+        self.payloads = payloads
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.bucket = TokenBucket(rate_limit) if rate_limit else None
+        self.rng = random.Random(seed)
+        self.counters = {"requests": 0, "ok": 0, "not_found": 0, "errors": 0, "rate_limited": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return 'http://{}:{}/v1'.format(host, port)
+
+    def count(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def draw(self):
+        """Returns (delay, fail) for one request."""
+        with self._lock:
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            return delay, self.rng.random() < self.error_rate
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server = self.server
+        if self.path == '/_stats':
+            return self.send_json(200, server.counters)
+
+        server.count('requests')
+        if server.bucket is not None and not server.bucket.take():
+            server.count('rate_limited')
+            return self.send_json(429, {"error": "rate limited"}, {'Retry-After': '1'})
+
+        delay, fail = server.draw()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            server.count('errors')
+            return self.send_json(500, {"error": "injected failure"})
+
+        path = self.path.split('?', 1)[0]
+        payload = server.payloads.get(path[len(PREFIX):]) if path.startswith(PREFIX) else None
+        if payload is None:
+            # Sleeper answers unknown resources with a JSON null
+            server.count('not_found')
+            return self.send_json(200, None)
+        server.count('ok')
+        self.send_json(200, payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--recorded', help='Serve the responses stored in this ResponseCache file')
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--weeks', type=int, default=10, help='Completed weeks of the synthetic league')
+    parser.add_argument('--remaining-weeks', type=int, default=4, help='Scheduled weeks before the playoffs')
+    parser.add_argument('--league-id', type=int, default=900000)
+    parser.add_argument('--latency', type=float, default=0.0, help='Mean added latency in ms')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Latency jitter in ms')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with a 500')
+    parser.add_argument('--rate-limit', type=float, help='Requests per second before answering 429')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.recorded:
+        payloads = recorded_payloads(args.recorded)
+    else:
+        synthetic = SyntheticLeague(args.teams, args.weeks, args.remaining_weeks, league_id=args.league_id, seed=args.seed)
+        payloads = synthetic.payloads()
+
+    server = SleeperStub(
+        (args.host, args.port), payloads,
+        latency=args.latency / 1000, jitter=args.jitter / 1000,
+        error_rate=args.error_rate, rate_limit=args.rate_limit, seed=args.seed,
+    )
+    print('Serving {} endpoints at {}'.format(len(payloads), server.base_url))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'Classes'))
+
+from SleeperClient import SleeperClient
+
+
+class SyntheticLeague:
+    """
+    Sleeper-shaped payloads for a made-up league of any size.
+
+    Teams play a random pairing every week. Each team rosters a fixed set of
+    players whose weekly points are drawn around a per-team strength, and
+    starts its depth chart's first lineup, so records, tiebreaks and bench
+    points look like a real season. The same arguments always produce the
+    same payloads.
+    """
+
+    DIVISION_SIZE = 4
+    ROSTER_POSITIONS = ['QB', 'RB', 'RB', 'WR', 'WR', 'TE', 'FLEX', 'K', 'DEF', 'BN', 'BN', 'BN', 'BN', 'BN', 'BN']
+    # Roster of each team: (position, mean points), starters first
+    DEPTH_CHART = [
+        ('QB', 18), ('RB', 13), ('RB', 11), ('WR', 13), ('WR', 11), ('TE', 8), ('WR', 9), ('K', 8), ('DEF', 7),
+        ('QB', 10), ('RB', 8), ('RB', 6), ('WR', 8), ('WR', 6), ('TE', 5),
+    ]
+
+    def __init__(self, n_teams=12, n_weeks=14, remaining_weeks=0, league_id=900000, seed=0):
+        """
+        Args:
+            n_teams: Number of teams (even)
+            n_weeks: Completed weeks
+            remaining_weeks: Scheduled weeks after the completed ones, before the playoffs
+            league_id: League id used in the endpoint paths
+            seed: Random seed
+        """
+        if n_teams % 2:
+            raise ValueError('n_teams must be even')
+        self.n_teams = n_teams
+        self.n_weeks = n_weeks
+        self.remaining_weeks = remaining_weeks
+        self.league_id = league_id
+
+        rng = random.Random(seed)
+        self.roster_ids = list(range(1, n_teams + 1))
+        self.short_names = ['Team{:02d}'.format(roster_id) for roster_id in self.roster_ids]
+        self._strength = {roster_id: rng.gauss(1, 0.08) for roster_id in self.roster_ids}
+        self._players = {
+            roster_id: ['{}_{}'.format(roster_id, slot) for slot in range(len(self.DEPTH_CHART))]
+            for roster_id in self.roster_ids
+        }
+        self._matchups = {
+            week: self._week(rng, scored=week <= n_weeks)
+            for week in range(1, n_weeks + remaining_weeks + 1)
+        }
+        self._transactions = {week: self._week_transactions(rng, week) for week in range(1, n_weeks + 2)}
+
+    def _week(self, rng, scored):
+        order = self.roster_ids[:]
+        rng.shuffle(order)
+        week_data = []
+        for matchup_id, pair in enumerate(zip(order[::2], order[1::2]), start=1):
+            for roster_id in pair:
+                players = self._players[roster_id]
+                starters = players[:self.ROSTER_POSITIONS.index('BN')]
+                players_points = {
+                    player: round(max(0.0, rng.gauss(mean * self._strength[roster_id], mean / 2)), 2) if scored else 0.0
+                    for player, (_, mean) in zip(players, self.DEPTH_CHART)
+                }
+                week_data.append({
+                    "roster_id": roster_id,
+                    "matchup_id": matchup_id,
+                    "points": round(sum(players_points[player] for player in starters), 2),
+                    "starters": starters,
+                    "players": players,
+                    "players_points": players_points,
+                })
+        return week_data
+
+    def _week_transactions(self, rng, week):
+        """A few waiver claims and free agent pickups, and a trade every third week."""
+        created = 1_725_000_000_000 + week * 7 * 86_400_000
+        transactions = []
+
+        def add(kind, status, roster_ids, adds, drops, **extra):
+            transactions.append({
+                "transaction_id": str(week * 10_000 + len(transactions)),
+                "type": kind,
+                "status": status,
+                "leg": week,
+                "roster_ids": roster_ids,
+                "adds": adds,
+                "drops": drops,
+                "created": created + len(transactions) * 60_000,
+                "status_updated": created + len(transactions) * 60_000,
+                **extra,
+            })
+
+        for claim in range(rng.randint(1, self.n_teams // 2)):
+            roster_id = rng.choice(self.roster_ids)
+            dropped = rng.choice(self._players[roster_id][9:])
+            kind = rng.choice(['waiver', 'waiver', 'free_agent'])
+            status = 'failed' if kind == 'waiver' and rng.random() < 0.2 else 'complete'
+            settings = {"waiver_bid": rng.randint(0, 40)} if kind == 'waiver' else None
+            add(kind, status, [roster_id], {"fa_{}_{}".format(week, claim): roster_id}, {dropped: roster_id}, settings=settings)
+
+        if week % 3 == 0:
+            sender, receiver = rng.sample(self.roster_ids, 2)
+            given, received = rng.choice(self._players[sender][9:]), rng.choice(self._players[receiver][9:])
+            add('trade', 'complete', [sender, receiver],
+                {given: receiver, received: sender}, {given: sender, received: receiver},
+                waiver_budget=[{"sender": sender, "receiver": receiver, "amount": rng.randint(1, 10)}])
+        return transactions
+
+    @property
+    def playoff_week_start(self):
+        return self.n_weeks + self.remaining_weeks + 1
+
+    def divisions(self):
+        """Division config in league_config.json format, DIVISION_SIZE teams each."""
+        return [
+            {"name": "D{}".format(start // self.DIVISION_SIZE + 1),
+             "team_names": self.short_names[start:start + self.DIVISION_SIZE]}
+            for start in range(0, self.n_teams, self.DIVISION_SIZE)
+        ]
+
+    def config(self):
+        return {"league_id": self.league_id, "divisions": self.divisions()}
+
+    def payloads(self):
+        """Response body for every endpoint a FantasyLeague load touches, keyed by path."""
+        payloads = {
+            SleeperClient.nfl_state_path(): {"week": self.n_weeks + 1, "season": "2025"},
+            SleeperClient.league_path(self.league_id): {
+                "league_id": str(self.league_id),
+                "name": "Synthetic {}x{}".format(self.n_teams, self.n_weeks),
+                "season": "2025",
+                "status": "in_season",
+                "previous_league_id": None,
+                "settings": {"playoff_week_start": self.playoff_week_start, "playoff_teams": min(6, self.n_teams)},
+                "roster_positions": self.ROSTER_POSITIONS,
+            },
+            SleeperClient.players_path(): {
+                player: {"position": position, "fantasy_positions": [position]}
+                for players in self._players.values()
+                for player, (position, _) in zip(players, self.DEPTH_CHART)
+            },
+            SleeperClient.users_path(self.league_id): [
+                {"user_id": str(1000 + roster_id), "metadata": {"team_name": "The " + short_name}}
+                for roster_id, short_name in zip(self.roster_ids, self.short_names)
+            ],
+            SleeperClient.rosters_path(self.league_id): [
+                {"roster_id": roster_id, "owner_id": str(1000 + roster_id)} for roster_id in self.roster_ids
+            ],
+        }
+        for week, week_data in self._matchups.items():
+            payloads[SleeperClient.matchups_path(self.league_id, week)] = week_data
+        for week, transactions in self._transactions.items():
+            payloads[SleeperClient.transactions_path(self.league_id, week)] = transactions
+        return payloads
+
+    def prefill(self, cache, base_url=SleeperClient.BASE_URL):
+        """Stores every payload in a ResponseCache with no expiry, so loads need no network."""
+        for path, payload in self.payloads().items():
+            cache.put('{}/{}'.format(base_url.rstrip('/'), path), payload)
+        return cache
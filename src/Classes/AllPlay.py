@@ -0,0 +1,44 @@
+import numpy as np
+
+
+class AllPlayEngine:
+    """
+    All-play results for every team and week, for any league size.
+
+    Every team is compared with every other team each week in a single
+    broadcast over the (weeks x teams) points matrix. Ties count as half a
+    win, and teams without a score that week (NaN) are left out.
+
+    Attributes (all weeks x teams):
+        wins: Teams outscored
+        ties: Teams with the same score
+        losses: Teams that scored more
+        rank: Weekly points rank, tied teams share the best rank
+        win_prob: All-play win share, (wins + ties / 2) / opponents
+    """
+
+    def __init__(self, points):
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        played = ~np.isnan(points)
+
+        # diff[w, i, j] compares team i with team j; NaN comparisons are all False
+        diff = points[:, :, None] - points[:, None, :]
+        self.wins = (diff > 0).sum(axis=2)
+        self.losses = (diff < 0).sum(axis=2)
+        # Subtract the team itself
+        self.ties = (diff == 0).sum(axis=2) - played
+
+        opponents = played.sum(axis=1, keepdims=True) - 1
+        self.rank = np.where(played, self.losses + 1, 0)
+        self.win_prob = np.divide(
+            self.wins + 0.5 * self.ties, opponents,
+            out=np.zeros(points.shape), where=played & (opponents > 0)
+        )
+
+    def expected_wins(self):
+        """Expected wins per team: the sum of weekly all-play win shares."""
+        return self.win_prob.sum(axis=0)
+
+    def record(self):
+        """Season all-play (wins, losses) per team, ties split as half a win and half a loss."""
+        return self.wins.sum(axis=0) + 0.5 * self.ties.sum(axis=0), self.losses.sum(axis=0) + 0.5 * self.ties.sum(axis=0)
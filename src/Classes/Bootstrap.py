@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+
+class BootstrapEngine:
+    """
+    Bootstrap confidence intervals for every team's strength.
+
+    Each resample draws a team's played weeks with replacement, keeping
+    each week's points and all-play win share together. All teams and
+    resamples are drawn in one batched gather over a (resamples x teams x
+    weeks) index array, so a season needs no Python loop per team or per
+    resample.
+
+    Statistics per resample:
+        mean: Average weekly points
+        expw: Expected wins, the average win share times the weeks played
+        all_play_pct: Average all-play win share
+    """
+
+    STATISTICS = ('mean', 'expw', 'all_play_pct')
+
+    def __init__(self, roster_ids, points, win_prob):
+        """
+        Args:
+            roster_ids: Roster id of each team column
+            points: (weeks x teams) points, NaN when a team did not play
+            win_prob: (weeks x teams) all-play win share of every game
+        """
+        self.roster_ids = np.asarray(roster_ids)
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        win_prob = np.atleast_2d(np.asarray(win_prob, dtype=float))
+        played = ~np.isnan(points)
+
+        # Compact each team's played weeks to the front of its row: (teams x weeks)
+        order = np.argsort(~played, axis=0, kind='stable')
+        self.n_weeks = played.sum(axis=0)
+        self.points = np.take_along_axis(points, order, axis=0).T
+        self.win_prob = np.take_along_axis(win_prob, order, axis=0).T
+
+    def estimates(self):
+        """Point estimates of every statistic from the actual weeks, each (teams,)."""
+        weeks = np.arange(self.points.shape[1]) < self.n_weeks[:, None]
+        return self._statistics(np.where(weeks, self.points, 0.0), np.where(weeks, self.win_prob, 0.0), weeks.sum(axis=1))
+
+    def _statistics(self, points, win_prob, n_weeks):
+        # Sums over the last axis; NaN for teams without weeks
+        count = np.where(n_weeks > 0, n_weeks, np.nan)
+        share = win_prob.sum(axis=-1) / count
+        return {
+            'mean': points.sum(axis=-1) / count,
+            'expw': share * n_weeks,
+            'all_play_pct': share,
+        }
+
+    def resample(self, n_boot=5000, seed=0, batch_size=1000):
+        """
+        Bootstrap distribution of every statistic.
+
+        Resamples are drawn batch_size at a time to bound memory, from one
+        seeded generator so results are reproducible.
+
+        Returns:
+            Dict of statistic -> (n_boot x teams) array.
+        """
+        rng = np.random.default_rng(seed)
+        n_teams, max_weeks = self.points.shape
+        teams = np.arange(n_teams)[None, :, None]
+        # Slots past a team's weeks are padding and masked out
+        weeks = np.arange(max_weeks)[None, None, :] < self.n_weeks[None, :, None]
+        samples = {name: np.empty((n_boot, n_teams)) for name in self.STATISTICS}
+
+        for start in range(0, n_boot, batch_size):
+            size = min(batch_size, n_boot - start)
+            index = (rng.random((size, n_teams, max_weeks)) * self.n_weeks[None, :, None]).astype(np.int64)
+            points = np.where(weeks, self.points[teams, index], 0.0)
+            win_prob = np.where(weeks, self.win_prob[teams, index], 0.0)
+            for name, values in self._statistics(points, win_prob, self.n_weeks[None, :]).items():
+                samples[name][start:start + size] = values
+        return samples
+
+    def to_frame(self, short_names, n_boot=5000, seed=0, confidence=0.9):
+        """
+        Percentile intervals per team.
+
+        Columns: short_name, roster_id, weeks and, for each statistic
+        (mean, expw, all_play_pct), the point estimate plus _low and _high
+        bounds of the central confidence interval.
+        """
+        tail = (1 - confidence) / 2 * 100
+        frame = pd.DataFrame({
+            "short_name": np.asarray(short_names, dtype=object),
+            "roster_id": self.roster_ids,
+            "weeks": self.n_weeks,
+        })
+        estimates = self.estimates()
+        samples = self.resample(n_boot, seed)
+        for name in self.STATISTICS:
+            frame[name] = estimates[name]
+            frame[name + '_low'], frame[name + '_high'] = np.percentile(samples[name], [tail, 100 - tail], axis=0)
+        return frame
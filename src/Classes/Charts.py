@@ -1,18 +1,101 @@
-import matplotlib.pyplot as plt
+import hashlib
+import io
+import multiprocessing
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-from scipy.interpolate import make_interp_spline
+import pandas as pd
+from matplotlib.figure import Figure
+
+from Metrics import prob_curves
+
+
+class _RenderCache:
+    """PNG bytes of rendered charts, least recently used evicted first."""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            png = self._items.get(key)
+            if png is not None:
+                self._items.move_to_end(key)
+            return png
+
+    def put(self, key, png):
+        with self._lock:
+            self._items[key] = png
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+def _hash_input(value):
+    """Stable digest of a chart input: DataFrames and Series by content, anything else by pickle."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest = pd.util.hash_pandas_object(value, index=True).values.tobytes()
+        if isinstance(value, pd.DataFrame):
+            digest += repr(list(value.columns)).encode()
+        return digest
+    if isinstance(value, np.ndarray):
+        return value.tobytes() + repr((value.dtype, value.shape)).encode()
+    return pickle.dumps(value)
+
 
 class LeagueChart:
+    """
+    Base class for the matplotlib charts.
+
+    Every figure is a standalone matplotlib Figure (no pyplot state), so
+    charts can be drawn from several threads at once, and figures are freed
+    as soon as they go out of scope. Rendered PNGs are cached by a hash of
+    the chart's inputs, so exporting unchanged data does not draw again.
+    """
+
+    cache = _RenderCache()
+
     def __init__(self, filename='performance_chart.png'):
         self.filename = filename
-        pass
 
-    def export(self):
-        pass
+    def inputs(self):
+        """Everything the figure depends on; the render cache key is built from these."""
+        return ()
+
+    def cache_key(self):
+        digest = hashlib.sha1(type(self).__name__.encode())
+        for value in self.inputs():
+            digest.update(_hash_input(value))
+        return digest.hexdigest()
 
     def get_figure(self):
-        """Returns the matplotlib figure object for display in Streamlit"""
-        pass
+        """Returns a new matplotlib figure object for display in Streamlit"""
+        raise NotImplementedError
+
+    def render(self):
+        """Returns the chart as PNG bytes, drawing it only if these inputs were not rendered yet."""
+        key = self.cache_key()
+        png = self.cache.get(key)
+        if png is None:
+            buffer = io.BytesIO()
+            self.get_figure().savefig(buffer, format='png', bbox_inches='tight')
+            png = buffer.getvalue()
+            self.cache.put(key, png)
+        return png
+
+    def export(self):
+        with open(self.filename, 'wb') as f:
+            f.write(self.render())
 
 class LeagueBoxPlot(LeagueChart):
     def __init__(self, scores_df, league_df, filename='boxplot.png'):
@@ -20,66 +103,61 @@ class LeagueBoxPlot(LeagueChart):
         self.data = [scores_df[scores_df['roster_id'] == rid]['points'].values for rid in league_df['roster_id']]
         self.names = league_df['short_name'].values
 
+    def inputs(self):
+        return (self.data, list(self.names))
+
     def get_figure(self):
         """Returns the matplotlib figure object for display"""
-        fig = plt.figure(figsize=(10, 7))
+        fig = Figure(figsize=(10, 7))
         # Creating axes instance
         ax = fig.add_axes([0, 0, 1, 1])
         # Creating plot
-        bp = ax.boxplot(self.data)
-        # show plot
-        plt.title("Boxplot de Pontuação")
-        plt.xticks(range(1, len(self.names)+1), self.names, rotation=90)
+        ax.boxplot(self.data)
+        ax.set_title("Boxplot de Pontuação")
+        ax.set_xticks(range(1, len(self.names)+1), self.names, rotation=90)
         return fig
 
-    def export(self):
-        fig = self.get_figure()
-        plt.savefig(self.filename, bbox_inches='tight')
-        plt.close()
-
 class LeaguePerformanceChart(LeagueChart):
     def __init__(self, league_df, filename='performance_chart.png'):
         super().__init__(filename)
         self.data = league_df.sort_values(by=['avg']).reset_index(drop=True)
 
+    def inputs(self):
+        return (self.data[['short_name', 'avg', 'std']],)
+
     def get_figure(self):
         """Returns the matplotlib figure object for display"""
-        fig = plt.figure(figsize=(10, 6))
-        plt.errorbar(self.data['short_name'], self.data['avg'], yerr=self.data['std'], fmt='o', color='Black', elinewidth=3, capthick=3, errorevery=1, alpha=1, ms=4, capsize=5)
-        plt.bar(self.data['short_name'], self.data['avg'], tick_label=self.data['short_name'])  # Bar plot
-        plt.ylim((70, 165))
-        plt.xlabel('TEAM')  # Label on X axis
-        plt.xticks(rotation=90)
-        plt.ylabel('Average Performance')  # Label on Y axis
+        fig = Figure(figsize=(10, 6))
+        ax = fig.add_subplot()
+        ax.errorbar(self.data['short_name'], self.data['avg'], yerr=self.data['std'], fmt='o', color='Black', elinewidth=3, capthick=3, errorevery=1, alpha=1, ms=4, capsize=5)
+        ax.bar(self.data['short_name'], self.data['avg'], tick_label=self.data['short_name'])  # Bar plot
+        ax.set_ylim((70, 165))
+        ax.set_xlabel('TEAM')  # Label on X axis
+        ax.tick_params(axis='x', labelrotation=90)
+        ax.set_ylabel('Average Performance')  # Label on Y axis
         return fig
 
-    def export(self):
-        fig = self.get_figure()
-        plt.savefig(self.filename, bbox_inches='tight')
-        plt.close()
-
 class LeagueExpWChart(LeagueChart):
     def __init__(self, league_df, filename='expw_chart.png'):
         super().__init__(filename)
         self.data = league_df.sort_values(by=['wins', 'exp_w'])
         self.data = self.data.reset_index(drop=True)
 
+    def inputs(self):
+        return (self.data[['short_name', 'wins', 'exp_w']],)
+
     def get_figure(self):
         """Returns the matplotlib figure object for display"""
-        fig, ax = plt.subplots()
+        fig = Figure()
+        ax = fig.add_subplot()
         ax.bar(self.data['short_name'], self.data['wins'], 0.8, label='Wins', color='b')
         ax.bar(self.data['short_name'], self.data['exp_w'], 0.3, label='Expected Wins', color='c')
         ax.set_ylabel('n° of wins')
         ax.set_title('Actual Wins & Expected Wins')
         ax.legend()
-        plt.xticks(rotation=90)
+        ax.tick_params(axis='x', labelrotation=90)
         return fig
 
-    def export(self):
-        fig = self.get_figure()
-        plt.savefig(self.filename, bbox_inches='tight')
-        plt.close()
-
 class LeagueProbChart(LeagueChart):
     def __init__(self, prob_df, league_df, team_names, filename='prob_chart.png'):
         super().__init__(filename)
@@ -87,45 +165,91 @@ class LeagueProbChart(LeagueChart):
         self.league_df = league_df
         self.team_names = team_names
 
+    def inputs(self):
+        return (self.prob_df, self.league_df[['short_name', 'roster_id', 'wins']], list(self.team_names))
+
     def get_figure(self):
         """Returns the matplotlib figure object for display"""
-        fig = plt.figure(figsize=(10, 6))
-
-        # Iterate over each specified team
-        for short_name in self.team_names:
-            # Get roster_id for this team
-            team_data = self.league_df[self.league_df['short_name'] == short_name]
-
-            roster_id = team_data['roster_id'].values[0]
-            wins = team_data['wins'].values[0]
-
-            # Get probability data for this team
-            team_prob = self.prob_df[self.prob_df['roster_id'] == roster_id].sort_values('n_wins')
-            x_original = team_prob['n_wins'].values
-            data = team_prob['prob'].values
+        fig = Figure(figsize=(10, 6))
+        ax = fig.add_subplot()
 
-            # Create a smooth x range for interpolation
-            x_smooth = np.linspace(x_original.min(), x_original.max(), 200)
-
-            # Create a cubic spline interpolation
-            spline = make_interp_spline(x_original, data, k=2)
-            y_smooth = spline(x_smooth)
+        # Teams x n_wins matrix of the selected teams, smoothed in one spline fit
+        teams = self.league_df.set_index('short_name').loc[list(self.team_names)]
+        matrix = self.prob_df.pivot(index='roster_id', columns='n_wins', values='prob')\
+            .reindex(teams['roster_id']).fillna(0).to_numpy()
+        x_smooth, curves, at_wins = prob_curves(matrix, teams['wins'].to_numpy())
 
+        for short_name, wins, y_smooth, y_wins in zip(self.team_names, teams['wins'], curves, at_wins):
             # Plot the smoothed curve
-            line, = plt.plot(x_smooth, y_smooth, label=short_name)
+            line, = ax.plot(x_smooth, y_smooth, label=short_name)
 
             # Add a circle marker at the actual wins position
-            y_wins = spline(wins)
-            plt.plot(wins, y_wins, 'o', color=line.get_color(), markersize=8)
+            ax.plot(wins, y_wins, 'o', color=line.get_color(), markersize=8)
 
         # Final plot adjustments
-        plt.title("Probabilidade para N vitórias")
-        plt.xlabel("Número de Vitórias")
-        plt.ylabel("Probabilidade")
-        plt.legend()
+        ax.set_title("Probabilidade para N vitórias")
+        ax.set_xlabel("Número de Vitórias")
+        ax.set_ylabel("Probabilidade")
+        ax.legend()
         return fig
 
-    def export(self):
-        fig = self.get_figure()
-        plt.savefig(self.filename, bbox_inches='tight')
-        plt.close()
\ No newline at end of file
+
+# ==================== Batch export ====================
+
+def league_charts(league, out_dir='.', prefix=''):
+    """
+    The standard set of charts for one FantasyLeague, writing to out_dir.
+
+    Only DataFrames are kept, so the charts can be sent to worker processes.
+    """
+    teams_df = league.getTeamsDf().rename(columns={'expw': 'exp_w'})
+    scoring_df = league.getScoringDf()
+    roster_ids, matrix = league.getProbNWinsMatrix()
+    prob_df = pd.DataFrame({
+        'roster_id': np.repeat(roster_ids, matrix.shape[1]),
+        'n_wins': np.tile(np.arange(matrix.shape[1]), len(roster_ids)),
+        'prob': matrix.ravel(),
+    })
+
+    def path(name):
+        return os.path.join(out_dir, prefix + name)
+
+    return [
+        LeagueBoxPlot(scoring_df, teams_df, filename=path('boxplot.png')),
+        LeaguePerformanceChart(teams_df, filename=path('performance_chart.png')),
+        LeagueExpWChart(teams_df, filename=path('expw_chart.png')),
+        LeagueProbChart(prob_df, teams_df, teams_df['short_name'].tolist(), filename=path('prob_chart.png')),
+    ]
+
+
+def _render_chart(chart):
+    return chart.render()
+
+
+def export_charts(charts, max_workers=None):
+    """
+    Renders charts in parallel worker processes and writes each to its filename.
+
+    Charts already in this process's render cache are written without a
+    worker; the rest are drawn on a process pool (matplotlib drawing holds
+    the GIL, so threads would not scale) and added to the cache.
+
+    Args:
+        charts: LeagueChart objects, from any number of leagues
+        max_workers: Worker processes (defaults to the CPU count)
+
+    Returns:
+        The written filenames.
+    """
+    pending = [chart for chart in charts if LeagueChart.cache.get(chart.cache_key()) is None]
+    if pending:
+        max_workers = min(max_workers or os.cpu_count() or 1, len(pending))
+        # Spawned, not forked, since the caller may have live threads
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            for chart, png in zip(pending, executor.map(_render_chart, pending)):
+                LeagueChart.cache.put(chart.cache_key(), png)
+
+    for chart in charts:
+        os.makedirs(os.path.dirname(os.path.abspath(chart.filename)), exist_ok=True)
+        chart.export()
+    return [chart.filename for chart in charts]
@@ -0,0 +1,262 @@
+import itertools
+
+import numpy as np
+
+from SeedCalculator import SeedCalculator, TiebreakIndex
+
+
+class ClinchSolver:
+    """
+    Exact clinch and elimination checks over the remaining schedule.
+
+    A team has clinched a spot among the top k seeds when no combination of
+    remaining results drops it below seed k, and is eliminated when no
+    combination lifts it into the playoffs. Each question is a depth-first
+    search over game outcomes, seeded at the leaves with SeedCalculator's
+    tiebreak order, with three kinds of pruning:
+
+    1. Win-count bounds: wins are the first tiebreaker, so a branch stops as
+       soon as the current and maximum possible wins settle the answer.
+    2. Memoized partial standings: branches that reach the same wins and
+       head-to-head/division records (e.g. a pair that still meets twice)
+       are searched once.
+    3. Move ordering: outcomes most likely to produce a counterexample are
+       tried first.
+
+    Future points are unknown, so each team's expected wins can still grow
+    by up to one per remaining game. Expected-wins comparisons these ranges
+    leave open go against the team being tested when looking for it to
+    miss the cut, and its way when looking for it to make it. Among the
+    other teams, the open comparisons matter only where they decide which
+    division rival holds the tested team's division seed; every possible
+    holder is tried.
+    """
+
+    def __init__(self, index, schedule, node_limit=200000):
+        """
+        Args:
+            index: TiebreakIndex with the current standings
+            schedule: List of (week, roster_id, roster_id) games left to play
+            node_limit: Search nodes allowed per question before giving up
+        """
+        self.index = index
+        self.node_limit = node_limit
+        self.seeding_calculator = SeedCalculator()
+
+        n_teams = len(index.roster_ids)
+        position = {roster_id: i for i, roster_id in enumerate(index.roster_ids)}
+        self.games = [(position[home], position[away]) for _, home, away in sorted(schedule)]
+        self.n_teams = n_teams
+
+        # Pairs that still play, so head-to-head changes can be part of the memo key
+        self.pairs = sorted({tuple(sorted(game)) for game in self.games})
+        pair_position = {pair: i for i, pair in enumerate(self.pairs)}
+        self.game_pair = [pair_position[tuple(sorted(game))] for game in self.games]
+        divisions = index.divisions
+        self.game_division = [
+            divisions[home] is not None and divisions[home] == divisions[away] for home, away in self.games
+        ]
+
+        # remaining[g][t]: games team t still plays from game g on
+        self.remaining = [[0] * n_teams for _ in range(len(self.games) + 1)]
+        for g in range(len(self.games) - 1, -1, -1):
+            self.remaining[g] = list(self.remaining[g + 1])
+            home, away = self.games[g]
+            self.remaining[g][home] += 1
+            self.remaining[g][away] += 1
+
+        self.h2h_games = index.h2h_games.copy()
+        self.division_games = index.division_games.copy()
+        for (home, away), division_game in zip(self.games, self.game_division):
+            self.h2h_games[home, away] += 1
+            self.h2h_games[away, home] += 1
+            if division_game:
+                self.division_games[home] += 1
+                self.division_games[away] += 1
+
+        # Each remaining game adds between 0 and 1 expected wins
+        self.expw_low = np.array(index.expw, dtype=float)
+        self.expw_high = self.expw_low + np.asarray(self.remaining[0])
+
+    def _league_seeds(self, team, wins, h2h_delta, division_delta, outside):
+        """
+        League seeds team can finish with for these final records, as the
+        remaining expected wins fall.
+
+        Team ends at the bottom of its expected-wins range and everyone else
+        at the top when looking for it to finish outside the cut, and the
+        other way round otherwise. Every other way to order a group of rivals
+        tied with team on wins, whose division order is left to expected
+        wins, is then tried for the rival holding team's division seed.
+        """
+        h2h_wins = self.index.h2h_wins.copy()
+        for (low, high), (low_wins, high_wins) in zip(self.pairs, h2h_delta):
+            h2h_wins[low, high] += low_wins
+            h2h_wins[high, low] += high_wins
+
+        if outside:
+            expw = self.expw_high.copy()
+            expw[team] = self.expw_low[team]
+        else:
+            expw = self.expw_low.copy()
+            expw[team] = self.expw_high[team]
+        index = TiebreakIndex(
+            self.index.roster_ids, self.index.divisions, wins, h2h_wins, self.h2h_games,
+            self.index.division_wins + np.asarray(division_delta), self.division_games, expw
+        )
+        expw_groups = []
+        division_seeds, league_seeds = self.seeding_calculator.rank(index, expw_groups)
+        yield league_seeds[team]
+
+        team_seed = division_seeds[team]
+        holders = []
+        for group in expw_groups:
+            if team in group or wins[group[0]] != wins[team]:
+                continue
+            order = sorted(group, key=lambda rival: division_seeds[rival])
+            slot = team_seed - division_seeds[order[0]]
+            if 0 <= slot < len(order):
+                holders.append([None] + self._slot_orders(order, slot))
+
+        for choice in itertools.product(*holders):
+            if all(order is None for order in choice):
+                continue
+            index.expw = expw.copy()
+            for order in choice:
+                if order is not None:
+                    # Strictly decreasing expected wins, in the chosen order
+                    index.expw[order] = index.expw[order].max() - np.arange(len(order)) * 1e-9
+            yield self.seeding_calculator.rank(index)[1][team]
+
+    def _slot_orders(self, order, slot):
+        """
+        Orders of a group of rivals that put a different rival at position
+        slot. A rival can only move past rivals whose expected-wins range
+        overlaps its own.
+        """
+        orders = []
+        for i, rival in enumerate(order):
+            passed = order[min(i, slot):max(i, slot) + 1]
+            if i != slot and all(
+                self.expw_low[rival] < self.expw_high[other] and self.expw_low[other] < self.expw_high[rival]
+                for other in passed if other != rival
+            ):
+                rest = order[:i] + order[i + 1:]
+                orders.append(rest[:slot] + [rival] + rest[slot:])
+        return orders
+
+    def _exists(self, team, cutoff, outside):
+        """
+        Searches for remaining results that leave team outside the top cutoff
+        seeds (outside=True) or inside them (outside=False).
+
+        Returns:
+            True or False, or None if the node limit was reached first.
+        """
+        n_teams = self.n_teams
+        memo = {}
+        nodes = [0]
+
+        def search(g, wins, h2h_delta, division_delta):
+            remaining = self.remaining[g]
+            team_min = wins[team]
+            team_max = wins[team] + remaining[team]
+            ahead_for_sure = sum(1 for t in range(n_teams) if t != team and wins[t] > team_max)
+            may_finish_ahead = sum(1 for t in range(n_teams) if t != team and wins[t] + remaining[t] >= team_min)
+
+            # Win-count bounds
+            if outside:
+                if ahead_for_sure >= cutoff:
+                    return True
+                if may_finish_ahead < cutoff:
+                    return False
+            else:
+                if ahead_for_sure >= cutoff:
+                    return False
+                if may_finish_ahead < cutoff:
+                    return True
+
+            if g == len(self.games):
+                seeds = self._league_seeds(team, wins, h2h_delta, division_delta, outside)
+                return any(seed > cutoff if outside else seed <= cutoff for seed in seeds)
+
+            key = (g, tuple(wins), tuple(h2h_delta), tuple(division_delta))
+            if key in memo:
+                return memo[key]
+
+            nodes[0] += 1
+            if nodes[0] > self.node_limit:
+                raise _NodeLimitReached()
+
+            home, away = self.games[g]
+            if team in (home, away):
+                # The tested team losing is the likelier counterexample for clinching
+                opponent = away if team == home else home
+                winners = (opponent, team) if outside else (team, opponent)
+            else:
+                # Spread wins when looking for teams to pass it, concentrate them otherwise
+                weaker, stronger = (home, away) if wins[home] <= wins[away] else (away, home)
+                winners = (weaker, stronger) if outside else (stronger, weaker)
+
+            found = False
+            for winner in winners:
+                loser = away if winner == home else home
+                pair = self.game_pair[g]
+                low_wins, high_wins = h2h_delta[pair]
+                wins[winner] += 1
+                h2h_delta[pair] = (low_wins + 1, high_wins) if winner < loser else (low_wins, high_wins + 1)
+                if self.game_division[g]:
+                    division_delta[winner] += 1
+
+                found = search(g + 1, wins, h2h_delta, division_delta)
+
+                wins[winner] -= 1
+                h2h_delta[pair] = (low_wins, high_wins)
+                if self.game_division[g]:
+                    division_delta[winner] -= 1
+                if found:
+                    break
+
+            memo[key] = found
+            return found
+
+        try:
+            return search(0, self.index.wins.tolist(), [(0, 0)] * len(self.pairs), [0] * n_teams)
+        except _NodeLimitReached:
+            return None
+
+    def clinched(self, team, cutoff):
+        """True if team finishes in the top cutoff seeds in every scenario (None if undetermined)."""
+        outside = self._exists(team, cutoff, outside=True)
+        return None if outside is None else not outside
+
+    def eliminated(self, team, cutoff):
+        """True if team finishes outside the top cutoff seeds in every scenario (None if undetermined)."""
+        inside = self._exists(team, cutoff, outside=False)
+        return None if inside is None else not inside
+
+    def solve(self, playoff_teams, byes=0):
+        """
+        Clinch and elimination flags for every team.
+
+        Returns:
+            Dict of roster_id -> {"clinched_playoffs", "clinched_bye", "eliminated"}.
+            A flag is None when the search hit the node limit.
+        """
+        flags = {}
+        for team, roster_id in enumerate(self.index.roster_ids):
+            eliminated = self.eliminated(team, playoff_teams)
+            clinched_playoffs = False if eliminated else self.clinched(team, playoff_teams)
+            clinched_bye = None if clinched_playoffs is None else False
+            if byes and clinched_playoffs:
+                clinched_bye = self.clinched(team, byes)
+            flags[roster_id] = {
+                "clinched_playoffs": clinched_playoffs,
+                "clinched_bye": clinched_bye,
+                "eliminated": eliminated,
+            }
+        return flags
+
+
+class _NodeLimitReached(Exception):
+    pass
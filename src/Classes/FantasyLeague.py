@@ -1,41 +1,145 @@
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import requests as rq
 import json
 
-from Team import Team, WeekPerformance
-from SeedCalculator import SeedCalculator
+from Team import Team
+from SeasonStore import SeasonStore
+from Metrics import prob_n_wins_matrix, prob_curves
+from AllPlay import AllPlayEngine
+from SleeperClient import SleeperClient
+from ResponseCache import ResponseCache
+from SeedCalculator import SeedCalculator, TiebreakIndex
+from PlayoffSimulator import PlayoffSimulator
+from ClinchSolver import ClinchSolver
+from Lineups import LineupOptimizer
+from PlayerIndex import PlayerIndex
+from Transactions import TransactionLog
+from HeadToHead import HeadToHeadMatrix
+from ScheduleSwap import ScheduleSwapEngine
+from Bootstrap import BootstrapEngine
+from Profiler import profiled
 
 class FantasyLeague:
-    def __init__(self, from_json=None, league_id=None, divisions=None):
+    def __init__(self, from_json=None, league_id=None, divisions=None, client=None, config=None, final_week=None,
+                 transactions=None):
+        """
+        Args:
+            from_json: Path to a league config file
+            league_id, divisions: League settings when no config is given
+            client: SleeperClient to fetch with (a cached one by default)
+            config: League config dict, shaped like league_config.json
+            final_week: Load a finished season through this week instead of
+                        up to the current NFL week
+            transactions: TransactionLog to keep using across loads of the same
+                          league, so refreshes only pull new transactions
+        """
+        cache_path = None
+        base_url = None
+        self.players_path = None
+        self.playoff_byes = 0
         if from_json:
             # Load configuration from JSON file
             with open(from_json, 'r', encoding='utf-8') as f:
                 config = json.load(f)
+        if config:
             self.league_id = config.get('league_id')
             divisions = config.get('divisions')
+            cache_path = config.get('cache_path')
+            base_url = config.get('base_url')
+            self.players_path = config.get('players_path')
+            self.playoff_byes = config.get('playoff_byes', 0)
         else:
             self.league_id = league_id
 
         self.teams = {}
         self.seeding_calculator = SeedCalculator()
-        self.retrieve_teams(divisions)
-        self.retrieve_scoring()
+        self._clinch_flags = None
+        self._lineups = None
+        self._head_to_head = None
+        self._schedule_swap = None
+        self._bootstrap = None
+        self._player_index = None
+        self.client = client or SleeperClient(base_url=base_url, cache=ResponseCache(cache_path))
+        self.transactions = transactions or TransactionLog(self.client, self.league_id)
+
+        # Users and rosters load while the NFL state is fetched, then every week loads concurrently.
+        # Weeks before the current one are final, so they are cached forever.
+        league_future = self.client.submit(SleeperClient.league_path(self.league_id), SleeperClient.LEAGUE_TTL)
+        users_future = self.client.submit(SleeperClient.users_path(self.league_id), SleeperClient.USERS_TTL)
+        rosters_future = self.client.submit(SleeperClient.rosters_path(self.league_id), SleeperClient.ROSTERS_TTL)
+        if final_week is None:
+            nfl_state = self.client.get(SleeperClient.nfl_state_path(), SleeperClient.NFL_STATE_TTL)
+        else:
+            nfl_state = {'week': final_week + 1}
+        week_futures = {
+            week: self.client.submit(SleeperClient.matchups_path(self.league_id, week), None)
+            for week in range(1, nfl_state['week'])
+        }
+
+        self.retrieve_settings(league_future.result())
+        self.retrieve_teams(divisions, users_future.result(), rosters_future.result())
+        self.retrieve_scoring(nfl_state, {week: future.result() for week, future in week_futures.items()})
         self.update_seeding()
 
     def update_seeding(self):
-        self.seeding_calculator.calculate_and_update_seeding(self.teams)
+        # The tiebreak index is kept up to date as weeks are ingested; only expected wins change wholesale
+        self.tiebreak_index.expw = np.array([team.getMetric("expw") or 0 for team in self.teams.values()], dtype=float)
+        self.seeding_calculator.calculate_and_update_seeding(self.teams, self.tiebreak_index)
+
+    def refresh(self):
+        """
+        Ingests weeks completed since the last load and updates metrics and seeding.
+
+        Only weeks that were not loaded yet are fetched and appended; weeks
+        before the current NFL week are final, so loaded weeks never change.
+        Weeks that just became final are always refetched from the API and
+        their cache entries overwritten before they are marked loaded, since
+        whatever was cached for them may predate the final scores.
+
+        Returns:
+            (teams_df, scoring_df) holding only the team rows that changed
+            and the scoring rows of the new weeks. Both are empty when there
+            is nothing new.
+        """
+        nfl_state = self.client.get(SleeperClient.nfl_state_path())
+        new_weeks = [week for week in range(1, nfl_state['week']) if week not in self.loaded_weeks]
+        self.current_week = max(self.current_week, nfl_state['week'])
+        if not new_weeks:
+            return pd.DataFrame(), pd.DataFrame()
+
+        payloads = self.client.get_many(
+            [SleeperClient.matchups_path(self.league_id, week) for week in new_weeks], None, refetch=True
+        )
+        previous = {team.roster_id: (team.league_seed, team.division_seed) for team in self.teams.values()}
 
-    def retrieve_teams(self, divisions):
-        # Fetch users data
-        response = rq.get('https://api.sleeper.app/v1/league/{}/users'.format(self.league_id))
-        users_data = json.loads(response.text)
+        for week, week_data in zip(new_weeks, payloads):
+            self.ingest_week(week, week_data)
+        self.update_seeding()
+
+        changed_ids = {
+            team.roster_id for team in self.teams.values()
+            if previous[team.roster_id] != (team.league_seed, team.division_seed)
+        }
+        for week in new_weeks:
+            changed_ids.update(self._week_rosters[week])
 
-        # Fetch rosters data
-        response = rq.get('https://api.sleeper.app/v1/league/{}/rosters'.format(self.league_id))
-        rosters_data = json.loads(response.text)
+        clinch_flags = self.getClinchFlags()
+        teams_df = pd.DataFrame([
+            {**self.teams[roster_id].to_dict(), **clinch_flags[roster_id]}
+            for roster_id in self.teams if roster_id in changed_ids
+        ])
+        return teams_df, self._scoring_frame(weeks=new_weeks)
 
+    def retrieve_settings(self, league_data):
+        settings = (league_data or {}).get('settings', {})
+        self.name = (league_data or {}).get('name')
+        # Sleeper defaults: regular season ends before week 15, six playoff teams
+        self.playoff_week_start = settings.get('playoff_week_start') or 15
+        self.playoff_teams = settings.get('playoff_teams') or 6
+        self.roster_positions = (league_data or {}).get('roster_positions') or []
+
+    @profiled('league.retrieve_teams')
+    def retrieve_teams(self, divisions, users_data, rosters_data):
         # Create a mapping of owner_id to roster_id
         owner_to_roster = {}
         for roster in rosters_data:
@@ -48,8 +152,8 @@ class FantasyLeague:
                 for team_name in division['team_names']:
                     division_by_team[team_name] = division['name']
 
-        # Create Team objects indexed by roster_id
-        teams = {}
+        # Collect the teams that have an owner
+        entries = []
         for user in users_data:
             user_id = user['user_id']
             team_name = user.get('metadata', {}).get('team_name')
@@ -60,11 +164,16 @@ class FantasyLeague:
                 short_name = team_name.split()[1] if len(team_name.split()) > 1 else team_name
 
                 division = division_by_team.get(short_name)
+                entries.append((team_name, roster_id, division, user_id))
 
-                team = Team(team_name, roster_id, division)
-                teams[roster_id] = team
+        # Create Team objects indexed by roster_id, all viewing the same season store
+        self.store = SeasonStore([entry[1] for entry in entries])
+        teams = {}
+        for team_name, roster_id, division, user_id in entries:
+            teams[roster_id] = Team(team_name, roster_id, division, self.store, owner_id=user_id)
 
         self.teams = teams
+        self.tiebreak_index = TiebreakIndex.from_teams(list(teams.values()))
 
         # Create division_map: division -> [roster_ids]
         self.division_map = {}
@@ -78,86 +187,119 @@ class FantasyLeague:
                     if team.division == division_name:
                         self.division_map[division_name].append(team.roster_id)
 
-    def retrieve_scoring(self):
+    @profiled('league.retrieve_scoring')
+    def retrieve_scoring(self, nfl_state, matchups_by_week):
         # Get current week
-        response = rq.get('https://api.sleeper.app/v1/state/nfl')
-        data = json.loads(response.text)
-        self.current_week = data['week']
+        self.current_week = nfl_state['week']
+        self.loaded_weeks = set()
+        self._week_rosters = {}
+        self._week_lineups = {}
 
-        # Retrieve scoring data for each week
+        # Process scoring data for each week
         for week in range(1, self.current_week):
-            response = rq.get('https://api.sleeper.app/v1/league/{}/matchups/{}'.format(self.league_id, week))
-            week_data = json.loads(response.text)
-
-            # Collect all performances for this week to calculate ranks
-            week_performances = []
-            for team_performance in week_data:
-                roster_id = team_performance["roster_id"]
-                points = team_performance["points"]
-                matchup_id = team_performance["matchup_id"]
-                week_performances.append({
-                    "roster_id": roster_id,
-                    "points": points,
-                    "matchup_id": matchup_id
-                })
-
-            # Sort by points to determine ranks
-            week_performances.sort(key=lambda x: x["points"], reverse=True)
-
-            # Assign ranks to each performance
-            for rank, perf in enumerate(week_performances, start=1):
-                perf["rank"] = rank
-
-            # Create a mapping of matchup_id to performances
-            matchup_map = {}
-            for perf in week_performances:
-                matchup_id = perf["matchup_id"]
-                if matchup_id not in matchup_map:
-                    matchup_map[matchup_id] = []
-                matchup_map[matchup_id].append(perf)
-
-            # Assign ranks and create WeekPerformance objects with opponent data
-            for perf in week_performances:
-                roster_id = perf["roster_id"]
-                points = perf["points"]
-                rank = perf["rank"]
-                matchup_id = perf["matchup_id"]
-
-                # Find opponent in the same matchup
-                opponent = None
-                for other_perf in matchup_map[matchup_id]:
-                    if other_perf["roster_id"] != roster_id:
-                        opponent = other_perf
-                        break
-
-                # Get opponent data
-                adversary_points = opponent["points"] if opponent else None
-                adversary_rank = opponent["rank"] if opponent else None
-                adversary_id = opponent["roster_id"] if opponent else None
-                divisional_game = self.teams[roster_id].division == self.teams[adversary_id].division if adversary_id else False
-
-                team = self.teams.get(roster_id)
-                if team:
-                    week_perf = WeekPerformance(week, points, rank, divisional_game, adversary_id, adversary_points, adversary_rank)
-                    team.insert_week(week_perf)
+            self.ingest_week(week, matchups_by_week[week])
+
+    def ingest_week(self, week, week_data):
+        """Appends one completed week of matchup data to the teams and the tiebreak index."""
+        # Collect all performances for this week to calculate ranks
+        week_performances = []
+        for team_performance in week_data:
+            roster_id = team_performance["roster_id"]
+            points = team_performance["points"]
+            matchup_id = team_performance["matchup_id"]
+            week_performances.append({
+                "roster_id": roster_id,
+                "points": points,
+                "matchup_id": matchup_id
+            })
+
+        # Keep the player data for the lineup analysis
+        self._week_lineups[week] = [
+            (perf["roster_id"], perf.get("players"), perf.get("starters"), perf.get("players_points"))
+            for perf in week_data if perf["roster_id"] in self.teams
+        ]
+
+        # Sort by points to determine ranks
+        week_performances.sort(key=lambda x: x["points"], reverse=True)
+
+        # Assign ranks to each performance; tied scores share the best rank
+        ranks = AllPlayEngine([[perf["points"] for perf in week_performances]]).rank[0]
+        for rank, perf in zip(ranks.tolist(), week_performances):
+            perf["rank"] = rank
+
+        # Create a mapping of matchup_id to performances
+        matchup_map = {}
+        for perf in week_performances:
+            matchup_id = perf["matchup_id"]
+            if matchup_id not in matchup_map:
+                matchup_map[matchup_id] = []
+            matchup_map[matchup_id].append(perf)
+
+        # Assign ranks and collect the week's columns with opponent data
+        columns = {"roster_ids": [], "points": [], "ranks": [], "opponents": [], "division_games": []}
+        results = []
+        for perf in week_performances:
+            roster_id = perf["roster_id"]
+            points = perf["points"]
+            rank = perf["rank"]
+            matchup_id = perf["matchup_id"]
+
+            # Find opponent in the same matchup
+            opponent = None
+            for other_perf in matchup_map[matchup_id]:
+                if other_perf["roster_id"] != roster_id:
+                    opponent = other_perf
+                    break
+
+            # Get opponent data
+            adversary_points = opponent["points"] if opponent else None
+            adversary_id = opponent["roster_id"] if opponent else None
+            divisional_game = self.teams[roster_id].division == self.teams[adversary_id].division if adversary_id else False
+
+            if roster_id in self.teams:
+                columns["roster_ids"].append(roster_id)
+                columns["points"].append(points)
+                columns["ranks"].append(rank)
+                columns["opponents"].append(adversary_id)
+                columns["division_games"].append(divisional_game)
+                results.append((roster_id, adversary_id, adversary_points is not None and points > adversary_points, divisional_game))
+
+        self.store.append_week(week, **columns)
+        for result in results:
+            self.tiebreak_index.add_result(*result)
+
+        self.loaded_weeks.add(week)
+        self._week_rosters[week] = [perf["roster_id"] for perf in week_performances]
 
     def getTeamsData(self):
         teamsData=[]
+        clinch_flags = self.getClinchFlags()
         for team in self.teams.values():
-            teamsData.append(team.to_dict())
+            teamsData.append({**team.to_dict(), **clinch_flags[team.roster_id]})
         return teamsData
+
+    @profiled('seeding.clinch_flags')
+    def getClinchFlags(self):
+        """
+        Exact clinch/elimination flags per roster_id, recomputed only when new weeks arrive.
+
+        Returns:
+            Dict of roster_id -> {"clinched_playoffs", "clinched_bye", "eliminated"}
+            (a flag is None if the search could not settle it).
+        """
+        if self._clinch_flags is None or self._clinch_flags[0] != self.store.version:
+            solver = ClinchSolver(self.tiebreak_index, self.getRemainingSchedule())
+            self._clinch_flags = (self.store.version, solver.solve(self.playoff_teams, self.playoff_byes))
+        return self._clinch_flags[1]
     
+    def getCacheStats(self):
+        return self.client.stats()
+
     def getCurrentWeek(self):
         return self.current_week
 
     def getWeekScores(self, week):
-        week_scores = []
-        for team in self.teams.values():
-            week_scores.append({
-                "short_name": team.short_name,
-                **team.getWeek(week)
-            })
-        return week_scores
+        return self._scoring_frame(weeks=[week]).to_dict('records')
 
     def getTeamScores(self, short_name):
         for team in self.teams.values():
@@ -165,14 +307,185 @@ class FantasyLeague:
                 return team.getPoints()
         return []
 
+    def _short_names(self):
+        """Team short names in the store's roster order."""
+        return [self.teams[int(roster_id)].short_name for roster_id in self.store.roster_ids]
+
+    def _scoring_frame(self, weeks=None):
+        return self.store.to_frame(self._short_names(), weeks)
+
+    @profiled('dataframe.scoring')
     def getScoringDf(self):
-        data = []
-        for week in range(1, self.current_week):
-            data.extend([
-                {"week": week,**score}
-                for score in self.getWeekScores(week)
-            ])
-        return pd.DataFrame(data)
+        return self._scoring_frame()
     
+    def getProbNWinsMatrix(self):
+        """
+        Win-count distribution for every team, computed in one vectorized pass.
+
+        Returns:
+            (roster_ids, matrix) where matrix[i, n] is P(team roster_ids[i] has n wins).
+        """
+        roster_ids = list(self.teams.keys())
+        n_weeks = max((len(team.getWinProbs()) for team in self.teams.values()), default=0)
+        win_probs = np.zeros((len(roster_ids), n_weeks))
+        for i, team in enumerate(self.teams.values()):
+            probs = team.getWinProbs()
+            win_probs[i, :len(probs)] = probs
+        return roster_ids, prob_n_wins_matrix(win_probs)
+
+    @profiled('dataframe.prob_curves')
+    def getProbCurvesDf(self, n_points=200):
+        """
+        Smoothed win-count probability curves for every team, fitted in one pass.
+
+        Returns:
+            Tidy DataFrame with short_name, roster_id, wins, prob and marker
+            columns: n_points curve rows per team (marker False) plus one row
+            at the team's actual wins (marker True).
+        """
+        roster_ids, matrix = self.getProbNWinsMatrix()
+        teams_list = [self.teams[roster_id] for roster_id in roster_ids]
+        actual_wins = np.array([team.wins for team in teams_list], dtype=float)
+        x, curves, at_wins = prob_curves(matrix, actual_wins, n_points)
+
+        n_teams = len(teams_list)
+        short_names = np.array([team.short_name for team in teams_list], dtype=object)
+        return pd.DataFrame({
+            "short_name": np.concatenate([np.repeat(short_names, n_points), short_names]),
+            "roster_id": np.concatenate([np.repeat(roster_ids, n_points), roster_ids]),
+            "wins": np.concatenate([np.tile(x, n_teams), actual_wins]),
+            "prob": np.concatenate([curves.ravel(), at_wins]),
+            "marker": np.repeat([False, True], [n_teams * n_points, n_teams]),
+        })
+
+    def getRemainingSchedule(self):
+        """
+        Regular-season games not played yet, from the current week to the playoffs.
+
+        Returns:
+            List of (week, roster_id, roster_id) tuples, one per game.
+        """
+        weeks = list(range(self.current_week, self.playoff_week_start))
+        payloads = self.client.get_many(
+            [SleeperClient.matchups_path(self.league_id, week) for week in weeks], SleeperClient.SCHEDULE_TTL
+        )
+
+        schedule = []
+        for week, week_data in zip(weeks, payloads):
+            matchups = {}
+            for team_performance in week_data or []:
+                if team_performance.get("matchup_id") is not None and team_performance["roster_id"] in self.teams:
+                    matchups.setdefault(team_performance["matchup_id"], []).append(team_performance["roster_id"])
+            for roster_ids in matchups.values():
+                if len(roster_ids) == 2:
+                    schedule.append((week, roster_ids[0], roster_ids[1]))
+        return schedule
+
+    @profiled('simulation.playoff_odds')
+    def getPlayoffOddsDf(self, n_sims=100000, seed=0, max_workers=None):
+        """
+        Monte Carlo odds of every league seed and division seed for each team.
+
+        Returns:
+            DataFrame with one row per team: short_name, roster_id, playoffs
+            (probability of a top playoff_teams seed), seed_1..seed_N and
+            division_seed_1..division_seed_K probabilities.
+        """
+        teams_list = [self.teams[int(roster_id)] for roster_id in self.tiebreak_index.roster_ids]
+        simulator = PlayoffSimulator(
+            self.tiebreak_index,
+            self.getRemainingSchedule(),
+            means=[team.getMetric("avg") or 0 for team in teams_list],
+            stds=[team.getMetric("std") or 0 for team in teams_list],
+        )
+        league_probs, division_probs = simulator.run(n_sims=n_sims, seed=seed, max_workers=max_workers)
+
+        odds_df = pd.DataFrame({
+            "short_name": [team.short_name for team in teams_list],
+            "roster_id": [team.roster_id for team in teams_list],
+            "division": [team.division for team in teams_list],
+            "playoffs": league_probs[:, :self.playoff_teams].sum(axis=1),
+        })
+        for seed_idx in range(league_probs.shape[1]):
+            odds_df["seed_{}".format(seed_idx + 1)] = league_probs[:, seed_idx]
+        for seed_idx in range(division_probs.shape[1]):
+            odds_df["division_seed_{}".format(seed_idx + 1)] = division_probs[:, seed_idx]
+        return odds_df
+
+    @profiled('dataframe.head_to_head')
+    def getHeadToHeadDf(self):
+        """
+        H2H record, all-play record and average margins for every ordered pair of teams.
+
+        Recomputed only when new weeks arrive. See HeadToHeadMatrix.to_frame for the columns.
+        """
+        if self._head_to_head is None or self._head_to_head[0] != self.store.version:
+            matrix = HeadToHeadMatrix.from_scoring_df(self.getScoringDf(), self.store.roster_ids)
+            self._head_to_head = (self.store.version, matrix.to_frame(self._short_names()))
+        return self._head_to_head[1]
+
+    def getScheduleSwap(self):
+        """Every team's record on every other team's schedule, recomputed only when new weeks arrive."""
+        if self._schedule_swap is None or self._schedule_swap[0] != self.store.version:
+            self._schedule_swap = (self.store.version, ScheduleSwapEngine.from_scoring_df(self.getScoringDf(), self.store.roster_ids))
+        return self._schedule_swap[1]
+
+    @profiled('dataframe.schedule_swap')
+    def getScheduleSwapDf(self):
+        """Swapped records for every (team, schedule) pair; see ScheduleSwapEngine.to_frame."""
+        return self.getScheduleSwap().to_frame(self._short_names())
+
+    @profiled('simulation.schedule_luck')
+    def getScheduleLuckDf(self, n_schedules=10000, seed=0):
+        """Schedule luck per team against swapped and random schedules; see ScheduleSwapEngine.luck_frame."""
+        return self.getScheduleSwap().luck_frame(self._short_names(), n_schedules, seed)
+
+    @profiled('simulation.bootstrap')
+    def getBootstrapDf(self, n_boot=5000, seed=0, confidence=0.9):
+        """
+        Bootstrap confidence intervals for mean points, expected wins and all-play percentage.
+
+        Recomputed only when new weeks arrive or the settings change. See
+        BootstrapEngine.to_frame for the columns.
+        """
+        key = (self.store.version, n_boot, seed, confidence)
+        if self._bootstrap is None or self._bootstrap[0] != key:
+            engine = BootstrapEngine(self.store.roster_ids, self.store.points, self.store.all_play().win_prob)
+            self._bootstrap = (key, engine.to_frame(self._short_names(), n_boot, seed, confidence))
+        return self._bootstrap[1]
+
+    def getTransactionsDf(self):
+        """
+        Transactions through the current week, pulling only those new since the last call.
+
+        Not part of the league snapshot: the open weeks are always refetched,
+        so only call this when the table is actually shown.
+        """
+        self.transactions.refresh(self.current_week)
+        return self.transactions.to_frame()
+
+    def getPlayerIndex(self):
+        """Memory-mapped NFL player metadata (names, teams, positions), rebuilt at most once a day."""
+        if self._player_index is None:
+            self._player_index = PlayerIndex.open(self.players_path, self.client)
+        return self._player_index
+
+    @profiled('dataframe.lineups')
+    def getLineupDf(self):
+        """
+        Optimal lineup and points left on the bench for every team and week.
+
+        Recomputed only when new weeks arrive. See LineupOptimizer.to_frame
+        for the columns; empty when the matchups carry no player data.
+        """
+        if self._lineups is None or self._lineups[0] != self.store.version:
+            has_players = any(entry[1] for entries in self._week_lineups.values() for entry in entries)
+            index = self.getPlayerIndex() if has_players else None
+            optimizer = LineupOptimizer(self.roster_positions, index.positions if index else {})
+            short_names = {roster_id: team.short_name for roster_id, team in self.teams.items()}
+            self._lineups = (self.store.version, optimizer.to_frame(self._week_lineups if index else {}, short_names))
+        return self._lineups[1]
+
+    @profiled('dataframe.teams')
     def getTeamsDf(self):
         return pd.DataFrame(self.getTeamsData())
\ No newline at end of file
@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+
+
+def scoring_matrices(scoring_df, roster_ids=None):
+    """
+    Rebuilds the (weeks x teams) matrices from the long scoring table (see SeasonStore.to_frame).
+
+    Args:
+        scoring_df: DataFrame with week, roster_id, points and adversary_id columns
+        roster_ids: Team order (the sorted roster ids by default); teams
+            without any row get empty columns
+
+    Returns:
+        (roster_ids, points, opponent_columns): points is NaN where a team
+        did not play, opponent_columns is -1 where there was no opponent.
+    """
+    if roster_ids is None:
+        roster_ids = np.unique(scoring_df['roster_id'].to_numpy())
+    roster_ids = np.asarray(roster_ids)
+    weeks = np.unique(scoring_df['week'].to_numpy())
+
+    lookup = np.full(int(roster_ids.max(initial=0)) + 1, -1, dtype=np.int64)
+    lookup[roster_ids] = np.arange(len(roster_ids))
+
+    def column_of(ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        known = (ids > 0) & (ids < len(lookup))
+        return np.where(known, lookup[np.where(known, ids, 0)], -1)
+
+    rows = np.searchsorted(weeks, scoring_df['week'].to_numpy())
+    columns = column_of(scoring_df['roster_id'].to_numpy())
+    keep = columns >= 0
+
+    points = np.full((len(weeks), len(roster_ids)), np.nan)
+    opponent_columns = np.full((len(weeks), len(roster_ids)), -1, dtype=np.int64)
+    points[rows[keep], columns[keep]] = scoring_df['points'].to_numpy(dtype=float)[keep]
+    opponent_columns[rows[keep], columns[keep]] = column_of(scoring_df['adversary_id'].to_numpy())[keep]
+    return roster_ids, points, opponent_columns
+
+
+class HeadToHeadMatrix:
+    """
+    Pairwise statistics for every pair of teams in a season.
+
+    All pairs are derived at once from the (weeks x teams) points and
+    opponent matrices: actual games are accumulated with one bincount over
+    flattened (team, opponent) indices, and all-play results with one
+    broadcast comparison of every team against every other each week.
+    Entry [i, j] is always from team i's point of view.
+
+    Attributes (all teams x teams, rows and columns in roster_ids order):
+        games, wins, losses, ties: Actual head-to-head games and results
+        margin: Average points margin in those games (NaN if they never met)
+        all_play_wins, all_play_losses, all_play_ties: Weeks team i scored
+            more than, less than or the same as team j
+        points_margin: Average weekly points difference over every week
+            both teams played (NaN if there was none)
+    """
+
+    def __init__(self, roster_ids, points, opponent_columns):
+        """
+        Args:
+            roster_ids: Roster id of each team column
+            points: (weeks x teams) points, NaN when a team did not play
+            opponent_columns: (weeks x teams) column of each game's opponent, -1 when there is none
+        """
+        self.roster_ids = np.asarray(roster_ids)
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        opponent_columns = np.atleast_2d(np.asarray(opponent_columns))
+        n_teams = len(self.roster_ids)
+        played = ~np.isnan(points)
+
+        # Actual games: one entry per (week, team) with an opponent, binned by pair
+        weeks, columns = np.nonzero(played & (opponent_columns >= 0))
+        opponents = opponent_columns[weeks, columns]
+        game_margin = points[weeks, columns] - points[weeks, opponents]
+        pairs = columns * n_teams + opponents
+
+        def per_pair(weights=None):
+            return np.bincount(pairs, weights=weights, minlength=n_teams * n_teams).reshape(n_teams, n_teams)
+
+        self.games = per_pair()
+        self.wins = per_pair(game_margin > 0).astype(int)
+        self.losses = per_pair(game_margin < 0).astype(int)
+        self.ties = self.games - self.wins - self.losses
+        self.margin = np.divide(
+            per_pair(game_margin), self.games,
+            out=np.full((n_teams, n_teams), np.nan), where=self.games > 0
+        )
+
+        # All-play: diff[w, i, j] compares team i with team j; NaN comparisons are all False
+        diff = points[:, :, None] - points[:, None, :]
+        both = played[:, :, None] & played[:, None, :]
+        self.all_play_wins = (diff > 0).sum(axis=0)
+        self.all_play_losses = (diff < 0).sum(axis=0)
+        self.all_play_ties = (diff == 0).sum(axis=0)
+        np.fill_diagonal(self.all_play_ties, 0)
+
+        weeks_both = both.sum(axis=0)
+        self.points_margin = np.divide(
+            np.where(both, diff, 0.0).sum(axis=0), weeks_both,
+            out=np.full((n_teams, n_teams), np.nan), where=weeks_both > 0
+        )
+        np.fill_diagonal(self.points_margin, np.nan)
+
+    @classmethod
+    def from_scoring_df(cls, scoring_df, roster_ids=None):
+        """Builds the matrices from the long scoring table; see scoring_matrices."""
+        return cls(*scoring_matrices(scoring_df, roster_ids))
+
+    def to_frame(self, short_names):
+        """
+        Tidy table with one row per ordered pair of distinct teams.
+
+        Args:
+            short_names: Short name of every team, in roster_ids order
+
+        Columns: short_name, roster_id, adversary_short_name, adversary_id,
+        games, wins, losses, ties, win_pct, margin, all_play_wins,
+        all_play_losses, all_play_ties, all_play_pct and points_margin.
+        Percentages count ties as half a win and are NaN without games.
+        """
+        n_teams = len(self.roster_ids)
+        rows, columns = np.nonzero(~np.eye(n_teams, dtype=bool))
+        short_names = np.asarray(short_names, dtype=object)
+
+        def pct(wins, ties, games):
+            return np.divide(wins + 0.5 * ties, games, out=np.full(games.shape, np.nan), where=games > 0)
+
+        all_play_games = self.all_play_wins + self.all_play_losses + self.all_play_ties
+        return pd.DataFrame({
+            "short_name": short_names[rows],
+            "roster_id": self.roster_ids[rows],
+            "adversary_short_name": short_names[columns],
+            "adversary_id": self.roster_ids[columns],
+            "games": self.games[rows, columns],
+            "wins": self.wins[rows, columns],
+            "losses": self.losses[rows, columns],
+            "ties": self.ties[rows, columns],
+            "win_pct": pct(self.wins, self.ties, self.games)[rows, columns],
+            "margin": self.margin[rows, columns],
+            "all_play_wins": self.all_play_wins[rows, columns],
+            "all_play_losses": self.all_play_losses[rows, columns],
+            "all_play_ties": self.all_play_ties[rows, columns],
+            "all_play_pct": pct(self.all_play_wins, self.all_play_ties, all_play_games)[rows, columns],
+            "points_margin": self.points_margin[rows, columns],
+        })
@@ -0,0 +1,197 @@
+import json
+import os
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from FantasyLeague import FantasyLeague
+from SleeperClient import SleeperClient
+from ResponseCache import ResponseCache
+
+
+class LeagueArchive:
+    """
+    Multi-season warehouse of finished seasons in partitioned Parquet.
+
+    Sleeper links each season's league to the previous one through
+    previous_league_id. Archiving walks that chain and writes each finished
+    season's scoring and team tables to
+
+        <root>/scoring/season=<season>/league_id=<id>/data.parquet
+        <root>/teams/season=<season>/league_id=<id>/data.parquet
+
+    Seasons already on disk are skipped, so the network is only used for
+    seasons that finished since the last run. Every query reads the
+    Parquet files alone; owners (owner_id) link teams across seasons.
+    """
+
+    DEFAULT_ROOT = './archive'
+
+    def __init__(self, root=None, client=None, base_url=None):
+        self.root = root or self.DEFAULT_ROOT
+        self.client = client
+        self.base_url = base_url
+
+    # ==================== Archiving ====================
+
+    def _client(self):
+        if self.client is None:
+            self.client = SleeperClient(base_url=self.base_url, cache=ResponseCache())
+        return self.client
+
+    def _partition(self, table, season, league_id):
+        return os.path.join(self.root, table, 'season={}'.format(season), 'league_id={}'.format(league_id))
+
+    def is_archived(self, season, league_id):
+        return os.path.exists(os.path.join(self._partition('teams', season, league_id), 'data.parquet'))
+
+    def walk_chain(self, league_id):
+        """
+        Follows previous_league_id from league_id back to the first season.
+
+        While the walk moves on to older seasons, the users, rosters and
+        matchups of every season found so far are already downloading on
+        the client's pool (and land in its cache).
+
+        Returns:
+            List of league objects, newest season first.
+        """
+        client = self._client()
+        chain = []
+        prefetches = []
+        while league_id and str(league_id) != '0':
+            league_data = client.get(SleeperClient.league_path(league_id), SleeperClient.LEAGUE_TTL)
+            if not league_data:
+                break
+            chain.append(league_data)
+
+            if league_data.get('status') == 'complete' and not self.is_archived(league_data.get('season'), league_id):
+                prefetches.append(client.submit(SleeperClient.users_path(league_id), SleeperClient.USERS_TTL))
+                prefetches.append(client.submit(SleeperClient.rosters_path(league_id), SleeperClient.ROSTERS_TTL))
+                prefetches += [
+                    client.submit(SleeperClient.matchups_path(league_id, week), None)
+                    for week in range(1, self._final_week(league_data) + 1)
+                ]
+            league_id = league_data.get('previous_league_id')
+
+        for future in prefetches:
+            future.result()
+        return chain
+
+    @staticmethod
+    def _final_week(league_data):
+        settings = league_data.get('settings') or {}
+        return (settings.get('playoff_week_start') or 15) - 1
+
+    def archive(self, league_id, divisions=None):
+        """
+        Writes every finished season in the chain of league_id that is not on disk yet.
+
+        Args:
+            league_id: Any season's league id (usually the current one)
+            divisions: Division config to apply, matched by team short name
+
+        Returns:
+            List of (season, league_id) pairs that were written.
+        """
+        written = []
+        for league_data in self.walk_chain(league_id):
+            season = league_data.get('season')
+            season_league_id = league_data.get('league_id')
+            if league_data.get('status') != 'complete' or self.is_archived(season, season_league_id):
+                continue
+
+            league = FantasyLeague(
+                config={'league_id': season_league_id, 'divisions': divisions},
+                client=self._client(),
+                final_week=self._final_week(league_data),
+            )
+            teams_df = league.getTeamsDf()
+            scoring_df = league.getScoringDf()
+
+            # Owners are the stable identity across seasons
+            owner_by_roster = dict(zip(teams_df['roster_id'], teams_df['owner_id']))
+            scoring_df['owner_id'] = scoring_df['roster_id'].map(owner_by_roster)
+            scoring_df['adversary_owner_id'] = scoring_df['adversary_id'].map(owner_by_roster)
+
+            self._write('teams', teams_df, season, season_league_id)
+            self._write('scoring', scoring_df, season, season_league_id)
+            written.append((season, season_league_id))
+        return written
+
+    def _write(self, table, df, season, league_id):
+        path = self._partition(table, season, league_id)
+        os.makedirs(path, exist_ok=True)
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), os.path.join(path, 'data.parquet'))
+
+    # ==================== Queries ====================
+
+    def _read(self, table, columns=None):
+        path = os.path.join(self.root, table)
+        if not os.path.isdir(path):
+            return pd.DataFrame(columns=columns)
+        dataset = ds.dataset(path, format='parquet', partitioning='hive')
+        return dataset.to_table(columns=columns).to_pandas()
+
+    def seasons(self):
+        """Archived (season, league_id) pairs."""
+        df = self._read('teams', ['season', 'league_id'])
+        return df.drop_duplicates().sort_values('season').reset_index(drop=True)
+
+    def scoring(self, columns=None):
+        return self._read('scoring', columns)
+
+    def teams(self, columns=None):
+        return self._read('teams', columns)
+
+    def all_time_averages(self):
+        """Per-owner totals over every archived season, with the owner's latest team name."""
+        scoring = self.scoring(['season', 'owner_id', 'points', 'win'])
+        teams = self.teams(['season', 'owner_id', 'short_name'])
+        if scoring.empty:
+            return pd.DataFrame(columns=['owner_id', 'short_name', 'seasons', 'games', 'wins', 'losses', 'win_pct', 'avg', 'std'])
+
+        summary = scoring.groupby('owner_id').agg(
+            seasons=('season', 'nunique'),
+            games=('points', 'size'),
+            wins=('win', 'sum'),
+            avg=('points', 'mean'),
+            std=('points', 'std'),
+        ).reset_index()
+        summary['losses'] = summary['games'] - summary['wins']
+        summary['win_pct'] = summary['wins'] / summary['games']
+
+        latest_names = teams.sort_values('season').groupby('owner_id')['short_name'].last()
+        summary.insert(1, 'short_name', summary['owner_id'].map(latest_names))
+        return summary.sort_values('win_pct', ascending=False).reset_index(drop=True)
+
+    def all_time_h2h(self):
+        """Head-to-head record and average margin for every pair of owners that met."""
+        scoring = self.scoring(['owner_id', 'adversary_owner_id', 'points', 'adversary_points', 'win'])
+        scoring = scoring.dropna(subset=['adversary_owner_id'])
+        scoring['margin'] = scoring['points'] - scoring['adversary_points']
+
+        h2h = scoring.groupby(['owner_id', 'adversary_owner_id']).agg(
+            games=('win', 'size'),
+            wins=('win', 'sum'),
+            avg_margin=('margin', 'mean'),
+        ).reset_index()
+        h2h['losses'] = h2h['games'] - h2h['wins']
+
+        names = self.all_time_averages().set_index('owner_id')['short_name']
+        h2h.insert(1, 'short_name', h2h['owner_id'].map(names))
+        h2h.insert(3, 'adversary_short_name', h2h['adversary_owner_id'].map(names))
+        return h2h
+
+
+if __name__ == '__main__':
+    # Archive every finished season of the configured league
+    config_file = sys.argv[1] if len(sys.argv) > 1 else './league_config.json'
+    with open(config_file, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    archive = LeagueArchive(config.get('archive_path'), base_url=config.get('base_url'))
+    for season, league_id in archive.archive(config['league_id'], config.get('divisions')):
+        print('Archived season {} (league {})'.format(season, league_id))
@@ -0,0 +1,114 @@
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from FantasyLeague import FantasyLeague
+from SleeperClient import SleeperClient
+from ResponseCache import ResponseCache
+
+
+def _analyze_league(config, cache_path, base_url):
+    """Builds one league in a worker process; every response comes from the warmed shared cache."""
+    client = SleeperClient(base_url=base_url, cache=ResponseCache(cache_path))
+    try:
+        league = FantasyLeague(config=config, client=client)
+        teams_df = league.getTeamsDf()
+        scoring_df = league.getScoringDf()
+    finally:
+        client.close()
+
+    for df in (teams_df, scoring_df):
+        df.insert(0, "league_name", league.name)
+        df.insert(0, "league_id", str(league.league_id))
+    return teams_df, scoring_df
+
+
+class LeagueBatch:
+    """
+    Analyzes several leagues at once.
+
+    Fetching and computing are split: a single thread pool over one
+    keep-alive session first downloads every league's endpoints into the
+    shared on-disk response cache, then a process pool builds each league
+    from that cache in parallel. The combined tables are tagged by league.
+    """
+
+    def __init__(self, configs, max_workers=None, io_workers=16, cache_path=None, base_url=None):
+        """
+        Args:
+            configs: List of league configs, each shaped like league_config.json
+            max_workers: Worker processes (defaults to the CPU count)
+            io_workers: Concurrent HTTP requests for the shared I/O pool
+            cache_path: Shared response cache file (ResponseCache.DEFAULT_PATH by default)
+            base_url: Sleeper API base URL override
+        """
+        self.configs = configs
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.io_workers = io_workers
+        self.cache_path = cache_path or ResponseCache.DEFAULT_PATH
+        self.base_url = base_url
+
+    @classmethod
+    def from_json(cls, path, **kwargs):
+        """Loads a file with a "leagues" list of league configs."""
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        return cls(config.get('leagues', [config]), **kwargs)
+
+    def prefetch(self):
+        """Downloads every endpoint the leagues need into the shared cache, all leagues concurrently."""
+        client = SleeperClient(base_url=self.base_url, max_workers=self.io_workers, cache=ResponseCache(self.cache_path))
+        try:
+            league_ids = [config['league_id'] for config in self.configs]
+            nfl_state = client.get(SleeperClient.nfl_state_path(), SleeperClient.NFL_STATE_TTL)
+
+            futures = []
+            league_futures = {}
+            for league_id in league_ids:
+                league_futures[league_id] = client.submit(SleeperClient.league_path(league_id), SleeperClient.LEAGUE_TTL)
+                futures.append(client.submit(SleeperClient.users_path(league_id), SleeperClient.USERS_TTL))
+                futures.append(client.submit(SleeperClient.rosters_path(league_id), SleeperClient.ROSTERS_TTL))
+                futures += [
+                    client.submit(SleeperClient.matchups_path(league_id, week), None)
+                    for week in range(1, nfl_state['week'])
+                ]
+
+            # The remaining schedule depends on each league's playoff start
+            for league_id, league_future in league_futures.items():
+                settings = (league_future.result() or {}).get('settings', {})
+                playoff_week_start = settings.get('playoff_week_start') or 15
+                futures += [
+                    client.submit(SleeperClient.matchups_path(league_id, week), SleeperClient.SCHEDULE_TTL)
+                    for week in range(nfl_state['week'], playoff_week_start)
+                ]
+
+            for future in futures:
+                future.result()
+            return client.stats()
+        finally:
+            client.close()
+
+    def run(self):
+        """
+        Fetches and analyzes every league.
+
+        Returns:
+            (teams_df, scoring_df) combining all leagues, with league_id and
+            league_name columns in front.
+        """
+        self.prefetch()
+
+        n_leagues = len(self.configs)
+        # Spawned, not forked: prefetch() leaves the HTTP client's threads behind
+        pool_size = min(self.max_workers, max(n_leagues, 1))
+        with ProcessPoolExecutor(max_workers=pool_size, mp_context=multiprocessing.get_context('spawn')) as executor:
+            results = list(executor.map(
+                _analyze_league, self.configs, [self.cache_path] * n_leagues, [self.base_url] * n_leagues
+            ))
+
+        teams_df = pd.concat([teams for teams, _ in results], ignore_index=True)
+        scoring_df = pd.concat([scoring for _, scoring in results], ignore_index=True)
+        return teams_df, scoring_df
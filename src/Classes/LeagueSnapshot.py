@@ -0,0 +1,122 @@
+import threading
+import time
+
+
+class LeagueSnapshot:
+    """
+    The league and its tables at one point in time.
+
+    A snapshot is never modified after it is built: the refresher builds a
+    new league for every refresh, so every session can share the same
+    snapshot without copying it.
+
+    Playoff odds are simulated while the snapshot is built, so no page load
+    ever runs the simulation. They only change with the standings, so a
+    rebuild whose data_version matches the previous snapshot reuses its odds.
+    """
+
+    PLAYOFF_SIMS = 100000
+
+    def __init__(self, league, teams_df, scoring_df, prob_curves_df, lineup_df, head_to_head_df, schedule_swap_df,
+                 schedule_luck_df, bootstrap_df, odds_df, built_at=None):
+        self.league = league
+        self.teams_df = teams_df
+        self.scoring_df = scoring_df
+        self.prob_curves_df = prob_curves_df
+        self.lineup_df = lineup_df
+        self.head_to_head_df = head_to_head_df
+        self.schedule_swap_df = schedule_swap_df
+        self.schedule_luck_df = schedule_luck_df
+        self.bootstrap_df = bootstrap_df
+        self.odds_df = odds_df
+        self.built_at = built_at or time.time()
+
+    @classmethod
+    def from_league(cls, league, previous=None, n_sims=PLAYOFF_SIMS):
+        """
+        Args:
+            league: Freshly loaded FantasyLeague
+            previous: Snapshot this one replaces, whose playoff odds are
+                      reused if the standings did not change
+            n_sims: Seasons simulated for the playoff odds
+        """
+        if previous is not None and previous.data_version == cls.league_data_version(league):
+            odds_df = previous.odds_df
+        else:
+            odds_df = league.getPlayoffOddsDf(n_sims=n_sims)
+        return cls(
+            league, league.getTeamsDf(), league.getScoringDf(), league.getProbCurvesDf(),
+            league.getLineupDf(), league.getHeadToHeadDf(), league.getScheduleSwapDf(),
+            league.getScheduleLuckDf(), league.getBootstrapDf(), odds_df
+        )
+
+    @staticmethod
+    def league_data_version(league):
+        """Changes only when the NFL week advances or weeks are ingested."""
+        return league.current_week, league.store.version
+
+    @property
+    def data_version(self):
+        """Identifies the standings behind the snapshot, which several rebuilds can share."""
+        return self.league_data_version(self.league)
+
+    @property
+    def version(self):
+        """Identifies the snapshot, e.g. as a cache key for data derived from it."""
+        return self.built_at
+
+    def age(self):
+        """Seconds since the snapshot was built."""
+        return time.time() - self.built_at
+
+
+class SnapshotRefresher:
+    """
+    Rebuilds the league snapshot in a background thread on a fixed interval.
+
+    The first snapshot is built when the refresher is created; afterwards
+    readers always get the latest finished snapshot immediately, and a new
+    one replaces it atomically once it is complete. A failed rebuild keeps
+    the previous snapshot and records the error.
+    """
+
+    def __init__(self, build_league, interval=600, n_sims=LeagueSnapshot.PLAYOFF_SIMS):
+        """
+        Args:
+            build_league: Callable returning a freshly loaded FantasyLeague
+            interval: Seconds between rebuilds
+            n_sims: Seasons simulated for the playoff odds
+        """
+        self.build_league = build_league
+        self.interval = interval
+        self.n_sims = n_sims
+        self.last_error = None
+
+        self._lock = threading.Lock()
+        self._snapshot = LeagueSnapshot.from_league(build_league(), n_sims=n_sims)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='league-refresher', daemon=True)
+        self._thread.start()
+
+    @property
+    def snapshot(self):
+        with self._lock:
+            return self._snapshot
+
+    def refresh_now(self):
+        """Builds a new snapshot in the calling thread and swaps it in."""
+        snapshot = LeagueSnapshot.from_league(self.build_league(), self.snapshot, self.n_sims)
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh_now()
+                self.last_error = None
+            except Exception as error:
+                self.last_error = error
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+
+
+class LineupOptimizer:
+    """
+    Best possible lineup for every team and week under the league's slot rules.
+
+    All team-weeks are stacked into one (lineups x slots x players) score
+    tensor, built with a single broadcast over the players' position masks.
+    Each lineup is then solved as a maximum-weight assignment of players to
+    slots, so players eligible for several positions (e.g. RB/WR) are placed
+    where they help most and the result is optimal for any slot rules.
+    A slot may stay empty, which scores 0.
+    """
+
+    # Positions each starting slot accepts; slots not listed (BN, IR, TAXI) do not score
+    SLOT_POSITIONS = {
+        'QB': {'QB'},
+        'RB': {'RB'},
+        'WR': {'WR'},
+        'TE': {'TE'},
+        'K': {'K'},
+        'DEF': {'DEF'},
+        'DL': {'DL'},
+        'LB': {'LB'},
+        'DB': {'DB'},
+        'FLEX': {'RB', 'WR', 'TE'},
+        'WRRB_FLEX': {'RB', 'WR'},
+        'REC_FLEX': {'WR', 'TE'},
+        'SUPER_FLEX': {'QB', 'RB', 'WR', 'TE'},
+        'IDP_FLEX': {'DL', 'LB', 'DB'},
+    }
+
+    def __init__(self, roster_positions, player_positions):
+        """
+        Args:
+            roster_positions: League slot list from the league settings, e.g. ['QB', 'RB', 'FLEX', 'BN']
+            player_positions: Mapping or callable from player id to its fantasy positions
+        """
+        slots = [slot for slot in roster_positions if slot in self.SLOT_POSITIONS]
+        self.slots = sorted(slots, key=lambda slot: len(self.SLOT_POSITIONS[slot]))
+        self.positions = sorted(set().union(*self.SLOT_POSITIONS.values()))
+        self._position_bit = {position: 1 << i for i, position in enumerate(self.positions)}
+        self._slot_mask = {
+            slot: sum(self._position_bit[position] for position in self.SLOT_POSITIONS[slot]) for slot in self.slots
+        }
+        self._lookup = player_positions if callable(player_positions) else player_positions.get
+        self._player_mask = {}
+
+    def _mask(self, player_id):
+        """Bitmask of the positions a player can fill, memoized per player."""
+        mask = self._player_mask.get(player_id)
+        if mask is None:
+            mask = sum(self._position_bit.get(position, 0) for position in self._lookup(player_id) or ())
+            self._player_mask[player_id] = mask
+        return mask
+
+    def optimize(self, lineups):
+        """
+        Args:
+            lineups: List of (players, starters, players_points) per team-week,
+                     as found in the matchup payloads
+
+        Returns:
+            Dict of equally long arrays: optimal (best lineup points),
+            starters (points of the players started) and bench (points of
+            the players not started).
+        """
+        n_lineups = len(lineups)
+        n_players = max((len(players or ()) for players, _, _ in lineups), default=0)
+
+        points = np.zeros((n_lineups, n_players))
+        masks = np.zeros((n_lineups, n_players), dtype=np.int64)
+        started = np.zeros((n_lineups, n_players), dtype=bool)
+        for row, (players, starters, players_points) in enumerate(lineups):
+            players = players or []
+            players_points = players_points or {}
+            starters = set(starters or ())
+            points[row, :len(players)] = [players_points.get(player) or 0.0 for player in players]
+            masks[row, :len(players)] = [self._mask(player) for player in players]
+            started[row, :len(players)] = [player in starters for player in players]
+
+        # score[l, s, p]: what player p adds in slot s; ineligible or negative counts as leaving the slot empty
+        slot_masks = np.array([self._slot_mask[slot] for slot in self.slots], dtype=np.int64)
+        eligible = (masks[:, None, :] & slot_masks[None, :, None]) != 0
+        score = np.where(eligible, np.maximum(points, 0.0)[:, None, :], 0.0)
+
+        optimal = np.zeros(n_lineups)
+        if len(self.slots) and n_players:
+            for row in range(n_lineups):
+                slot_index, player_index = linear_sum_assignment(score[row], maximize=True)
+                optimal[row] = score[row, slot_index, player_index].sum()
+
+        return {
+            "optimal": optimal,
+            "starters": np.where(started, points, 0.0).sum(axis=1),
+            "bench": np.where(started, 0.0, points).sum(axis=1),
+        }
+
+    def to_frame(self, week_lineups, short_names):
+        """
+        Optimal lineup table for a season.
+
+        Args:
+            week_lineups: Dict of week -> list of (roster_id, players, starters, players_points)
+            short_names: Dict of roster_id -> short name
+
+        Returns:
+            DataFrame with week, short_name, roster_id, points (starters),
+            optimal_points, bench_points, points_lost and efficiency
+            (points / optimal_points), one row per team per week.
+        """
+        keys = [(week, entry[0]) for week in sorted(week_lineups) for entry in week_lineups[week]]
+        lineups = [entry[1:] for week in sorted(week_lineups) for entry in week_lineups[week]]
+        result = self.optimize(lineups)
+
+        frame = pd.DataFrame({
+            "week": np.array([week for week, _ in keys], dtype=np.int16),
+            "short_name": [short_names.get(roster_id) for _, roster_id in keys],
+            "roster_id": np.array([roster_id for _, roster_id in keys], dtype=np.int32),
+            "points": result["starters"],
+            "optimal_points": result["optimal"],
+            "bench_points": result["bench"],
+        })
+        frame["points_lost"] = (frame["optimal_points"] - frame["points"]).clip(lower=0)
+        frame["efficiency"] = np.divide(
+            frame["points"], frame["optimal_points"],
+            out=np.ones(len(frame)), where=frame["optimal_points"].to_numpy() > 0
+        )
+        return frame
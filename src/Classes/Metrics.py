@@ -1,5 +1,66 @@
+from collections import deque
 from itertools import combinations
 
+import numpy as np
+from scipy.interpolate import make_interp_spline
+
+
+def prob_n_wins_matrix(win_probs):
+    """
+    Poisson-binomial distribution of the number of wins for many teams at once.
+
+    Args:
+        win_probs: 2-D array (teams x weeks) of per-week win probabilities.
+                   Rows may be padded with zeros for weeks a team did not play.
+
+    Returns:
+        2-D array (teams x weeks + 1) where column n holds P(n wins).
+    """
+    win_probs = np.atleast_2d(np.asarray(win_probs, dtype=float))
+    n_teams, n_weeks = win_probs.shape
+
+    dist = np.zeros((n_teams, n_weeks + 1))
+    dist[:, 0] = 1.0
+
+    # Convolve one week at a time: O(weeks^2) for every team in a single pass
+    for week in range(n_weeks):
+        p = win_probs[:, week:week + 1]
+        dist[:, 1:week + 2] = dist[:, 1:week + 2] * (1 - p) + dist[:, :week + 1] * p
+        dist[:, 0] *= 1 - p[:, 0]
+
+    return dist
+
+
+def prob_curves(dist, wins, n_points=200):
+    """
+    Smoothed win-count distributions for many teams with one spline fit.
+
+    Args:
+        dist: 2-D array (teams x weeks + 1) from prob_n_wins_matrix
+        wins: Actual wins per team
+        n_points: Points per smoothed curve
+
+    Returns:
+        (x, curves, at_wins): x holds the n_points win counts from 0 to
+        weeks, curves (teams x n_points) the smoothed probabilities and
+        at_wins each team's curve evaluated at its actual wins.
+    """
+    dist = np.atleast_2d(np.asarray(dist, dtype=float))
+    wins = np.asarray(wins, dtype=float)
+    n_teams, n_outcomes = dist.shape
+    x_original = np.arange(n_outcomes)
+    x = np.linspace(0, n_outcomes - 1, n_points)
+
+    if n_outcomes < 2:
+        return x, np.repeat(dist, n_points, axis=1), dist[:, 0]
+
+    # One quadratic spline per column of dist.T, fitted together
+    spline = make_interp_spline(x_original, dist.T, k=min(2, n_outcomes - 1), axis=0)
+    curves = spline(x).T
+    at_wins = spline(wins)[np.arange(n_teams), np.arange(n_teams)]
+    return x, curves, at_wins
+
+
 class Metric:
     def __init__(self, values:list):
         self.values = values
@@ -13,15 +74,122 @@ class AverageMetric(Metric):
 
 class StdDevMetric(Metric):
     def compute(self):
+        if not self.values:
+            return 0
         mean = sum(self.values) / len(self.values)
         variance = sum((x - mean) ** 2 for x in self.values) / len(self.values)
         return variance ** 0.5
 
+class RunningStats:
+    """
+    Welford accumulator of count, mean and M2 (sum of squared deviations).
+
+    Values can be added and removed in O(1) without the cancellation of a
+    running sum of squares.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def remove(self, value):
+        if self.count <= 1:
+            self.__init__()
+            return
+        self.count -= 1
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        # Removal can leave a tiny negative rounding residue
+        self.m2 = max(0.0, self.m2 - delta * (value - self.mean))
+
+    @property
+    def variance(self):
+        """Population variance, like StdDevMetric."""
+        return self.m2 / self.count if self.count else 0.0
+
+class StreamingMetric(Metric):
+    """
+    Metric folded one value at a time instead of recomputed from the full list.
+
+    push() updates the running state in O(1) and compute() only reads it.
+    With a window, only the last window values count: the oldest one is
+    removed as each new one arrives (e.g. window=4 is the last-4-weeks form).
+    """
+
+    def __init__(self, values=(), window=None):
+        self.window = window
+        self.reset()
+        for value in values:
+            self.push(value)
+
+    def reset(self):
+        self.stats = RunningStats()
+        self.values = deque()
+
+    def push(self, value):
+        self.stats.add(value)
+        if self.window is not None:
+            self.values.append(value)
+            if len(self.values) > self.window:
+                self.stats.remove(self.values.popleft())
+
+class StreamingAverageMetric(StreamingMetric):
+    def compute(self):
+        return self.stats.mean if self.stats.count else 0
+
+class StreamingStdDevMetric(StreamingMetric):
+    def compute(self):
+        return self.stats.variance ** 0.5
+
+class EWMAMetric(Metric):
+    """
+    Exponentially weighted moving average, updated in O(1) per value.
+
+    Matches pandas ewm(span=span, adjust=False): each value gets weight
+    alpha = 2 / (span + 1) and older ones decay by 1 - alpha. The weighted
+    variance is tracked alongside as variance.
+    """
+
+    def __init__(self, values=(), span=4):
+        self.alpha = 2 / (span + 1)
+        self.reset()
+        for value in values:
+            self.push(value)
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+
+    def push(self, value):
+        self.count += 1
+        if self.count == 1:
+            self.mean = value
+            return
+        delta = value - self.mean
+        self.mean += self.alpha * delta
+        self.variance = (1 - self.alpha) * (self.variance + self.alpha * delta ** 2)
+
+    def compute(self):
+        return self.mean if self.count else 0
+
 class ExpectedWinsMetric(Metric):
      def compute(self):
         return sum(self.values)
 
 class ProbNWins(Metric):
+    def compute(self):
+        return prob_n_wins_matrix([self.values])[0].tolist()
+
+class ProbNWinsBruteForce(Metric):
+    """Reference implementation enumerating every win scenario. O(2^n), only for validation."""
     def compute(self):
         week_indices = list(range(len(self.values)))
 
@@ -44,4 +212,4 @@ class ProbNWins(Metric):
             scenario_prob = wins_prob * losses_prob
             prob_n_wins[n_wins] += scenario_prob
 
-        return prob_n_wins
\ No newline at end of file
+        return prob_n_wins
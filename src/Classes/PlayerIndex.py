@@ -0,0 +1,303 @@
+import codecs
+import json
+import os
+import shutil
+import sys
+import time
+import zlib
+
+import numpy as np
+
+from SleeperClient import SleeperClient
+
+
+def iter_object_items(chunks):
+    """
+    Yields the (key, value) pairs of a top-level JSON object read from byte chunks.
+
+    Only the item being decoded is held in memory, so a multi-megabyte
+    object is parsed without ever building it whole.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buffer, pos, done = '', 0, False
+
+    def fill():
+        nonlocal buffer, pos, done
+        chunk = next(chunks, None)
+        done = chunk is None
+        buffer = buffer[pos:] + text.decode(chunk or b'', final=done)
+        pos = 0
+
+    def skip():
+        # Next non-whitespace character, or '' at the end of the input
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+                pos += 1
+            if pos < len(buffer) or done:
+                return buffer[pos:pos + 1]
+            fill()
+
+    def value():
+        nonlocal pos
+        while True:
+            try:
+                result, end = decoder.raw_decode(buffer, pos)
+                # A value ending at the buffer end may continue in the next chunk (e.g. a number)
+                if end < len(buffer) or done:
+                    pos = end
+                    return result
+            except ValueError:
+                if done:
+                    raise
+            fill()
+
+    if skip() != '{':
+        raise ValueError('Expected a JSON object')
+    pos += 1
+    while True:
+        char = skip()
+        if char == '}':
+            return
+        if char == ',':
+            pos += 1
+            continue
+        if not char:
+            raise ValueError('Unterminated JSON object')
+        key = value()
+        if skip() != ':':
+            raise ValueError('Expected ":" after key {!r}'.format(key))
+        pos += 1
+        skip()
+        yield key, value()
+
+
+class PlayerIndex:
+    """
+    Compact on-disk index of Sleeper's NFL player metadata.
+
+    The /players/nfl dump is stream-parsed once into columnar NumPy files:
+    per-player references into a shared string table (id, name, team,
+    position), a fantasy-positions bitmask, and an open-addressing hash
+    table from player id to row. Every file is opened memory-mapped, so
+    lookups are O(1) and all processes reading the index share the same
+    pages instead of each holding the dump as a dict.
+
+    Each build goes to its own version directory and becomes visible by
+    atomically replacing the CURRENT pointer file, so readers never see a
+    half-written index.
+    """
+
+    DEFAULT_PATH = './.cache/players'
+    MAX_AGE = SleeperClient.PLAYERS_TTL
+    COLUMNS = ('slots', 'id', 'name', 'team', 'position', 'fantasy', 'offsets', 'blob')
+    KEEP_VERSIONS = 2
+
+    def __init__(self, path=None):
+        self.path = path or self.DEFAULT_PATH
+        with open(os.path.join(self.path, 'CURRENT'), 'r', encoding='utf-8') as f:
+            version = os.path.join(self.path, f.read().strip())
+        with open(os.path.join(version, 'meta.json'), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+
+        # Memoryviews over the mapped arrays index to plain Python values, with no per-access array overhead
+        columns = {name: memoryview(self._load(os.path.join(version, name + '.npy'))) for name in self.COLUMNS}
+        self._slots = columns['slots']
+        self._id = columns['id']
+        self._name = columns['name']
+        self._team = columns['team']
+        self._position = columns['position']
+        self._fantasy = columns['fantasy']
+        self._offsets = columns['offsets']
+        self._blob = columns['blob']
+        self._mask = len(self._slots) - 1
+        self._positions = self.meta['positions']
+
+    @staticmethod
+    def _load(path):
+        try:
+            return np.asarray(np.load(path, mmap_mode='r'))
+        except ValueError:
+            # Empty arrays cannot be mapped
+            return np.load(path)
+
+    # ==================== Building ====================
+
+    @classmethod
+    def build(cls, path, chunks):
+        """
+        Stream-parses a players dump and publishes it as the current index.
+
+        Args:
+            path: Index directory
+            chunks: Iterable of bytes holding the /players/nfl JSON object
+
+        Returns:
+            The new PlayerIndex.
+        """
+        strings = {}
+        blob = bytearray()
+        offsets = [0]
+
+        def intern(value):
+            if not value:
+                return -1
+            ref = strings.get(value)
+            if ref is None:
+                ref = strings[value] = len(offsets) - 1
+                blob.extend(value.encode('utf-8'))
+                offsets.append(len(blob))
+            return ref
+
+        positions = []
+        position_bits = {}
+        ids, names, teams, primary, fantasy = [], [], [], [], []
+        for player_id, player in iter_object_items(chunks):
+            player = player or {}
+            mask = 0
+            for position in player.get('fantasy_positions') or [player.get('position')]:
+                if not position:
+                    continue
+                if position not in position_bits:
+                    position_bits[position] = len(positions)
+                    positions.append(position)
+                mask |= 1 << position_bits[position]
+            name = player.get('full_name') or ' '.join(
+                part for part in (player.get('first_name'), player.get('last_name')) if part
+            )
+            ids.append(intern(player_id))
+            names.append(intern(name))
+            teams.append(intern(player.get('team')))
+            primary.append(intern(player.get('position')))
+            fantasy.append(mask)
+        if len(positions) > 64:
+            raise ValueError('Too many distinct positions for a 64-bit mask')
+
+        # Open addressing with linear probing, at most half full
+        n_slots = 1 << max(1, (2 * len(ids) - 1).bit_length())
+        slots = np.full(n_slots, -1, dtype=np.int32)
+        for row, ref in enumerate(ids):
+            slot = zlib.crc32(blob[offsets[ref]:offsets[ref + 1]]) & (n_slots - 1)
+            while slots[slot] >= 0:
+                slot = (slot + 1) & (n_slots - 1)
+            slots[slot] = row
+
+        version = 'v{}-{}'.format(time.strftime('%Y%m%d%H%M%S'), os.getpid())
+        version_path = os.path.join(path, version)
+        os.makedirs(version_path, exist_ok=True)
+        columns = {
+            'slots': slots,
+            'id': np.asarray(ids, dtype=np.int32),
+            'name': np.asarray(names, dtype=np.int32),
+            'team': np.asarray(teams, dtype=np.int32),
+            'position': np.asarray(primary, dtype=np.int32),
+            'fantasy': np.asarray(fantasy, dtype=np.uint64),
+            'offsets': np.asarray(offsets, dtype=np.int64),
+            'blob': np.frombuffer(bytes(blob), dtype=np.uint8),
+        }
+        for name, array in columns.items():
+            np.save(os.path.join(version_path, name + '.npy'), array)
+        with open(os.path.join(version_path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'built_at': time.time(), 'count': len(ids), 'positions': positions}, f)
+
+        pointer = os.path.join(path, 'CURRENT.{}.tmp'.format(os.getpid()))
+        with open(pointer, 'w', encoding='utf-8') as f:
+            f.write(version)
+        os.replace(pointer, os.path.join(path, 'CURRENT'))
+        cls._prune(path, version)
+        return cls(path)
+
+    @classmethod
+    def _prune(cls, path, current):
+        # Old versions stay readable by processes that already mapped them
+        versions = sorted(name for name in os.listdir(path) if name.startswith('v') and name != current)
+        for name in versions[:max(0, len(versions) - cls.KEEP_VERSIONS + 1)]:
+            shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+
+    @classmethod
+    def open(cls, path=None, client=None, max_age=None):
+        """
+        Opens the index, rebuilding it from the API when it is missing or
+        older than max_age seconds (a day by default). A stale index is
+        still used if the rebuild fails.
+        """
+        path = path or cls.DEFAULT_PATH
+        max_age = cls.MAX_AGE if max_age is None else max_age
+        try:
+            index = cls(path)
+        except FileNotFoundError:
+            index = None
+        if index is not None and index.age() < max_age:
+            return index
+
+        client = client or SleeperClient()
+        try:
+            return cls.build(path, client.stream(SleeperClient.players_path()))
+        except Exception:
+            if index is None:
+                raise
+            return index
+
+    # ==================== Lookups ====================
+
+    def age(self):
+        return time.time() - self.meta['built_at']
+
+    def __len__(self):
+        return self.meta['count']
+
+    def _string(self, ref):
+        if ref < 0:
+            return None
+        return bytes(self._blob[self._offsets[ref]:self._offsets[ref + 1]]).decode('utf-8')
+
+    def _row(self, player_id):
+        key = str(player_id).encode('utf-8')
+        slot = zlib.crc32(key) & self._mask
+        while True:
+            row = self._slots[slot]
+            if row < 0:
+                return None
+            ref = self._id[row]
+            if self._blob[self._offsets[ref]:self._offsets[ref + 1]] == key:
+                return row
+            slot = (slot + 1) & self._mask
+
+    def __contains__(self, player_id):
+        return self._row(player_id) is not None
+
+    def positions(self, player_id):
+        """Fantasy positions a player is eligible for (empty if unknown)."""
+        row = self._row(player_id)
+        if row is None:
+            return []
+        mask = self._fantasy[row]
+        return [position for bit, position in enumerate(self._positions) if mask >> bit & 1]
+
+    def name(self, player_id):
+        row = self._row(player_id)
+        return None if row is None else self._string(self._name[row])
+
+    def get(self, player_id):
+        """All indexed fields of a player, or None if unknown."""
+        row = self._row(player_id)
+        if row is None:
+            return None
+        return {
+            "player_id": str(player_id),
+            "name": self._string(self._name[row]),
+            "team": self._string(self._team[row]),
+            "position": self._string(self._position[row]),
+            "fantasy_positions": self.positions(player_id),
+        }
+
+
+if __name__ == '__main__':
+    # Refresh the player index if it is more than a day old
+    config_file = sys.argv[1] if len(sys.argv) > 1 else './league_config.json'
+    with open(config_file, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    index = PlayerIndex.open(config.get('players_path'), SleeperClient(base_url=config.get('base_url')))
+    print('{} players indexed {:.0f} min ago'.format(len(index), index.age() / 60))
@@ -0,0 +1,284 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def _simulate_batch(simulator, n_sims, seed_sequence):
+    """Runs one batch of seasons; module-level so it can run in a worker process."""
+    return simulator.simulate_batch(n_sims, np.random.default_rng(seed_sequence))
+
+
+class PlayoffSimulator:
+    """
+    Monte Carlo simulation of the remaining regular season.
+
+    Each team's weekly score is drawn from a normal distribution fitted to
+    its season (average and standard deviation). Every batch of seasons is
+    drawn as one (sims x weeks x teams) array; wins, head-to-head and
+    division records and expected wins are then updated with array
+    operations. Every season is then seeded with SeedCalculator's tiebreak
+    rules, applied to all seasons together by seed().
+
+    Results are reproducible for a given seed: batches get their own child
+    seeds, so the outcome does not depend on the number of workers.
+    """
+
+    def __init__(self, index, schedule, means, stds, batch_size=5000):
+        """
+        Args:
+            index: TiebreakIndex with the current standings
+            schedule: List of (week, roster_id, roster_id) games left to play
+            means: Average points per team, in index.roster_ids order
+            stds: Points standard deviation per team, in index.roster_ids order
+            batch_size: Seasons simulated per batch (and per worker task)
+        """
+        self.index = index
+        self.batch_size = batch_size
+
+        n_teams = len(index.roster_ids)
+        position = {roster_id: i for i, roster_id in enumerate(index.roster_ids)}
+        weeks = sorted({week for week, _, _ in schedule})
+        week_position = {week: i for i, week in enumerate(weeks)}
+
+        self.n_weeks = len(weeks)
+        self.game_week = np.array([week_position[week] for week, _, _ in schedule], dtype=np.int32)
+        self.game_home = np.array([position[home] for _, home, _ in schedule], dtype=np.int32)
+        self.game_away = np.array([position[away] for _, _, away in schedule], dtype=np.int32)
+        divisions = index.divisions
+        division_names = sorted({division for division in divisions if division})
+        # Teams outside a division get a negative id of their own, so they never tie
+        self.division_ids = np.array(
+            [division_names.index(division) if division else -1 - i for i, division in enumerate(divisions)],
+            dtype=np.int32
+        )
+        self.game_division = np.array(
+            [divisions[h] is not None and divisions[h] == divisions[a] for h, a in zip(self.game_home, self.game_away)],
+            dtype=bool
+        )
+
+        self.means = np.asarray(means, dtype=float)
+        stds = np.nan_to_num(np.asarray(stds, dtype=float))
+        # Teams without a spread yet borrow the league-wide one
+        self.stds = np.where(stds > 0, stds, stds[stds > 0].mean() if (stds > 0).any() else 1.0)
+
+        # Head-to-head games are the same in every simulated season
+        self.h2h_games = index.h2h_games.copy()
+        np.add.at(self.h2h_games, (self.game_home, self.game_away), 1)
+        np.add.at(self.h2h_games, (self.game_away, self.game_home), 1)
+        self.division_games = index.division_games.copy()
+        np.add.at(self.division_games, self.game_home[self.game_division], 1)
+        np.add.at(self.division_games, self.game_away[self.game_division], 1)
+
+        self.max_division_size = max(
+            (divisions.count(division) for division in set(divisions) if division), default=0
+        )
+        self.n_teams = n_teams
+
+    def simulate_standings(self, n_sims, rng):
+        """
+        Final standings of n_sims simulated seasons.
+
+        Returns:
+            (wins, h2h_wins, division_wins, expw): arrays of shape (sims x teams),
+            (sims x teams x teams) for h2h_wins, in index.roster_ids order.
+        """
+        return self.standings(rng.normal(self.means, self.stds, size=(n_sims, self.n_weeks, self.n_teams)))
+
+    def standings(self, points):
+        """
+        Final standings for given points in the remaining weeks.
+
+        Args:
+            points: (sims x weeks x teams) points of every remaining week
+
+        Returns:
+            Same as simulate_standings.
+        """
+        n_sims, _, n_teams = points.shape
+
+        # Game results for every simulated season at once
+        home_points = points[:, self.game_week, self.game_home]
+        away_points = points[:, self.game_week, self.game_away]
+        home_wins = home_points > away_points
+        winners = np.where(home_wins, self.game_home, self.game_away)
+        losers = np.where(home_wins, self.game_away, self.game_home)
+
+        sims = np.arange(n_sims)[:, None]
+        wins = self.index.wins + np.bincount(
+            (sims * n_teams + winners).ravel(), minlength=n_sims * n_teams
+        ).reshape(n_sims, n_teams)
+        h2h_wins = self.index.h2h_wins + np.bincount(
+            ((sims * n_teams + winners) * n_teams + losers).ravel(), minlength=n_sims * n_teams * n_teams
+        ).reshape(n_sims, n_teams, n_teams)
+        division_winners = winners[:, self.game_division]
+        division_wins = self.index.division_wins + np.bincount(
+            (sims * n_teams + division_winners).ravel(), minlength=n_sims * n_teams
+        ).reshape(n_sims, n_teams)
+
+        # All-play expected wins: share of the league outscored each week
+        beaten = points.argsort(axis=2).argsort(axis=2)
+        expw = self.index.expw + beaten.sum(axis=1) / max(n_teams - 1, 1)
+
+        return wins, h2h_wins, division_wins, expw
+
+    def seed(self, wins, h2h_wins, division_wins, expw):
+        """
+        Division and league seeds of every simulated season at once.
+
+        Gives the same seeds as SeedCalculator.rank on each season's
+        TiebreakIndex (with the simulator's h2h and division game counts),
+        with the same tiebreak order.
+
+        Returns:
+            (division_seeds, league_seeds) arrays of shape (sims x teams).
+            Teams without a division keep a division seed of 0.
+        """
+        n_sims, n_teams = wins.shape
+        positions = np.broadcast_to(np.arange(n_teams), wins.shape)
+        division_record = np.divide(
+            division_wins, self.division_games,
+            out=np.zeros(wins.shape), where=self.division_games > 0
+        )
+
+        def h2h(sims, order, group):
+            # Record of each team against the rest of its tied group
+            team_group = np.empty_like(group)
+            np.put_along_axis(team_group, order, group, axis=1)
+            same_group = team_group[:, :, None] == team_group[:, None, :]
+            games = np.take_along_axis(np.where(same_group, self.h2h_games, 0).sum(axis=2), order, axis=1)
+            won = np.take_along_axis(np.where(same_group, h2h_wins[sims], 0).sum(axis=2), order, axis=1)
+            return games > 0, np.divide(won, games, out=np.zeros(games.shape), where=games > 0)
+
+        def by_team(values):
+            return lambda sims, order, group: (True, np.take_along_axis(values[sims], order, axis=1))
+
+        # Division seeds: grouped by division and wins, roster order within a group
+        division_ids = np.broadcast_to(self.division_ids, wins.shape)
+        order = np.lexsort((positions, -wins, division_ids))
+        self._resolve(order, [division_ids, wins], [h2h, by_team(division_record), by_team(expw)])
+        sorted_ids = np.sort(self.division_ids, kind='stable')
+        seed_at = np.arange(n_teams) - np.searchsorted(sorted_ids, sorted_ids) + 1
+        division_seeds = np.zeros((n_sims, n_teams), dtype=np.int32)
+        np.put_along_axis(division_seeds, order, np.where(sorted_ids >= 0, seed_at, 0)[None, :], axis=1)
+
+        # League seeds: grouped by wins; lower division seed is better
+        order = np.lexsort((positions, -wins))
+        self._resolve(order, [wins], [by_team(-division_seeds), h2h, by_team(expw)])
+        league_seeds = np.empty((n_sims, n_teams), dtype=np.int32)
+        np.put_along_axis(league_seeds, order, np.arange(1, n_teams + 1, dtype=np.int32)[None, :], axis=1)
+
+        return division_seeds, league_seeds
+
+    @staticmethod
+    def _resolve(order, keys, steps):
+        """
+        SeedCalculator._resolve for every season at once, reordering order in place.
+
+        order holds each season's teams sorted best first, with teams that
+        match on every array in keys adjacent and in roster order; those
+        form the tied groups. Each pass splits every unsettled group by the
+        first step that applies to it and separates its teams, and the
+        subgroups start over from the first step. A group no step separates
+        is settled and keeps its order.
+
+        Each step maps (sims, order, group) to (applies, key): values per
+        sorted position for the seasons in sims, higher keys are better, and
+        the step applies to a group only if it applies to all of its teams.
+        """
+        n_sims, n_teams = order.shape
+        starts = np.ones(order.shape, dtype=bool)
+        for key in keys:
+            sorted_key = np.take_along_axis(key, order, axis=1)
+            starts[:, 1:] &= sorted_key[:, 1:] == sorted_key[:, :-1]
+        starts[:, 1:] = ~starts[:, 1:]
+        settled = np.zeros(order.shape, dtype=bool)
+
+        while True:
+            # Groups are contiguous in the flattened array, as every season starts one
+            bounds = np.flatnonzero(starts)
+            sizes = np.diff(np.append(bounds, starts.size))
+            open_groups = (np.repeat(sizes, sizes).reshape(order.shape) > 1) & ~settled
+            sims = np.flatnonzero(open_groups.any(axis=1))
+            if not len(sims):
+                return
+
+            sim_order, sim_starts, open_groups = order[sims], starts[sims], open_groups[sims]
+            group = np.cumsum(sim_starts, axis=1) - 1
+            bounds = np.flatnonzero(sim_starts)
+            sizes = np.diff(np.append(bounds, sim_starts.size))
+
+            def per_group(ufunc, values):
+                return np.repeat(ufunc.reduceat(values.ravel(), bounds), sizes).reshape(values.shape)
+
+            split_key = np.zeros(sim_order.shape)
+            split = np.zeros(sim_order.shape, dtype=bool)
+            for step in steps:
+                applies, key = step(sims, sim_order, group)
+                applies = per_group(np.minimum, np.broadcast_to(applies, key.shape).astype(np.int8)) > 0
+                separates = applies & ~split & open_groups & (per_group(np.maximum, key) != per_group(np.minimum, key))
+                split_key = np.where(separates, key, split_key)
+                split |= separates
+            settled[sims] |= open_groups & ~split
+
+            # Sort split groups by their key; a stable sort keeps tied teams in roster order
+            within = np.lexsort((-split_key, group))
+            order[sims] = np.take_along_axis(sim_order, within, axis=1)
+            split_key = np.take_along_axis(split_key, within, axis=1)
+            sim_starts[:, 1:] |= split[:, 1:] & (split_key[:, 1:] != split_key[:, :-1])
+            starts[sims] = sim_starts
+
+    def simulate_batch(self, n_sims, rng):
+        """
+        Simulates n_sims seasons.
+
+        Returns:
+            (league_seed_counts, division_seed_counts): count matrices of shape
+            (teams x league seeds) and (teams x division seeds).
+        """
+        n_teams = self.n_teams
+        division_seeds, league_seeds = self.seed(*self.simulate_standings(n_sims, rng))
+
+        teams = np.broadcast_to(np.arange(n_teams), (n_sims, n_teams))
+        league_seed_counts = np.bincount(
+            (teams * n_teams + league_seeds - 1).ravel(), minlength=n_teams * n_teams
+        ).reshape(n_teams, n_teams)
+        division_width = self.max_division_size + 1
+        division_seed_counts = np.bincount(
+            (teams * division_width + division_seeds).ravel(), minlength=n_teams * division_width
+        ).reshape(n_teams, division_width)[:, 1:]
+
+        return league_seed_counts, division_seed_counts
+
+    def run(self, n_sims=100000, seed=0, max_workers=None):
+        """
+        Simulates n_sims seasons, spreading batches over a process pool.
+
+        Args:
+            n_sims: Number of seasons to simulate
+            seed: Seed for the random generator, results repeat for the same seed
+            max_workers: Worker processes (defaults to the CPU count; 1 runs inline)
+
+        Returns:
+            (league_seed_probs, division_seed_probs) probability matrices with one
+            row per team, in index.roster_ids order.
+        """
+        batches = [self.batch_size] * (n_sims // self.batch_size)
+        if n_sims % self.batch_size:
+            batches.append(n_sims % self.batch_size)
+        seed_sequences = np.random.SeedSequence(seed).spawn(len(batches))
+
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers == 1 or len(batches) == 1:
+            results = [_simulate_batch(self, size, seq) for size, seq in zip(batches, seed_sequences)]
+        else:
+            # Spawned, not forked: this runs in the app's refresher thread, and forking a
+            # process with live threads (HTTP pool, cache lock, Streamlit) can deadlock the child
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(batches)), mp_context=context) as executor:
+                results = list(executor.map(_simulate_batch, [self] * len(batches), batches, seed_sequences))
+
+        league_seed_counts = sum(result[0] for result in results)
+        division_seed_counts = sum(result[1] for result in results)
+        return league_seed_counts / n_sims, division_seed_counts / n_sims
@@ -0,0 +1,129 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter() - self.start)
+        return False
+
+
+class Profiler:
+    """
+    Timing spans and per-name counters for the hot paths.
+
+    Code marks a region with `with span('name'):` or the @profiled('name')
+    decorator. While disabled, a span is a shared no-op context manager, so
+    the cost is one attribute check. While enabled, every span adds to its
+    name's counters (calls, total, max) and is kept as a trace event; the
+    newest max_events events are exported in Chrome trace format
+    (chrome://tracing, Perfetto).
+
+    Profiling starts enabled when the LFL_PROFILE environment variable is set.
+    """
+
+    ENV = 'LFL_PROFILE'
+    _NULL_SPAN = nullcontext()
+
+    def __init__(self, enabled=False, max_events=100000):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._events = deque(maxlen=max_events)
+        self._counters = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._events.clear()
+            self._counters = {}
+
+    def span(self, name):
+        if not self.enabled:
+            return self._NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, start, duration):
+        event = (name, start, duration, threading.get_ident())
+        with self._lock:
+            self._events.append(event)
+            counter = self._counters.get(name)
+            if counter is None:
+                self._counters[name] = [1, duration, duration]
+            else:
+                counter[0] += 1
+                counter[1] += duration
+                counter[2] = max(counter[2], duration)
+
+    def summary(self):
+        """
+        Returns:
+            List of {"name", "calls", "total_ms", "mean_ms", "max_ms"} dicts,
+            slowest total first.
+        """
+        with self._lock:
+            counters = {name: list(counter) for name, counter in self._counters.items()}
+        rows = [
+            {"name": name, "calls": calls, "total_ms": total * 1000, "mean_ms": total / calls * 1000, "max_ms": longest * 1000}
+            for name, (calls, total, longest) in counters.items()
+        ]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def trace(self):
+        """Recorded spans as a Chrome trace (complete events, microseconds)."""
+        with self._lock:
+            events = list(self._events)
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {"name": name, "cat": name.split('.', 1)[0], "ph": "X", "pid": pid, "tid": tid,
+                 "ts": (start - self._origin) * 1e6, "dur": duration * 1e6}
+                for name, start, duration, tid in events
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def export_trace(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.trace(), f)
+
+
+profiler = Profiler(enabled=bool(os.environ.get(Profiler.ENV)))
+
+
+def span(name):
+    """Times a block on the shared profiler: `with span('seeding'): ...`."""
+    return profiler.span(name)
+
+
+def profiled(name):
+    """Decorator timing every call of a function on the shared profiler."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            with _Span(profiler, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
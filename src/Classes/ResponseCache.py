@@ -0,0 +1,105 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache:
+    """
+    Persistent SQLite store for API responses.
+
+    Entries are keyed by request URL, so the endpoint and league id are part
+    of the key. An entry stored without a TTL never expires, which is how
+    completed weeks are kept; entries with a TTL are refetched once stale.
+    The same URL can hold either kind (a week is cached as a schedule with a
+    TTL before it is played), so readers that need a final payload ask for
+    permanent entries only.
+    """
+
+    DEFAULT_PATH = './.cache/sleeper_cache.sqlite'
+
+    def __init__(self, path=None):
+        self.path = path or self.DEFAULT_PATH
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            if self.path != ':memory:':
+                # WAL lets several processes read while one writes
+                self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, payload TEXT NOT NULL, '
+                'fetched_at REAL NOT NULL, expires_at REAL)'
+            )
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def get(self, key, permanent=False):
+        """
+        Returns the cached payload for key, or None if it is missing or expired.
+
+        With permanent, an entry stored with a TTL counts as missing too.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT payload, expires_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and (permanent or row[1] < time.time())):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, payload, ttl=None):
+        """
+        Stores a payload.
+
+        Args:
+            key: Cache key (request URL)
+            payload: JSON-serializable response body
+            ttl: Seconds until the entry expires, or None to keep it forever
+        """
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        data = json.dumps(payload)
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, payload, fetched_at, expires_at) VALUES (?, ?, ?, ?)',
+                (key, data, now, expires_at)
+            )
+            self.stores += 1
+
+    def invalidate(self, key):
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM responses')
+
+    def stats(self):
+        """Returns hit/miss counters for this process plus the size of the store."""
+        with self._lock:
+            entries, permanent, size = self._conn.execute(
+                'SELECT COUNT(*), COUNT(*) - COUNT(expires_at), COALESCE(SUM(LENGTH(payload)), 0) FROM responses'
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "entries": entries,
+            "permanent_entries": permanent,
+            "size_bytes": size,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+
+from HeadToHead import scoring_matrices
+
+
+class ScheduleSwapEngine:
+    """
+    Every team's record on every other team's schedule, and on random schedules.
+
+    Team i on team j's schedule keeps its own weekly points and faces j's
+    opponent each week; in the weeks j played i, i faces j instead. All
+    N x N schedules are scored in one broadcast comparison over a
+    (weeks x teams x schedules) opponent array, and the diagonal is the
+    actual record.
+
+    Attributes (teams x schedules, rows and columns in roster_ids order):
+        wins, losses, ties: Record of team i on team j's schedule
+    """
+
+    def __init__(self, roster_ids, points, opponent_columns):
+        """
+        Args:
+            roster_ids: Roster id of each team column
+            points: (weeks x teams) points, NaN when a team did not play
+            opponent_columns: (weeks x teams) column of each game's opponent, -1 when there is none
+        """
+        self.roster_ids = np.asarray(roster_ids)
+        self.points = np.atleast_2d(np.asarray(points, dtype=float))
+        self.opponent_columns = np.atleast_2d(np.asarray(opponent_columns))
+        n_teams = len(self.roster_ids)
+        teams = np.arange(n_teams)
+
+        # opponent[w, i, j]: who team i faces in week w on team j's schedule
+        schedule = self.opponent_columns[:, None, :]
+        opponent = np.where(schedule == teams[None, :, None], teams[None, None, :], schedule)
+        opponent = np.broadcast_to(opponent, (len(self.points), n_teams, n_teams))
+        self.wins, self.losses, self.ties = self._record(self.points[:, :, None], opponent, axis=0)
+
+    def _record(self, own_points, opponent, axis):
+        """(wins, losses, ties) summed over the week axis; games without an opponent or a score are skipped."""
+        shape = [1] * opponent.ndim
+        shape[axis] = -1
+        weeks = np.arange(len(self.points)).reshape(shape)
+        opponent_points = np.where(opponent >= 0, self.points[weeks, np.maximum(opponent, 0)], np.nan)
+        diff = own_points - opponent_points
+        return (diff > 0).sum(axis=axis), (diff < 0).sum(axis=axis), (diff == 0).sum(axis=axis)
+
+    @classmethod
+    def from_scoring_df(cls, scoring_df, roster_ids=None):
+        """Builds the engine from the long scoring table; see HeadToHead.scoring_matrices."""
+        return cls(*scoring_matrices(scoring_df, roster_ids))
+
+    def random_schedules(self, n_schedules=10000, seed=0, batch_size=1000):
+        """
+        Wins of every team over randomly drawn schedules.
+
+        Each week of each schedule pairs the teams by a uniformly random
+        permutation (with an odd team count, one team sits out); teams keep
+        their actual weekly points. Schedules are drawn batch_size at a time
+        to bound memory.
+
+        Returns:
+            (n_schedules x teams) wins, ties counted as half a win.
+        """
+        rng = np.random.default_rng(seed)
+        n_weeks, n_teams = self.points.shape
+        n_pairs = n_teams // 2
+        wins = np.empty((n_schedules, n_teams))
+
+        for start in range(0, n_schedules, batch_size):
+            size = min(batch_size, n_schedules - start)
+            order = np.argsort(rng.random((size, n_weeks, n_teams)), axis=2)
+            home, away = order[..., 0:2 * n_pairs:2], order[..., 1:2 * n_pairs:2]
+            opponent = np.full((size, n_weeks, n_teams), -1, dtype=np.int64)
+            np.put_along_axis(opponent, home, away, axis=2)
+            np.put_along_axis(opponent, away, home, axis=2)
+
+            batch_wins, _, batch_ties = self._record(self.points[None], opponent, axis=1)
+            wins[start:start + size] = batch_wins + 0.5 * batch_ties
+        return wins
+
+    def to_frame(self, short_names):
+        """
+        Tidy swapped-record table, one row per (team, schedule) pair including the team's own.
+
+        Columns: short_name, roster_id, schedule_short_name, schedule_roster_id,
+        wins, losses, ties and own (True on the team's actual schedule).
+        """
+        n_teams = len(self.roster_ids)
+        rows, columns = np.divmod(np.arange(n_teams * n_teams), n_teams)
+        short_names = np.asarray(short_names, dtype=object)
+        return pd.DataFrame({
+            "short_name": short_names[rows],
+            "roster_id": self.roster_ids[rows],
+            "schedule_short_name": short_names[columns],
+            "schedule_roster_id": self.roster_ids[columns],
+            "wins": self.wins.ravel(),
+            "losses": self.losses.ravel(),
+            "ties": self.ties.ravel(),
+            "own": rows == columns,
+        })
+
+    def luck_frame(self, short_names, n_schedules=10000, seed=0):
+        """
+        Schedule luck per team.
+
+        Columns: short_name, roster_id, wins (actual, ties as half), swap_mean,
+        swap_best and swap_worst (over every team's schedule), random_mean,
+        random_std, random_p10 and random_p90 (over n_schedules random
+        schedules), luck (actual wins minus random_mean) and percentile
+        (share of random schedules with fewer wins, ties counted as half).
+        """
+        swap_wins = self.wins + 0.5 * self.ties
+        actual = np.diag(swap_wins)
+        random_wins = self.random_schedules(n_schedules, seed)
+        return pd.DataFrame({
+            "short_name": np.asarray(short_names, dtype=object),
+            "roster_id": self.roster_ids,
+            "wins": actual,
+            "swap_mean": swap_wins.mean(axis=1),
+            "swap_best": swap_wins.max(axis=1),
+            "swap_worst": swap_wins.min(axis=1),
+            "random_mean": random_wins.mean(axis=0),
+            "random_std": random_wins.std(axis=0),
+            "random_p10": np.percentile(random_wins, 10, axis=0),
+            "random_p90": np.percentile(random_wins, 90, axis=0),
+            "luck": actual - random_wins.mean(axis=0),
+            "percentile": (random_wins < actual).mean(axis=0) + 0.5 * (random_wins == actual).mean(axis=0),
+        })
@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+
+from AllPlay import AllPlayEngine
+
+
+class SeasonStore:
+    """
+    Columnar, array-backed storage for one season of weekly results.
+
+    Every per-game column is a (week slot x team) matrix, so a team's season
+    is a strided column view and a week is a row view; nothing is copied to
+    read either. Week slots are kept in ascending week order and capacity
+    grows geometrically, so appending a week is amortized O(teams).
+
+    Columns:
+        week: Week number of each slot
+        roster_id: Roster id of each team column
+        points: Points scored (NaN when the team has no game that week)
+        rank: Weekly points rank
+        opponent: Roster id of the opponent (0 when there is none)
+        division_game: Whether the game was against a division rival
+    """
+
+    def __init__(self, roster_ids, capacity=18):
+        self.roster_ids = np.asarray(roster_ids, dtype=np.int32)
+        self._column = {int(roster_id): i for i, roster_id in enumerate(self.roster_ids)}
+        self.n_weeks = 0
+        # Bumped on every write so readers can tell when derived data is stale
+        self.version = 0
+        # Slot written by each version, so readers can tell which rows changed
+        self._written_slots = []
+        self._all_play = None
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        n_teams = len(self.roster_ids)
+        old = self.n_weeks and (self._week, self._points, self._rank, self._opponent, self._division_game)
+
+        self._week = np.zeros(capacity, dtype=np.int16)
+        self._points = np.full((capacity, n_teams), np.nan)
+        self._rank = np.zeros((capacity, n_teams), dtype=np.int16)
+        self._opponent = np.zeros((capacity, n_teams), dtype=np.int32)
+        self._division_game = np.zeros((capacity, n_teams), dtype=bool)
+
+        if old:
+            new = (self._week, self._points, self._rank, self._opponent, self._division_game)
+            for old_column, new_column in zip(old, new):
+                new_column[:self.n_weeks] = old_column[:self.n_weeks]
+
+    # ==================== Writes ====================
+
+    def append_week(self, week, roster_ids, points, ranks, opponents, division_games):
+        """
+        Stores one week of results. Rows for teams not listed stay empty (NaN points).
+
+        Args:
+            week: Week number
+            roster_ids, points, ranks, opponents, division_games: Parallel sequences,
+                one entry per team that played
+        """
+        if week in self.week:
+            raise ValueError('Week {} is already stored'.format(week))
+        if self.n_weeks == len(self._week):
+            self._allocate(max(2 * len(self._week), 1))
+
+        # Keep slots sorted by week; completed weeks almost always arrive in order
+        slot = int(np.searchsorted(self.week, week))
+        if slot < self.n_weeks:
+            for column in (self._week, self._points, self._rank, self._opponent, self._division_game):
+                column[slot + 1:self.n_weeks + 1] = column[slot:self.n_weeks].copy()
+            self._points[slot] = np.nan
+            self._rank[slot] = 0
+            self._opponent[slot] = 0
+            self._division_game[slot] = False
+
+        columns = [self._column[int(roster_id)] for roster_id in roster_ids]
+        self._week[slot] = week
+        self._points[slot, columns] = points
+        self._rank[slot, columns] = ranks
+        self._opponent[slot, columns] = [opponent or 0 for opponent in opponents]
+        self._division_game[slot, columns] = division_games
+
+        self.n_weeks += 1
+        self._written_slots.append(slot)
+        self.version += 1
+
+    # ==================== Column views ====================
+
+    @property
+    def week(self):
+        return self._week[:self.n_weeks]
+
+    @property
+    def points(self):
+        return self._points[:self.n_weeks]
+
+    @property
+    def rank(self):
+        return self._rank[:self.n_weeks]
+
+    @property
+    def opponent(self):
+        return self._opponent[:self.n_weeks]
+
+    @property
+    def division_game(self):
+        return self._division_game[:self.n_weeks]
+
+    def column(self, roster_id):
+        """Index of a team's column in every matrix."""
+        return self._column[int(roster_id)]
+
+    def slot(self, week):
+        """Index of a week's row, or None if the week is not stored."""
+        slot = int(np.searchsorted(self.week, week))
+        if slot < self.n_weeks and self.week[slot] == week:
+            return slot
+        return None
+
+    def first_changed_slot(self, version):
+        """
+        First slot written since the given version (slots after an inserted
+        week shift, so they changed too), or n_weeks if nothing was.
+        """
+        return min(self._written_slots[max(version, 0):], default=self.n_weeks)
+
+    def opponent_columns(self):
+        """Column index of each game's opponent (-1 when there is none)."""
+        lookup = np.full(max(self._column, default=0) + 1, -1, dtype=np.int32)
+        lookup[list(self._column)] = list(self._column.values())
+        return lookup[self.opponent]
+
+    def adversary_points(self):
+        columns = self.opponent_columns()
+        rows = np.arange(self.n_weeks)[:, None]
+        return np.where(columns >= 0, self.points[rows, columns], np.nan)
+
+    def adversary_rank(self):
+        columns = self.opponent_columns()
+        rows = np.arange(self.n_weeks)[:, None]
+        return np.where(columns >= 0, self.rank[rows, columns], 0)
+
+    def win(self):
+        return self.points > self.adversary_points()
+
+    def played(self):
+        return ~np.isnan(self.points)
+
+    def all_play(self):
+        """All-play results over every stored week, computed once per store version."""
+        if self._all_play is None or self._all_play[0] != self.version:
+            self._all_play = (self.version, AllPlayEngine(self.points))
+        return self._all_play[1]
+
+    # ==================== Tables ====================
+
+    def to_frame(self, short_names, weeks=None):
+        """
+        Long-format scoring table, one row per team per week.
+
+        Args:
+            short_names: Short name of every team column, in roster_ids order
+            weeks: Optional list of weeks to include (all stored weeks by default)
+        """
+        rows = slice(None) if weeks is None else [self.slot(week) for week in weeks if self.slot(week) is not None]
+        n_teams = len(self.roster_ids)
+        points = self.points[rows]
+        n_rows = points.shape[0]
+
+        frame = pd.DataFrame({
+            "week": np.repeat(self.week[rows], n_teams),
+            "short_name": np.tile(np.asarray(short_names, dtype=object), n_rows),
+            "roster_id": np.tile(self.roster_ids, n_rows),
+            "points": points.ravel(),
+            "rank": self.rank[rows].ravel(),
+            "adversary_id": self.opponent[rows].ravel(),
+            "adversary_points": self.adversary_points()[rows].ravel(),
+            "adversary_rank": self.adversary_rank()[rows].ravel(),
+            "division_game": self.division_game[rows].ravel(),
+            "win": self.win()[rows].ravel(),
+        }, copy=False)
+
+        played = ~np.isnan(frame["points"].to_numpy())
+        if not played.all():
+            frame = frame[played].reset_index(drop=True)
+        return frame
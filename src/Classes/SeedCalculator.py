@@ -1,4 +1,101 @@
-from functools import cmp_to_key
+import numpy as np
+
+from Profiler import profiled
+
+
+class TiebreakIndex:
+    """
+    Precomputed tiebreak data for one seeding pass.
+
+    Built once from the teams' results so that ranking never scans the
+    weekly scores again. Every array is aligned with roster_ids.
+
+    Attributes:
+        roster_ids: Roster ids, in the order of every array below
+        divisions: Division name of each team (None when not in a division)
+        wins: Win count per team
+        h2h_wins: N x N matrix, h2h_wins[i, j] = wins of team i against team j
+        h2h_games: N x N matrix, h2h_games[i, j] = games between teams i and j
+        division_wins: Wins in divisional games per team
+        division_games: Divisional games played per team
+        expw: Expected wins per team
+    """
+
+    def __init__(self, roster_ids, divisions, wins, h2h_wins, h2h_games, division_wins, division_games, expw):
+        self.roster_ids = list(roster_ids)
+        self.divisions = list(divisions)
+        self.wins = np.array(wins, dtype=np.int32)
+        self.h2h_wins = np.asarray(h2h_wins)
+        self.h2h_games = np.asarray(h2h_games)
+        self.division_wins = np.asarray(division_wins)
+        self.division_games = np.asarray(division_games)
+        self.expw = np.asarray(expw, dtype=float)
+
+        self.division_record = np.divide(
+            self.division_wins, self.division_games,
+            out=np.zeros(len(self.roster_ids)), where=self.division_games > 0
+        )
+        self._position = None
+
+    @classmethod
+    def from_teams(cls, teams_list):
+        """Builds the index with a single pass over every team's results."""
+        n = len(teams_list)
+        position = {team.roster_id: i for i, team in enumerate(teams_list)}
+
+        h2h_wins = np.zeros((n, n), dtype=np.int32)
+        h2h_games = np.zeros((n, n), dtype=np.int32)
+        division_wins = np.zeros(n, dtype=np.int32)
+        division_games = np.zeros(n, dtype=np.int32)
+
+        for i, team in enumerate(teams_list):
+            for adversary_id, win, division_game in team.getResults():
+                j = position.get(adversary_id)
+                if j is not None:
+                    h2h_games[i, j] += 1
+                    h2h_wins[i, j] += win
+                if division_game:
+                    division_games[i] += 1
+                    division_wins[i] += win
+
+        return cls(
+            roster_ids=[team.roster_id for team in teams_list],
+            divisions=[team.division for team in teams_list],
+            wins=[team.wins for team in teams_list],
+            h2h_wins=h2h_wins,
+            h2h_games=h2h_games,
+            division_wins=division_wins,
+            division_games=division_games,
+            expw=[team.getMetric("expw") or 0 for team in teams_list],
+        )
+
+    def add_result(self, roster_id, adversary_id, win, division_game):
+        """Folds one game result into the index, so ingesting a week costs O(games)."""
+        i = self._positions()[roster_id]
+        j = self._positions().get(adversary_id)
+        self.wins[i] += win
+        if j is not None:
+            self.h2h_games[i, j] += 1
+            self.h2h_wins[i, j] += win
+        if division_game:
+            self.division_games[i] += 1
+            self.division_wins[i] += win
+            self.division_record[i] = self.division_wins[i] / self.division_games[i]
+
+    def _positions(self):
+        if self._position is None:
+            self._position = {roster_id: i for i, roster_id in enumerate(self.roster_ids)}
+        return self._position
+
+    def h2h_record(self, group):
+        """
+        Head-to-head win percentage of each team against the rest of the group,
+        or None if some team has not played anyone else in the group.
+        """
+        games = self.h2h_games[group][:, group].sum(axis=1)
+        if not games.all():
+            return None
+        return self.h2h_wins[group][:, group].sum(axis=1) / games
 
 
 class SeedCalculator:
@@ -10,86 +107,121 @@ class SeedCalculator:
     3. Division record (for division seeding)
     4. Division seed (for league seeding)
     5. Expected wins (tiebreaker)
+
+    Ties between more than two teams are broken as a group: each step
+    splits the tied group into subgroups, and every subgroup that is still
+    tied restarts the tiebreak order from the top.
     """
 
     def __init__(self):
         pass
 
     @staticmethod
-    def _division_comp(t1, t2):
+    def _resolve(index, group, steps):
         """
-        Comparison function for division seeding.
+        Orders a group of team positions (best first) using the tiebreak steps.
 
-        Tiebreaker order:
-        1. Wins
-        2. Head-to-head record
-        3. Division record
-        4. Expected wins
+        Each step maps a group to one key per team (higher is better), or None
+        when it cannot be applied to that group. Teams tied on every step keep
+        their input order.
         """
-        if t1.wins > t2.wins:
-            return 1
-        elif t1.wins < t2.wins:
-            return -1
-       
-        h2h = t1.getH2hRecord(t2.roster_id)
-        print(t1.name, t2.name, h2h)
-        if h2h > 0.5:
-            return 1
-        elif 0 <= h2h < 0.5:
-            return -1
-
-        div_rec1 = t1.getDivisionRecord()
-        div_rec2 = t2.getDivisionRecord()
-        if div_rec1 > div_rec2:
-            return 1
-        elif div_rec1 < div_rec2:
-            return -1
-        
-        expw1 = t1.to_dict().get("expw", None)
-        expw2 = t2.to_dict().get("expw", None)
-        if expw1 > expw2:
-            return 1
-        elif expw1 < expw2:
-            return -1
-        return 0
+        if len(group) < 2:
+            return group
+
+        for step in steps:
+            keys = step(index, group)
+            if keys is None:
+                continue
+            distinct = sorted(set(keys), reverse=True)
+            if len(distinct) == 1:
+                continue
+
+            ordered = []
+            for key in distinct:
+                subgroup = [team for team, team_key in zip(group, keys) if team_key == key]
+                # A smaller tied group starts over, since its head-to-head may differ
+                ordered += SeedCalculator._resolve(index, subgroup, steps)
+            return ordered
+
+        return group
+
+    @staticmethod
+    def _wins(index, group):
+        return index.wins[group].tolist()
 
     @staticmethod
-    def _league_comp(t1, t2):
+    def _h2h(index, group):
+        record = index.h2h_record(group)
+        return None if record is None else record.tolist()
+
+    @staticmethod
+    def _division_record(index, group):
+        return index.division_record[group].tolist()
+
+    @staticmethod
+    def _expw(index, group):
+        return index.expw[group].tolist()
+
+    @staticmethod
+    def _division_seed(division_seeds):
+        # Lower division seed is better
+        return lambda index, group: [-division_seeds[team] for team in group]
+
+    @profiled('seeding.rank')
+    def rank(self, index, division_expw_groups=None):
         """
-        Comparison function for league seeding.
+        Computes division and league seeds from a tiebreak index.
 
-        Tiebreaker order:
+        Tiebreaker order for division seeding:
+        1. Wins
+        2. Head-to-head record
+        3. Division record
+        4. Expected wins
+
+        Tiebreaker order for league seeding:
         1. Wins
         2. Division seed (lower is better)
         3. Head-to-head record
         4. Expected wins
+
+        Args:
+            index: TiebreakIndex for the teams being seeded
+            division_expw_groups: Optional list; every group of division rivals
+                                  left for expected wins to order is appended to it
+
+        Returns:
+            (division_seeds, league_seeds) lists aligned with index.roster_ids.
+            Teams without a division keep a division seed of 0.
         """
-        if t1.wins > t2.wins:
-            return 1
-        elif t1.wins < t2.wins:
-            return -1
-        
-        if t1.division_seed < t2.division_seed:
-            return 1
-        elif t1.division_seed > t2.division_seed:
-            return -1
-        
-        h2h = t1.getH2hRecord(t2.roster_id)
-        if h2h > 0.5:
-            return 1
-        elif 0 <= h2h < 0.5:
-            return -1
-
-        expw1 = t1.to_dict().get("expw", None)
-        expw2 = t2.to_dict().get("expw", None)
-        if expw1 > expw2:
-            return 1
-        elif expw1 < expw2:
-            return -1
-        
-        return 0
-
-    def calculate_and_update_seeding(self, teams):
+        n = len(index.roster_ids)
+
+        # Step 1: Group teams by division and compute division seeding
+        divisions = {}
+        for i, division in enumerate(index.divisions):
+            if division:
+                divisions.setdefault(division, []).append(i)
+
+        expw_step = self._expw
+        if division_expw_groups is not None:
+            def expw_step(index, group):
+                division_expw_groups.append(list(group))
+                return self._expw(index, group)
+
+        division_steps = [self._wins, self._h2h, self._division_record, expw_step]
+        division_seeds = [0] * n
+        for div_teams in divisions.values():
+            for seed, team in enumerate(self._resolve(index, div_teams, division_steps), start=1):
+                division_seeds[team] = seed
+
+        # Step 2: Compute league seeding
+        league_steps = [self._wins, self._division_seed(division_seeds), self._h2h, self._expw]
+        league_seeds = [0] * n
+        for seed, team in enumerate(self._resolve(index, list(range(n)), league_steps), start=1):
+            league_seeds[team] = seed
+
+        return division_seeds, league_seeds
+
+    def calculate_and_update_seeding(self, teams, index=None):
         """
         Compute both division and league seeding for teams.
         Directly modifies the team objects by setting their division_seed
@@ -97,6 +229,8 @@ class SeedCalculator:
 
         Args:
             teams: List or dict of Team objects
+            index: Up-to-date TiebreakIndex for the teams, in the same order.
+                   Built from the teams' results when omitted.
         """
         # Convert to list if dict
         if isinstance(teams, dict):
@@ -104,23 +238,10 @@ class SeedCalculator:
         else:
             teams_list = teams
 
-        # Step 1: Group teams by division and compute division seeding
-        divisions = {}
-        for team in teams_list:
-            if team.division:
-                if team.division not in divisions:
-                    divisions[team.division] = []
-                divisions[team.division].append(team)
-
-        for division_name, div_teams in divisions.items():
-            # Sort using the division comparison function
-            div_teams.sort(key=cmp_to_key(SeedCalculator._division_comp), reverse=True)
-            # Assign division seeds directly to team objects
-            for i, team in enumerate(div_teams):
-                team.division_seed = i + 1
+        if index is None:
+            index = TiebreakIndex.from_teams(teams_list)
+        division_seeds, league_seeds = self.rank(index)
 
-        # Step 2: Compute league seeding
-        teams_list.sort(key=cmp_to_key(SeedCalculator._league_comp), reverse=True)
-        # Assign league seeds directly to team objects
-        for i, team in enumerate(teams_list):
-            team.league_seed = i + 1
+        for team, division_seed, league_seed in zip(teams_list, division_seeds, league_seeds):
+            team.division_seed = division_seed
+            team.league_seed = league_seed
@@ -0,0 +1,137 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests as rq
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from Profiler import span
+
+
+class SleeperClient:
+    """
+    Thin client for the Sleeper API.
+
+    All requests go through one keep-alive session whose connection pool is
+    sized to the worker count, so concurrent fetches reuse connections
+    instead of opening a new one per request.
+
+    The API root can be pointed elsewhere (e.g. at a local stand-in server)
+    with the base_url argument or the SLEEPER_BASE_URL environment variable.
+    """
+
+    BASE_URL = 'https://api.sleeper.app/v1'
+    BASE_URL_ENV = 'SLEEPER_BASE_URL'
+
+    # Cache lifetimes in seconds; completed weeks are cached with no expiry (ttl=None)
+    NFL_STATE_TTL = 5 * 60
+    LEAGUE_TTL = 60 * 60
+    USERS_TTL = 60 * 60
+    ROSTERS_TTL = 60 * 60
+    SCHEDULE_TTL = 60 * 60
+    PLAYERS_TTL = 24 * 60 * 60
+
+    def __init__(self, base_url=None, max_workers=8, timeout=10, retries=3, cache=None):
+        self.base_url = (base_url or os.environ.get(self.BASE_URL_ENV) or self.BASE_URL).rstrip('/')
+        self.timeout = timeout
+        self.cache = cache
+        self.network_requests = 0
+        self._stats_lock = threading.Lock()
+
+        self.session = rq.Session()
+        retry = Retry(total=retries, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='sleeper')
+
+    def get(self, path, ttl=0, refetch=False):
+        """
+        Fetches a single endpoint (relative to the base URL) and returns the decoded JSON.
+
+        Args:
+            path: Endpoint path, e.g. 'state/nfl'
+            ttl: Seconds to cache the response for, None to cache it forever,
+                 or 0 to bypass the cache. A ttl=None read only accepts an
+                 entry that was itself stored forever, so a payload cached
+                 with a TTL (e.g. a week fetched as a schedule before it was
+                 played) is refetched and replaced instead of becoming final.
+            refetch: Skip the cached entry but store the response, overwriting it
+        """
+        url = '{}/{}'.format(self.base_url, path)
+        if self.cache is not None and ttl != 0 and not refetch:
+            payload = self.cache.get(url, permanent=ttl is None)
+            if payload is not None:
+                return payload
+
+        with self._stats_lock:
+            self.network_requests += 1
+        with span('fetch.network'):
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            payload = response.json()
+
+        if self.cache is not None and ttl != 0:
+            self.cache.put(url, payload, ttl)
+        return payload
+
+    def stream(self, path, chunk_size=1 << 16):
+        """Yields the raw response body of an endpoint in chunks, bypassing the cache."""
+        url = '{}/{}'.format(self.base_url, path)
+        with self._stats_lock:
+            self.network_requests += 1
+        with span('fetch.stream'), self.session.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            yield from response.iter_content(chunk_size)
+
+    def submit(self, path, ttl=0, refetch=False):
+        """Schedules a fetch on the worker pool and returns its Future."""
+        return self._executor.submit(self.get, path, ttl, refetch)
+
+    def get_many(self, paths, ttl=0, refetch=False):
+        """Fetches several endpoints concurrently, returning the results in the same order."""
+        futures = [self.submit(path, ttl, refetch) for path in paths]
+        return [future.result() for future in futures]
+
+    def stats(self):
+        """Returns the number of network requests made plus the cache counters, if caching."""
+        stats = {"network_requests": self.network_requests}
+        if self.cache is not None:
+            stats.update(self.cache.stats())
+        return stats
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+    # ==================== Endpoints ====================
+
+    @staticmethod
+    def league_path(league_id):
+        return 'league/{}'.format(league_id)
+
+    @staticmethod
+    def users_path(league_id):
+        return 'league/{}/users'.format(league_id)
+
+    @staticmethod
+    def rosters_path(league_id):
+        return 'league/{}/rosters'.format(league_id)
+
+    @staticmethod
+    def matchups_path(league_id, week):
+        return 'league/{}/matchups/{}'.format(league_id, week)
+
+    @staticmethod
+    def transactions_path(league_id, week):
+        return 'league/{}/transactions/{}'.format(league_id, week)
+
+    @staticmethod
+    def nfl_state_path():
+        return 'state/nfl'
+
+    @staticmethod
+    def players_path():
+        return 'players/nfl'
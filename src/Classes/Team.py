@@ -1,4 +1,7 @@
-from Metrics import Metric, AverageMetric, StdDevMetric, ExpectedWinsMetric, ProbNWins
+import numpy as np
+
+from Metrics import Metric, StreamingAverageMetric, StreamingStdDevMetric, EWMAMetric, ExpectedWinsMetric, ProbNWins
+from Profiler import span
 
 class WeekPerformance:
     def __init__(self, week, points, rank, division_game, adversary_id, adversary_points, adversary_rank):
@@ -23,88 +26,202 @@ class WeekPerformance:
     
 
 class MetricsManager:
+    FORM_WEEKS = 4
+
     def __init__(self):
-        self.weeks = []
-        self.metrics = {}
+        self.points = []
+        self.all_play_probs = []
+        self.win_probs = []
+        # Points metrics are folded in one week at a time and live for the whole season
+        self.streaming = {
+            "avg": StreamingAverageMetric(),
+            "std": StreamingStdDevMetric(),
+            "form": StreamingAverageMetric(window=self.FORM_WEEKS),
+            "ewma": EWMAMetric(span=self.FORM_WEEKS),
+        }
+        self.metrics = dict(self.streaming)
+        # Weeks folded into the streaming metrics, and the first of them changed since
+        self._n_pushed = 0
+        self._changed_from = 0
+        self._results = {}
+        self._dirty = False
+
+    def update(self, points, all_play_probs, changed_from=0):
+        """
+        Args:
+            points, all_play_probs: The team's weekly values so far
+            changed_from: Index of the first week that differs from the previous
+                          update; earlier weeks are known to be unchanged
+        """
+        # Metrics are rebuilt lazily on the next read, so several inserts cost a single rebuild
+        self.points = points
+        self.all_play_probs = all_play_probs
+        self._changed_from = min(self._changed_from, changed_from)
+        self._dirty = True
+
+    def _rebuild(self):
+        points = np.asarray(self.points, dtype=float)
+        winProbs = np.asarray(self.all_play_probs, dtype=float).tolist()
+        self.win_probs = winProbs
 
-    def update(self, weeks: list[WeekPerformance]):
-        points = [week.points for week in weeks]
-        winProbs = [(12-week.rank)/11 for week in weeks]
+        # Only the weeks added since the last rebuild are pushed; a change
+        # to a week already pushed rewrites history, so start over
+        n_pushed = self._n_pushed
+        if self._changed_from < n_pushed:
+            for metric in self.streaming.values():
+                metric.reset()
+            n_pushed = 0
+        for value in points[n_pushed:].tolist():
+            for metric in self.streaming.values():
+                metric.push(value)
+        self._n_pushed = self._changed_from = len(points)
 
-        self.metrics["avg"] = AverageMetric(values=points)
-        self.metrics["std"] = StdDevMetric(values=points)
         self.metrics["expw"] = ExpectedWinsMetric(values=winProbs)
         self.metrics["probNWins"] = ProbNWins(values=winProbs)
 
+        # New data invalidates every memoized result
+        self._results = {}
+        self._dirty = False
+
+    def get(self, name):
+        """Returns a single metric, computing it only if new data arrived since the last read."""
+        if self._dirty:
+            self._rebuild()
+        if name not in self._results:
+            metric = self.metrics.get(name)
+            with span('metric.' + name):
+                self._results[name] = metric.compute() if metric else None
+        return self._results[name]
+
+    def getWinProbs(self):
+        if self._dirty:
+            self._rebuild()
+        return self.win_probs
+
     def to_dict(self):
-        return {k: v.compute() for k, v in self.metrics.items()}
+        if self._dirty:
+            self._rebuild()
+        return {k: self.get(k) for k in self.metrics}
 
 class Team:
-    def __init__(self, team_name, roster_id, division):
+    """
+    A team's view over the league's SeasonStore.
+
+    Weekly data is read straight from the store's columns; nothing is copied
+    into the team. Metrics are refreshed lazily whenever the store changes.
+    """
+
+    def __init__(self, team_name, roster_id, division, store, owner_id=None):
         self.name = team_name
         self.short_name = team_name.split()[1]
         self.division = division
         self.roster_id = roster_id
+        self.owner_id = owner_id
 
-        self.wins = 0
-        self.losses = 0
         self.league_seed = 0
         self.division_seed = 0
 
+        self._store = store
+        self._column = store.column(roster_id)
         self._metrics_manager = MetricsManager()
-        self._weekly_scores = []
+        self._store_version = -1
+
+    def _played(self):
+        """Row mask of the weeks this team played (all rows in a regular season)."""
+        return self._store.played()[:, self._column]
+
+    def _view(self, matrix):
+        column = matrix[:, self._column]
+        played = self._played()
+        return column if played.all() else column[played]
+
+    def _sync(self):
+        if self._store_version != self._store.version:
+            played = self._played()
+            if played.any():
+                changed_from = int(played[:self._store.first_changed_slot(self._store_version)].sum())
+                self._metrics_manager.update(self.getPoints(), self._view(self._store.all_play().win_prob), changed_from)
+            self._store_version = self._store.version
+
+    @property
+    def wins(self):
+        return int(self._view(self._store.win()).sum())
+
+    @property
+    def losses(self):
+        return int(self._played().sum()) - self.wins
 
     def getDivisionRecord(self):
-        division_wins = 0
-        division_games = 0
-        for week in self._weekly_scores:
-            if week.division_game:
-                division_games += 1
-                if week.win:
-                    division_wins += 1
-        return (division_wins/division_games)
+        division_games = self._view(self._store.division_game)
+        if not division_games.any():
+            return -1
+        return (self._view(self._store.win())[division_games].sum() / division_games.sum())
 
     def getH2hRecord(self, other_team_id):
-        h2h_wins = 0
-        h2h_games = 0
-        for week in self._weekly_scores:
-            if week.adversary_id == other_team_id:
-                h2h_games += 1
-                if week.win:
-                    h2h_wins += 1
-        if h2h_games == 0:
+        h2h_games = self._view(self._store.opponent) == other_team_id
+        if not h2h_games.any():
             return -1
-        return (h2h_wins / h2h_games)
-
-    def insert_week(self, week: WeekPerformance):
-        self._weekly_scores.append(week)
-        if week.win:
-            self.wins += 1
-        else:
-            self.losses += 1
-        self._weekly_scores.sort(key=lambda x: x.week)
-        self._metrics_manager.update(self._weekly_scores)
+        return (self._view(self._store.win())[h2h_games].sum() / h2h_games.sum())
 
     def getWeek(self, week):
-        if week <= len(self._weekly_scores):
-            return self._weekly_scores[week - 1].to_dict()
-        return None
+        slot = self._store.slot(week)
+        if slot is None or not self._store.played()[slot, self._column]:
+            return None
+        store = self._store
+        return WeekPerformance(
+            week,
+            float(store.points[slot, self._column]),
+            int(store.rank[slot, self._column]),
+            bool(store.division_game[slot, self._column]),
+            int(store.opponent[slot, self._column]) or None,
+            float(store.adversary_points()[slot, self._column]),
+            int(store.adversary_rank()[slot, self._column]),
+        ).to_dict()
 
     def getPoints(self):
-        return [week.points for week in self._weekly_scores]
+        return self._view(self._store.points)
     
     def getRanks(self):
-        return [week.rank for week in self._weekly_scores]
+        return self._view(self._store.rank)
+
+    def getResults(self):
+        """Returns (adversary_id, win, division_game) for every week played."""
+        return list(zip(
+            self._view(self._store.opponent).tolist(),
+            self._view(self._store.win()).tolist(),
+            self._view(self._store.division_game).tolist(),
+        ))
+
+    def getAllPlayRecord(self):
+        """Season all-play (wins, losses), ties counted as half a win and half a loss."""
+        all_play = self._store.all_play()
+        wins = self._view(all_play.wins).sum()
+        losses = self._view(all_play.losses).sum()
+        ties = self._view(all_play.ties).sum()
+        return float(wins + 0.5 * ties), float(losses + 0.5 * ties)
+
+    def getMetric(self, name):
+        self._sync()
+        return self._metrics_manager.get(name)
+
+    def getWinProbs(self):
+        self._sync()
+        return self._metrics_manager.getWinProbs()
 
     def to_dict(self):
+        self._sync()
+        allplay_wins, allplay_losses = self.getAllPlayRecord()
         return {
             "name": self.name,
             "short_name": self.short_name,
             "division": self.division,
             "roster_id": self.roster_id,
+            "owner_id": self.owner_id,
             "seed": self.league_seed,
             "division_seed": self.division_seed,
             "wins": self.wins,
             "losses": self.losses,
+            "allplay_wins": allplay_wins,
+            "allplay_losses": allplay_losses,
             **self._metrics_manager.to_dict()
         }
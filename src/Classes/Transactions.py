@@ -0,0 +1,133 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from SleeperClient import SleeperClient
+
+
+class TransactionLog:
+    """
+    Incrementally ingested waiver, free agent and trade activity of a league.
+
+    Every player move becomes one row (a transaction touching several
+    players or rosters has several rows), keyed by week and roster_id so
+    the table joins with the scoring DataFrame.
+
+    Each week keeps a cursor: the status_updated of every transaction id
+    already stored. A refresh fetches only the open weeks (the current and
+    previous one, where waivers and trades still land) concurrently, and
+    only transactions that are new or whose status_updated moved since the
+    cursor are (re)parsed. Older weeks are final: they are fetched once,
+    through the permanent response cache.
+    """
+
+    OPEN_WEEKS = 2
+    COLUMNS = ['transaction_id', 'week', 'type', 'status', 'roster_id', 'player_id', 'action', 'faab', 'created']
+
+    def __init__(self, client, league_id):
+        self.client = client
+        self.league_id = league_id
+        self.cursors = {}
+        self._rows = {}
+        self._final_weeks = set()
+        self._frame = None
+        self._lock = threading.Lock()
+
+    def refresh(self, current_week):
+        """
+        Pulls transactions up to current_week.
+
+        Returns:
+            Number of transactions added or updated.
+        """
+        with self._lock:
+            first_open = max(1, current_week - self.OPEN_WEEKS + 1)
+            final = [week for week in range(1, first_open) if week not in self._final_weeks]
+            open_weeks = list(range(first_open, current_week + 1))
+
+            # Final weeks never change, so they are cached forever; open weeks always hit the network
+            futures = {
+                week: self.client.submit(SleeperClient.transactions_path(self.league_id, week), None)
+                for week in final
+            }
+            futures.update({
+                week: self.client.submit(SleeperClient.transactions_path(self.league_id, week), 0)
+                for week in open_weeks
+            })
+
+            changed = 0
+            for week, future in futures.items():
+                changed += self._ingest(week, future.result() or [])
+            self._final_weeks.update(final)
+            if changed:
+                self._frame = None
+            return changed
+
+    def _ingest(self, week, transactions):
+        seen = self.cursors.setdefault(week, {})
+        changed = 0
+        for transaction in transactions:
+            transaction_id = int(transaction['transaction_id'])
+            updated = transaction.get('status_updated') or transaction.get('created') or 0
+            if seen.get(transaction_id) == updated:
+                continue
+            seen[transaction_id] = updated
+            self._rows[transaction_id] = self._parse(week, transaction)
+            changed += 1
+        return changed
+
+    @staticmethod
+    def _parse(week, transaction):
+        """One row per player added or dropped, plus FAAB moved between rosters in trades."""
+        transaction_id = int(transaction['transaction_id'])
+        kind = transaction.get('type')
+        status = transaction.get('status')
+        created = transaction.get('created') or 0
+        bid = (transaction.get('settings') or {}).get('waiver_bid') or 0
+
+        rows = []
+        for action, moves in (('add', transaction.get('adds')), ('drop', transaction.get('drops'))):
+            for player_id, roster_id in (moves or {}).items():
+                faab = bid if action == 'add' and kind == 'waiver' else 0
+                rows.append((transaction_id, week, kind, status, roster_id, player_id, action, faab, created))
+        for transfer in transaction.get('waiver_budget') or []:
+            rows.append((transaction_id, week, kind, status, transfer['sender'], None, 'faab_sent', transfer['amount'], created))
+            rows.append((transaction_id, week, kind, status, transfer['receiver'], None, 'faab_received', transfer['amount'], created))
+        return rows
+
+    def to_frame(self):
+        """
+        The transaction table, rebuilt only after a refresh brought changes.
+
+        Columns: transaction_id, week, type (waiver/free_agent/trade/commissioner),
+        status (complete/failed/...), roster_id, player_id, action (add, drop,
+        faab_sent, faab_received), faab (winning bid or FAAB moved) and created.
+        """
+        with self._lock:
+            if self._frame is None:
+                rows = [row for transaction_id in sorted(self._rows) for row in self._rows[transaction_id]]
+                frame = pd.DataFrame(rows, columns=self.COLUMNS)
+                self._frame = frame.astype({
+                    'transaction_id': np.int64,
+                    'week': np.int16,
+                    'type': 'category',
+                    'status': 'category',
+                    'roster_id': np.int32,
+                    'action': 'category',
+                    'faab': np.int32,
+                })
+                self._frame['created'] = pd.to_datetime(self._frame['created'], unit='ms')
+            return self._frame
+
+    def summary(self):
+        """Per-roster activity: completed moves, waiver claims won, FAAB spent and trades."""
+        frame = self.to_frame()
+        complete = frame[frame['status'] == 'complete']
+        adds = complete[complete['action'] == 'add']
+        return pd.DataFrame({
+            'adds': adds.groupby('roster_id').size(),
+            'waiver_claims': adds[adds['type'] == 'waiver'].groupby('roster_id').size(),
+            'faab_spent': adds.groupby('roster_id')['faab'].sum(),
+            'trades': complete[complete['type'] == 'trade'].groupby('roster_id')['transaction_id'].nunique(),
+        }).fillna(0).astype(int).rename_axis('roster_id').reset_index()
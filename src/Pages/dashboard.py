@@ -9,7 +9,7 @@ def render_dashboard(teams_df, scores_df):
     # League Standings Table
     st.subheader("Classificação da Liga")
     # Select and rename columns for display
-    standings_df = teams_df[['seed', 'short_name', 'wins', 'avg', 'std', 'expw']]\
+    standings_df = teams_df[['seed', 'short_name', 'wins', 'avg', 'std', 'form', 'expw']]\
         .sort_values(by="seed")\
         .rename(columns={
             'seed': 'Seed',
@@ -17,13 +17,23 @@ def render_dashboard(teams_df, scores_df):
             'wins': 'Vitórias',
             'avg': 'Média',
             'std': 'Desvio Padrão',
+            'form': 'Forma',
             'expw': 'Expected Wins'
         })
     standings_df['Delta W'] =  standings_df['Vitórias'] - standings_df['Expected Wins']
 
+    # Clinch markers: z = bye, x = playoffs, e = eliminated
+    if 'clinched_playoffs' in teams_df:
+        status = teams_df.loc[standings_df.index]
+        standings_df.insert(2, 'Status', '')
+        standings_df.loc[status['clinched_playoffs'] == True, 'Status'] = 'x'
+        standings_df.loc[status['clinched_bye'] == True, 'Status'] = 'z'
+        standings_df.loc[status['eliminated'] == True, 'Status'] = 'e'
+
     # Round numeric columns for better display
     standings_df['Média'] = standings_df['Média'].round(2)
     standings_df['Desvio Padrão'] = standings_df['Desvio Padrão'].round(2)
+    standings_df['Forma'] = standings_df['Forma'].round(2)
     standings_df['Expected Wins'] = standings_df['Expected Wins'].round(2)
     standings_df['Delta W'] = standings_df['Delta W'].round(2)
 
@@ -35,9 +45,11 @@ def render_dashboard(teams_df, scores_df):
         column_config={
             "Seed": st.column_config.NumberColumn("Seed", format="%d"),
             "Time": st.column_config.TextColumn("Time"),
+            "Status": st.column_config.TextColumn("Status", help="z: bye garantido | x: playoffs garantidos | e: eliminado"),
             "Vitórias": st.column_config.NumberColumn("Vitórias", format="%d"),
             "Média": st.column_config.NumberColumn("Média", format="%.2f"),
             "Desvio Padrão": st.column_config.NumberColumn("Desvio Padrão", format="%.2f"),
+            "Forma": st.column_config.NumberColumn("Forma", format="%.2f", help="Média das últimas 4 semanas"),
             "Expected Wins": st.column_config.NumberColumn("Expected Wins", format="%.2f"),
             "Delta W": st.column_config.NumberColumn("Delta W", format="%.2f"),
         }
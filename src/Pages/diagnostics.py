@@ -0,0 +1,51 @@
+import json
+
+import streamlit as st
+import pandas as pd
+import altair as alt
+
+
+def render_diagnostics(summary, trace):
+    """Render the Diagnostics tab."""
+    st.header("Diagnóstico")
+
+    if not summary:
+        st.info("Nenhum intervalo medido ainda.")
+        return
+
+    summary_df = pd.DataFrame(summary)
+
+    # Where the time goes, grouped by area (fetch, metric, seeding, dataframe, render, ...)
+    summary_df['area'] = summary_df['name'].str.split('.').str[0]
+    chart = alt.Chart(summary_df).mark_bar().encode(
+        x=alt.X('total_ms:Q', title='Tempo total (ms)'),
+        y=alt.Y('name:N', sort='-x', title=None),
+        color=alt.Color('area:N', title='Área'),
+        tooltip=['name', 'calls', alt.Tooltip('total_ms:Q', format='.1f'), alt.Tooltip('mean_ms:Q', format='.2f'), alt.Tooltip('max_ms:Q', format='.1f')]
+    ).properties(height=max(200, 22 * len(summary_df)))
+    st.altair_chart(chart, use_container_width=True)
+
+    st.dataframe(
+        summary_df.drop(columns='area').rename(columns={
+            'name': 'Intervalo',
+            'calls': 'Chamadas',
+            'total_ms': 'Total (ms)',
+            'mean_ms': 'Média (ms)',
+            'max_ms': 'Máximo (ms)'
+        }),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Total (ms)": st.column_config.NumberColumn("Total (ms)", format="%.1f"),
+            "Média (ms)": st.column_config.NumberColumn("Média (ms)", format="%.3f"),
+            "Máximo (ms)": st.column_config.NumberColumn("Máximo (ms)", format="%.1f"),
+        }
+    )
+
+    st.download_button(
+        "Baixar trace (JSON)",
+        data=json.dumps(trace),
+        file_name="lfl_trace.json",
+        mime="application/json",
+        help="Abra em chrome://tracing ou ui.perfetto.dev"
+    )
@@ -1,12 +1,15 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 import altair as alt
-from scipy.interpolate import make_interp_spline
 
 
-def render_expected_wins(teams_df, prob_df):
-    """Render the Expected Wins tab."""
+def render_expected_wins(teams_df, prob_curves_df):
+    """
+    Render the Expected Wins tab.
+
+    prob_curves_df holds the precomputed curves of every team (see
+    FantasyLeague.getProbCurvesDf); selecting teams only filters its rows.
+    """
     st.header("Expected Wins")
 
     # Expected Wins Chart
@@ -61,53 +64,19 @@ def render_expected_wins(teams_df, prob_df):
     st.markdown("---")
 
     if selected_teams:
-        # Prepare data for probability chart
-        prob_chart_data = []
-
-        for short_name in selected_teams:
-            # Get roster_id and wins for this team
-            team_data = teams_df[teams_df['short_name'] == short_name]
-            wins = team_data['wins'].values[0]
-            prob_data = team_data["probNWins"].values[0]
-            # Get probability data for this team
-            x_original = list(range(1,len(prob_data)+1))
-
-            # Create a smooth x range for interpolation
-            x_smooth = np.linspace(min(x_original), max(x_original), 200)
-
-            # Create a cubic spline interpolation
-            spline = make_interp_spline(x_original, prob_data, k=2)
-            y_smooth = spline(x_smooth)
-
-            # Add smoothed curve data
-            for x, y in zip(x_smooth, y_smooth):
-                prob_chart_data.append({
-                    'Time': short_name,
-                    'Vitórias': x,
-                    'Probabilidade': y,
-                    'Marker': None
-                })
-
-            # Add marker at actual wins
-            y_wins = spline(wins)
-            prob_chart_data.append({
-                'Time': short_name,
-                'Vitórias': wins,
-                'Probabilidade': y_wins,
-                'Marker': 'Vitórias Reais'
-            })
-
-        prob_chart_df = pd.DataFrame(prob_chart_data)
+        # Curves are precomputed for every team; keep the selected ones
+        prob_chart_df = prob_curves_df[prob_curves_df['short_name'].isin(selected_teams)]\
+            .rename(columns={'short_name': 'Time', 'wins': 'Vitórias', 'prob': 'Probabilidade'})
 
         # Create line chart
-        lines = alt.Chart(prob_chart_df[prob_chart_df['Marker'].isna()]).mark_line(strokeWidth=2).encode(
+        lines = alt.Chart(prob_chart_df[~prob_chart_df['marker']]).mark_line(strokeWidth=2).encode(
             x=alt.X('Vitórias:Q', title='Número de Vitórias'),
             y=alt.Y('Probabilidade:Q', title='Probabilidade'),
             color=alt.Color('Time:N', legend=alt.Legend(title='Time', orient='top'))
         )
 
         # Create markers for actual wins
-        markers = alt.Chart(prob_chart_df[prob_chart_df['Marker'].notna()]).mark_circle(size=100).encode(
+        markers = alt.Chart(prob_chart_df[prob_chart_df['marker']]).mark_circle(size=100).encode(
             x=alt.X('Vitórias:Q'),
             y=alt.Y('Probabilidade:Q'),
             color=alt.Color('Time:N', legend=None),
@@ -0,0 +1,98 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import altair as alt
+
+
+VIEWS = {
+    "Confronto Direto": ('win_pct', 'record', 'Recorde'),
+    "All-Play": ('all_play_pct', 'all_play_record', 'Recorde All-Play'),
+    "Margem Média": ('points_margin', 'points_margin_label', 'Margem Média'),
+}
+
+
+def render_head_to_head(teams_df, head_to_head_df):
+    """
+    Render the Confrontos tab.
+
+    head_to_head_df holds every ordered pair of teams (see
+    FantasyLeague.getHeadToHeadDf); each view is one heatmap over it.
+    """
+    st.header("Confrontos")
+
+    # The frame always has every pair of teams, so check for games instead of rows
+    if head_to_head_df['games'].sum() == 0 and head_to_head_df['all_play_wins'].sum() == 0:
+        st.info("Nenhuma semana disputada ainda.")
+        return
+
+    chart_df = head_to_head_df.copy()
+    chart_df['record'] = (chart_df['wins'].astype(str) + '-' + chart_df['losses'].astype(str)).where(chart_df['games'] > 0, '')
+    chart_df.loc[chart_df['ties'] > 0, 'record'] += '-' + chart_df['ties'].astype(str)
+    chart_df['all_play_record'] = chart_df['all_play_wins'].astype(str) + '-' + chart_df['all_play_losses'].astype(str)
+    chart_df['points_margin_label'] = chart_df['points_margin'].map('{:+.1f}'.format).where(chart_df['points_margin'].notna(), '')
+
+    team_order = teams_df.sort_values(by='seed')['short_name'].tolist()
+
+    view = st.radio("Visualização", list(VIEWS), horizontal=True)
+    value, label, title = VIEWS[view]
+
+    if view == "Margem Média":
+        st.caption("Diferença média de pontos entre os dois times em todas as semanas, "
+                   "tenham se enfrentado ou não.")
+        limit = float(np.nanmax(chart_df['points_margin'].abs().to_numpy(), initial=0)) or 1.0
+        scale = alt.Scale(scheme='redblue', domain=[-limit, limit])
+        legend = alt.Legend(title='Margem')
+    else:
+        if view == "All-Play":
+            st.caption("Semanas em que o time fez mais pontos que o adversário, tenham se enfrentado ou não.")
+        scale = alt.Scale(scheme='redblue', domain=[0, 1])
+        legend = alt.Legend(title='% Vitórias', format='.0%')
+
+    heatmap = alt.Chart(chart_df).mark_rect().encode(
+        x=alt.X('adversary_short_name:N', sort=team_order, title='Adversário'),
+        y=alt.Y('short_name:N', sort=team_order, title='Time'),
+        color=alt.Color(f'{value}:Q', scale=scale, legend=legend),
+        tooltip=[
+            alt.Tooltip('short_name:N', title='Time'),
+            alt.Tooltip('adversary_short_name:N', title='Adversário'),
+            alt.Tooltip('record:N', title='Recorde'),
+            alt.Tooltip('margin:Q', title='Margem nos Confrontos', format='.2f'),
+            alt.Tooltip('all_play_record:N', title='Recorde All-Play'),
+            alt.Tooltip('points_margin:Q', title='Margem Média', format='.2f')
+        ]
+    )
+    labels = heatmap.mark_text(fontSize=10).encode(
+        text=alt.Text(f'{label}:N', title=title),
+        color=alt.value('black')
+    )
+
+    st.altair_chart((heatmap + labels).properties(height=max(400, 35 * len(team_order))), use_container_width=True)
+
+    st.markdown("---")
+
+    # Per-team breakdown
+    st.subheader("Confrontos por Time")
+
+    team = st.selectbox("Time", team_order)
+    table_df = chart_df[chart_df['short_name'] == team][[
+        'adversary_short_name', 'record', 'margin', 'all_play_record', 'all_play_pct', 'points_margin'
+    ]].rename(columns={
+        'adversary_short_name': 'Adversário',
+        'record': 'Recorde',
+        'margin': 'Margem nos Confrontos',
+        'all_play_record': 'Recorde All-Play',
+        'all_play_pct': '% All-Play',
+        'points_margin': 'Margem Média'
+    })
+    table_df['% All-Play'] = table_df['% All-Play'] * 100
+
+    st.dataframe(
+        table_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Margem nos Confrontos": st.column_config.NumberColumn("Margem nos Confrontos", format="%.2f"),
+            "% All-Play": st.column_config.NumberColumn("% All-Play", format="%.1f%%"),
+            "Margem Média": st.column_config.NumberColumn("Margem Média", format="%.2f"),
+        }
+    )
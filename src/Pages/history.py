@@ -0,0 +1,67 @@
+import streamlit as st
+import pandas as pd
+import altair as alt
+
+
+def render_history(averages_df, h2h_df):
+    """Render the Histórico tab."""
+    st.header("Histórico")
+
+    if averages_df.empty:
+        st.info("Nenhuma temporada arquivada. Use o botão abaixo para arquivar as temporadas anteriores.")
+        return
+
+    # All-time standings
+    st.subheader("Classificação de Todos os Tempos")
+
+    all_time_df = averages_df[['short_name', 'seasons', 'games', 'wins', 'losses', 'win_pct', 'avg', 'std']]\
+        .rename(columns={
+            'short_name': 'Time',
+            'seasons': 'Temporadas',
+            'games': 'Jogos',
+            'wins': 'Vitórias',
+            'losses': 'Derrotas',
+            'win_pct': '% Vitórias',
+            'avg': 'Média',
+            'std': 'Desvio Padrão'
+        })
+    all_time_df['% Vitórias'] = all_time_df['% Vitórias'] * 100
+
+    st.dataframe(
+        all_time_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "% Vitórias": st.column_config.NumberColumn("% Vitórias", format="%.1f%%"),
+            "Média": st.column_config.NumberColumn("Média", format="%.2f"),
+            "Desvio Padrão": st.column_config.NumberColumn("Desvio Padrão", format="%.2f"),
+        }
+    )
+
+    st.markdown("---")
+
+    # All-time head-to-head
+    st.subheader("Confronto Direto de Todos os Tempos")
+
+    h2h_chart_df = h2h_df.copy()
+    h2h_chart_df['Recorde'] = h2h_chart_df['wins'].astype(int).astype(str) + '-' + h2h_chart_df['losses'].astype(int).astype(str)
+    h2h_chart_df['% Vitórias'] = h2h_chart_df['wins'] / h2h_chart_df['games']
+    team_order = averages_df['short_name'].tolist()
+
+    heatmap = alt.Chart(h2h_chart_df).mark_rect().encode(
+        x=alt.X('adversary_short_name:N', sort=team_order, title='Adversário'),
+        y=alt.Y('short_name:N', sort=team_order, title='Time'),
+        color=alt.Color('% Vitórias:Q', scale=alt.Scale(scheme='redblue', domain=[0, 1]), legend=alt.Legend(format='.0%')),
+        tooltip=[
+            alt.Tooltip('short_name:N', title='Time'),
+            alt.Tooltip('adversary_short_name:N', title='Adversário'),
+            alt.Tooltip('Recorde:N'),
+            alt.Tooltip('avg_margin:Q', title='Margem Média', format='.2f')
+        ]
+    )
+    labels = heatmap.mark_text(fontSize=10).encode(
+        text='Recorde:N',
+        color=alt.value('black')
+    )
+
+    st.altair_chart((heatmap + labels).properties(height=500), use_container_width=True)
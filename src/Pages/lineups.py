@@ -0,0 +1,83 @@
+import streamlit as st
+import pandas as pd
+import altair as alt
+
+
+def render_lineups(teams_df, lineup_df):
+    """Render the Escalações (optimal lineup) tab."""
+    st.header("Escalações")
+
+    if lineup_df.empty:
+        st.info("Os dados de jogadores não estão disponíveis para esta liga.")
+        return
+
+    st.caption("Escalação ótima de cada semana, respeitando as posições da liga, "
+               "comparada com a escalação usada.")
+
+    # Season totals per team
+    st.subheader("Pontos Deixados no Banco")
+
+    season_df = lineup_df.groupby(['short_name', 'roster_id'], as_index=False).agg(
+        points=('points', 'sum'),
+        optimal_points=('optimal_points', 'sum'),
+        points_lost=('points_lost', 'sum'),
+        bench_points=('bench_points', 'sum'),
+        perfect_weeks=('points_lost', lambda lost: int((lost < 0.01).sum())),
+    )
+    season_df['efficiency'] = season_df['points'] / season_df['optimal_points'].where(season_df['optimal_points'] > 0)
+    season_df = season_df.sort_values(by='points_lost')
+
+    lost_chart = alt.Chart(season_df).mark_bar().encode(
+        x=alt.X('short_name:N', sort=None, title='Time'),
+        y=alt.Y('points_lost:Q', title='Pontos Perdidos'),
+        color=alt.Color('efficiency:Q', scale=alt.Scale(scheme='redyellowgreen'), legend=alt.Legend(title='Eficiência', format='.0%')),
+        tooltip=[
+            alt.Tooltip('short_name:N', title='Time'),
+            alt.Tooltip('points_lost:Q', title='Pontos Perdidos', format='.2f'),
+            alt.Tooltip('efficiency:Q', title='Eficiência', format='.1%')
+        ]
+    ).properties(height=400)
+    st.altair_chart(lost_chart, use_container_width=True)
+
+    table_df = season_df.drop(columns='roster_id').rename(columns={
+        'short_name': 'Time',
+        'points': 'Pontos',
+        'optimal_points': 'Pontos Ótimos',
+        'points_lost': 'Pontos Perdidos',
+        'bench_points': 'Pontos no Banco',
+        'perfect_weeks': 'Semanas Perfeitas',
+        'efficiency': 'Eficiência'
+    })
+    table_df['Eficiência'] = table_df['Eficiência'] * 100
+
+    st.dataframe(
+        table_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Pontos": st.column_config.NumberColumn("Pontos", format="%.2f"),
+            "Pontos Ótimos": st.column_config.NumberColumn("Pontos Ótimos", format="%.2f"),
+            "Pontos Perdidos": st.column_config.NumberColumn("Pontos Perdidos", format="%.2f"),
+            "Pontos no Banco": st.column_config.NumberColumn("Pontos no Banco", format="%.2f"),
+            "Eficiência": st.column_config.NumberColumn("Eficiência", format="%.1f%%"),
+        }
+    )
+
+    st.markdown("---")
+
+    # Weekly points lost
+    st.subheader("Pontos Perdidos por Semana")
+
+    weekly_chart = alt.Chart(lineup_df).mark_rect().encode(
+        x=alt.X('week:O', title='Semana'),
+        y=alt.Y('short_name:N', sort=season_df['short_name'].tolist(), title='Time'),
+        color=alt.Color('points_lost:Q', scale=alt.Scale(scheme='oranges'), legend=alt.Legend(title='Pontos Perdidos')),
+        tooltip=[
+            alt.Tooltip('short_name:N', title='Time'),
+            alt.Tooltip('week:O', title='Semana'),
+            alt.Tooltip('points:Q', title='Pontos', format='.2f'),
+            alt.Tooltip('optimal_points:Q', title='Pontos Ótimos', format='.2f'),
+            alt.Tooltip('points_lost:Q', title='Pontos Perdidos', format='.2f')
+        ]
+    ).properties(height=max(300, 25 * len(season_df)))
+    st.altair_chart(weekly_chart, use_container_width=True)
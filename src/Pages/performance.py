@@ -3,7 +3,7 @@ import pandas as pd
 import altair as alt
 
 
-def render_performance(teams_df, scores_df):
+def render_performance(teams_df, scores_df, bootstrap_df):
     """Render the Gr�ficos de Desempenho tab."""
     st.header("Gr�ficos de Desempenho")
 
@@ -43,15 +43,17 @@ def render_performance(teams_df, scores_df):
     st.markdown("---")
 
     # Performance chart
-    st.subheader("Performance Média com Desvio Padrão")
+    st.subheader("Performance Média com Intervalo de Confiança")
+    st.caption("Intervalo de 90% por bootstrap: as semanas de cada time são reamostradas "
+               "milhares de vezes, então poucas semanas ou pontuações irregulares dão barras maiores.")
 
     # Sort by average for better visualization
     perf_data = teams_df.sort_values(by=['avg']).reset_index(drop=True)
 
     # Create error bars data
-    perf_chart_data = perf_data[['short_name', 'avg', 'std']].copy()
-    perf_chart_data['lower'] = perf_chart_data['avg'] - perf_chart_data['std']
-    perf_chart_data['upper'] = perf_chart_data['avg'] + perf_chart_data['std']
+    perf_chart_data = perf_data[['short_name', 'avg', 'std']].merge(
+        bootstrap_df[['short_name', 'mean_low', 'mean_high']], on='short_name', how='left'
+    ).rename(columns={'mean_low': 'lower', 'mean_high': 'upper'})
 
     # Create bar chart with error bars
     base = alt.Chart(perf_chart_data).encode(
@@ -69,6 +71,13 @@ def render_performance(teams_df, scores_df):
     error_bars = base.mark_errorbar(thickness=3).encode(
         y=alt.Y('lower:Q', scale=alt.Scale(domain=[80, 165])),
         y2=alt.Y2('upper:Q'),
+        tooltip=[
+            alt.Tooltip('short_name:N', title='Time'),
+            alt.Tooltip('avg:Q', title='Média', format='.2f'),
+            alt.Tooltip('lower:Q', title='Limite Inferior', format='.2f'),
+            alt.Tooltip('upper:Q', title='Limite Superior', format='.2f'),
+            alt.Tooltip('std:Q', title='Desvio Padrão', format='.2f')
+        ]
     )
 
     perf_chart = (bars + error_bars).properties(
@@ -79,4 +88,29 @@ def render_performance(teams_df, scores_df):
         labelAngle=-45
     )
 
-    st.altair_chart(perf_chart, use_container_width=True)
\ No newline at end of file
+    st.altair_chart(perf_chart, use_container_width=True)
+
+    # Interval table
+    interval_df = bootstrap_df.sort_values(by='mean', ascending=False)
+    table_df = pd.DataFrame({
+        'Time': interval_df['short_name'],
+        'Semanas': interval_df['weeks'],
+        'Média': interval_df['mean'],
+        'IC Média': interval_df['mean_low'].map('{:.1f}'.format) + ' – ' + interval_df['mean_high'].map('{:.1f}'.format),
+        'Expected Wins': interval_df['expw'],
+        'IC Expected Wins': interval_df['expw_low'].map('{:.1f}'.format) + ' – ' + interval_df['expw_high'].map('{:.1f}'.format),
+        '% All-Play': interval_df['all_play_pct'] * 100,
+        'IC % All-Play': (interval_df['all_play_pct_low'] * 100).map('{:.0f}%'.format) + ' – '
+                         + (interval_df['all_play_pct_high'] * 100).map('{:.0f}%'.format),
+    })
+
+    st.dataframe(
+        table_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Média": st.column_config.NumberColumn("Média", format="%.2f"),
+            "Expected Wins": st.column_config.NumberColumn("Expected Wins", format="%.2f"),
+            "% All-Play": st.column_config.NumberColumn("% All-Play", format="%.1f%%"),
+        }
+    )
@@ -0,0 +1,87 @@
+import streamlit as st
+import pandas as pd
+import altair as alt
+
+
+def render_playoff_odds(teams_df, odds_df):
+    """Render the Playoff Odds tab."""
+    st.header("Chances de Playoff")
+
+    st.caption("Simulação Monte Carlo da temporada regular restante, "
+               "com os critérios de desempate da liga.")
+
+    # Playoff odds table
+    st.subheader("Chance de Classificação")
+
+    odds_table = odds_df[['short_name', 'division', 'playoffs']]\
+        .merge(teams_df[['short_name', 'seed', 'wins', 'losses']], on='short_name')\
+        .sort_values(by='playoffs', ascending=False)\
+        .rename(columns={
+            'short_name': 'Time',
+            'division': 'Divisão',
+            'playoffs': 'Playoffs',
+            'seed': 'Seed Atual',
+            'wins': 'Vitórias',
+            'losses': 'Derrotas'
+        })
+    odds_table['Playoffs'] = odds_table['Playoffs'] * 100
+
+    st.dataframe(
+        odds_table,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Playoffs": st.column_config.ProgressColumn("Playoffs", format="%.1f%%", min_value=0, max_value=100),
+            "Seed Atual": st.column_config.NumberColumn("Seed Atual", format="%d"),
+        }
+    )
+
+    st.markdown("---")
+
+    # League seed heatmap
+    st.subheader("Probabilidade de Cada Seed")
+
+    team_order = odds_df.sort_values(by='playoffs', ascending=False)['short_name'].tolist()
+    seed_columns = [column for column in odds_df.columns if column.startswith('seed_')]
+    seed_df = odds_df.melt(id_vars='short_name', value_vars=seed_columns, var_name='Seed', value_name='Probabilidade')
+    seed_df['Seed'] = seed_df['Seed'].str.replace('seed_', '').astype(int)
+
+    heatmap = alt.Chart(seed_df).mark_rect().encode(
+        x=alt.X('Seed:O', title='Seed'),
+        y=alt.Y('short_name:N', sort=team_order, title='Time'),
+        color=alt.Color('Probabilidade:Q', scale=alt.Scale(scheme='blues'), legend=alt.Legend(format='.0%')),
+        tooltip=[
+            alt.Tooltip('short_name:N', title='Time'),
+            alt.Tooltip('Seed:O'),
+            alt.Tooltip('Probabilidade:Q', format='.1%')
+        ]
+    )
+    labels = heatmap.mark_text(fontSize=10).encode(
+        text=alt.Text('Probabilidade:Q', format='.0%'),
+        color=alt.condition(alt.datum.Probabilidade > 0.5, alt.value('white'), alt.value('black'))
+    )
+
+    st.altair_chart((heatmap + labels).properties(height=500), use_container_width=True)
+
+    st.markdown("---")
+
+    # Division seed table
+    st.subheader("Probabilidade de Seed na Divisão")
+
+    division_columns = [column for column in odds_df.columns if column.startswith('division_seed_')]
+    for division_name, division_df in odds_df.groupby('division'):
+        st.markdown(f"**Divisão {division_name}**")
+        division_table = division_df[['short_name'] + division_columns]\
+            .sort_values(by=division_columns, ascending=False)\
+            .rename(columns={'short_name': 'Time'})
+        division_table = division_table.rename(columns={
+            column: f"{column.replace('division_seed_', '')}º" for column in division_columns
+        })
+
+        st.dataframe(
+            division_table.style.format({
+                column: '{:.1%}' for column in division_table.columns if column != 'Time'
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
@@ -0,0 +1,109 @@
+import streamlit as st
+import pandas as pd
+import altair as alt
+
+
+def render_schedule_luck(schedule_swap_df, schedule_luck_df):
+    """
+    Render the Sorte (schedule luck) tab.
+
+    schedule_swap_df holds every team's record on every team's schedule and
+    schedule_luck_df the comparison with random schedules (see
+    FantasyLeague.getScheduleSwapDf and getScheduleLuckDf).
+    """
+    st.header("Sorte na Tabela")
+
+    if schedule_swap_df[['wins', 'losses', 'ties']].to_numpy().sum() == 0:
+        st.info("Nenhuma semana disputada ainda.")
+        return
+
+    luck_df = schedule_luck_df.sort_values(by='luck', ascending=False)
+    team_order = luck_df['short_name'].tolist()
+
+    # Luck against random schedules
+    st.subheader("Vitórias Reais vs Tabelas Aleatórias")
+    st.caption("Cada time mantém seus pontos semanais; a faixa mostra 80% das vitórias "
+               "obtidas em milhares de tabelas sorteadas.")
+
+    base = alt.Chart(luck_df).encode(y=alt.Y('short_name:N', sort=team_order, title='Time'))
+    band = base.mark_bar(height=14, opacity=0.35, color='#1f77b4').encode(
+        x=alt.X('random_p10:Q', title='Vitórias'),
+        x2='random_p90:Q'
+    )
+    expected = base.mark_tick(color='#1f77b4', thickness=2, size=18).encode(
+        x='random_mean:Q',
+        tooltip=[
+            alt.Tooltip('short_name:N', title='Time'),
+            alt.Tooltip('random_mean:Q', title='Média em Tabelas Aleatórias', format='.2f'),
+            alt.Tooltip('random_p10:Q', title='Percentil 10', format='.1f'),
+            alt.Tooltip('random_p90:Q', title='Percentil 90', format='.1f')
+        ]
+    )
+    actual = base.mark_point(filled=True, size=90).encode(
+        x='wins:Q',
+        color=alt.Color('luck:Q', scale=alt.Scale(scheme='redyellowgreen', domainMid=0), legend=alt.Legend(title='Sorte')),
+        tooltip=[
+            alt.Tooltip('short_name:N', title='Time'),
+            alt.Tooltip('wins:Q', title='Vitórias Reais', format='.1f'),
+            alt.Tooltip('luck:Q', title='Sorte', format='+.2f'),
+            alt.Tooltip('percentile:Q', title='Percentil', format='.0%')
+        ]
+    )
+    st.altair_chart((band + expected + actual).properties(height=max(300, 30 * len(team_order))), use_container_width=True)
+
+    table_df = luck_df[['short_name', 'wins', 'random_mean', 'luck', 'percentile', 'swap_best', 'swap_worst']].rename(columns={
+        'short_name': 'Time',
+        'wins': 'Vitórias',
+        'random_mean': 'Vitórias Esperadas',
+        'luck': 'Sorte',
+        'percentile': 'Percentil',
+        'swap_best': 'Melhor Tabela',
+        'swap_worst': 'Pior Tabela'
+    })
+    table_df['Percentil'] = table_df['Percentil'] * 100
+
+    st.dataframe(
+        table_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Vitórias": st.column_config.NumberColumn("Vitórias", format="%.1f"),
+            "Vitórias Esperadas": st.column_config.NumberColumn("Vitórias Esperadas", format="%.2f"),
+            "Sorte": st.column_config.NumberColumn("Sorte", format="%+.2f"),
+            "Percentil": st.column_config.NumberColumn("Percentil", format="%.0f%%"),
+            "Melhor Tabela": st.column_config.NumberColumn("Melhor Tabela", format="%.1f"),
+            "Pior Tabela": st.column_config.NumberColumn("Pior Tabela", format="%.1f"),
+        }
+    )
+
+    st.markdown("---")
+
+    # Every team on every schedule
+    st.subheader("Recorde com a Tabela de Cada Time")
+    st.caption("Linha: time; coluna: tabela usada. A diagonal é o recorde real.")
+
+    chart_df = schedule_swap_df.copy()
+    chart_df['Recorde'] = chart_df['wins'].astype(str) + '-' + chart_df['losses'].astype(str)
+    chart_df.loc[chart_df['ties'] > 0, 'Recorde'] += '-' + chart_df['ties'].astype(str)
+    # Difference from the actual record, so every row is on the same scale
+    actual_wins = chart_df[chart_df['own']].set_index('roster_id')['wins']
+    chart_df['Diferença'] = chart_df['wins'] - chart_df['roster_id'].map(actual_wins)
+
+    heatmap = alt.Chart(chart_df).mark_rect().encode(
+        x=alt.X('schedule_short_name:N', sort=team_order, title='Tabela de'),
+        y=alt.Y('short_name:N', sort=team_order, title='Time'),
+        color=alt.Color('Diferença:Q', scale=alt.Scale(scheme='redblue', domainMid=0), legend=alt.Legend(title='Vitórias a Mais')),
+        stroke=alt.condition('datum.own', alt.value('black'), alt.value(None)),
+        tooltip=[
+            alt.Tooltip('short_name:N', title='Time'),
+            alt.Tooltip('schedule_short_name:N', title='Tabela de'),
+            alt.Tooltip('Recorde:N'),
+            alt.Tooltip('Diferença:Q', title='Vitórias a Mais')
+        ]
+    )
+    labels = heatmap.mark_text(fontSize=10).encode(
+        text='Recorde:N',
+        color=alt.value('black')
+    )
+
+    st.altair_chart((heatmap + labels).properties(height=max(400, 35 * len(team_order))), use_container_width=True)
@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+import json
 import sys
 
 # Add module paths before importing custom modules
@@ -7,21 +8,60 @@ sys.path.append('./src/Classes')
 sys.path.append('./src/Pages')
 
 from FantasyLeague import FantasyLeague
+from LeagueArchive import LeagueArchive
+from LeagueSnapshot import SnapshotRefresher
+from SleeperClient import SleeperClient
+from ResponseCache import ResponseCache
+from Transactions import TransactionLog
+from Profiler import profiler, span
 from dashboard import render_dashboard
 from scoring import render_scoring
 from performance import render_performance
 from expected_wins import render_expected_wins
+from playoff_odds import render_playoff_odds
+from lineups import render_lineups
+from head_to_head import render_head_to_head
+from schedule_luck import render_schedule_luck
+from history import render_history
+from diagnostics import render_diagnostics
 
 # ==================== Configuration ====================
 CONFIG_FILE = './league_config.json'
+DEFAULT_REFRESH_INTERVAL = 600  # seconds
 
 # ==================== Initialization Functions ====================
 
 @st.cache_resource
 def init_league():
-    """Initialize the Fantasy League from JSON configuration."""
-    league = FantasyLeague(from_json=CONFIG_FILE)
-    return (league, league.getTeamsDf(), league.getScoringDf())
+    """
+    Start the background refresher shared by every session.
+
+    Each refresh builds a new league from the JSON configuration; one client
+    is reused, so finished weeks come from the response cache, and one
+    transaction log, so transactions read on demand only pull new ones.
+    """
+    with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    if config.get('profile'):
+        profiler.enable()
+    client = SleeperClient(base_url=config.get('base_url'), cache=ResponseCache(config.get('cache_path')))
+    transactions = TransactionLog(client, config['league_id'])
+    return SnapshotRefresher(
+        lambda: FantasyLeague(config=config, client=client, transactions=transactions),
+        interval=config.get('refresh_interval', DEFAULT_REFRESH_INTERVAL)
+    )
+
+def get_archive():
+    """League archive at the configured path (file reads only)."""
+    with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    return LeagueArchive(config.get('archive_path'), base_url=config.get('base_url')), config
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def load_history():
+    """Read the all-time tables from the Parquet archive, no network involved."""
+    archive, _ = get_archive()
+    return archive.all_time_averages(), archive.all_time_h2h()
 
 # ==================== Page Configuration ====================
 
@@ -43,37 +83,84 @@ def main():
         st.title("LFL")
     st.markdown("---")
 
-    # Initialize league and load data
+    # Initialize league and load data; later refreshes happen in the background
     with st.spinner("Loading league data..."):
-        (league, teams_df, scoring_df) = init_league()
-
-    # Store data in session state for later use
-    if 'league' not in st.session_state:
-        st.session_state.league = league
-    if 'teams_df' not in st.session_state:
-        st.session_state.teams_df = teams_df
-    if 'scoring_df' not in st.session_state:
-        st.session_state.scoring_df = scoring_df
-
-    # Create tabs
-    tab1, tab2, tab3, tab4 = st.tabs([
+        refresher = init_league()
+    snapshot = refresher.snapshot
+    league, teams_df, scoring_df = snapshot.league, snapshot.teams_df, snapshot.scoring_df
+    prob_curves_df, lineup_df = snapshot.prob_curves_df, snapshot.lineup_df
+
+    age_minutes = int(snapshot.age() // 60)
+    st.caption(f"Dados atualizados há {age_minutes} min" if age_minutes else "Dados atualizados agora")
+    if refresher.last_error is not None:
+        st.caption(f"Falha na última atualização: {refresher.last_error}")
+
+    # Cache readout
+    with st.sidebar.expander("Cache da API"):
+        stats = league.getCacheStats()
+        st.caption(f"Requisições de rede: {stats['network_requests']}")
+        if 'hits' in stats:
+            st.caption(f"Hits: {stats['hits']} | Misses: {stats['misses']} ({stats['hit_rate']:.0%} hit rate)")
+            st.caption(f"Entradas: {stats['entries']} ({stats['permanent_entries']} permanentes, {stats['size_bytes'] / 1024:.0f} KB)")
+
+    # Create tabs; Diagnostics only while profiling is on
+    tab_names = [
         "📊 Dashboard",
         "📈 Pontuação Semanal",
         "📉 Gráficos de Desempenho",
-        "🎯 Expected Wins"
-    ])
-
-    with tab1:
+        "🎯 Expected Wins",
+        "🏆 Playoffs",
+        "🪑 Escalações",
+        "⚔️ Confrontos",
+        "🍀 Sorte",
+        "📚 Histórico"
+    ]
+    if profiler.enabled:
+        tab_names.append("🩺 Diagnóstico")
+    tabs = st.tabs(tab_names)
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = tabs[:9]
+
+    with tab1, span('render.dashboard'):
         render_dashboard(teams_df, scoring_df)
 
-    with tab2:
+    with tab2, span('render.scoring'):
         render_scoring(teams_df, scoring_df)
 
-    with tab3:
-        render_performance(teams_df, scoring_df)
+    with tab3, span('render.performance'):
+        render_performance(teams_df, scoring_df, snapshot.bootstrap_df)
+
+    with tab4, span('render.expected_wins'):
+        render_expected_wins(teams_df, prob_curves_df)
+
+    # Playoff odds are simulated with the snapshot, in the background
+    with tab5, span('render.playoff_odds'):
+        render_playoff_odds(teams_df, snapshot.odds_df)
+
+    with tab6, span('render.lineups'):
+        render_lineups(teams_df, lineup_df)
+
+    with tab7, span('render.head_to_head'):
+        render_head_to_head(teams_df, snapshot.head_to_head_df)
+
+    with tab8, span('render.schedule_luck'):
+        render_schedule_luck(snapshot.schedule_swap_df, snapshot.schedule_luck_df)
+
+    with tab9:
+        averages_df, h2h_df = load_history()
+        with span('render.history'):
+            render_history(averages_df, h2h_df)
+
+        if st.button("Arquivar temporadas anteriores"):
+            archive, config = get_archive()
+            with st.spinner("Arquivando temporadas..."):
+                archive.client = league.client
+                written = archive.archive(config['league_id'], config.get('divisions'))
+            load_history.clear()
+            st.success(f"{len(written)} temporada(s) arquivada(s).")
 
-    with tab4:
-        render_expected_wins(teams_df, scoring_df)
+    if profiler.enabled:
+        with tabs[9]:
+            render_diagnostics(profiler.summary(), profiler.trace())
 
 if __name__ == "__main__":
     main()